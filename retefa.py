@@ -2,11 +2,21 @@
 File di descrizione degli elementi della struttura dati in input.
 """
 import sys
-from functools import singledispatchmethod
+from functools import singledispatchmethod, lru_cache
 from typing import List, Dict
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import Listener, Client, wait
+import threading
+import queue
+import heapq
+import mmap
+from array import array
+import weakref
+import hashlib
+import secrets
 import xmlschema
-import copy
 import xml.etree.ElementTree as ET
 import argparse
 from pickle import dumps, loads, dump, load
@@ -165,6 +175,8 @@ class ReteFA:
         self.id = nome
         self.comportamenti = []
         self.links = []
+        # Forma compilata della rete (vedi compila())
+        self.compilata = None
 
     @staticmethod
     def validateXML(xml) -> bool:
@@ -201,6 +213,7 @@ class ReteFA:
             7- eventualmente eventiOutput(evento, link*) *controlla che il link esista
             
             8- compilazione delle transizioni uscenti
+            9- compilazione della tabella delle transizioni (CodificaCompatta)
         """
 
         # Validazione dell'XML
@@ -337,8 +350,24 @@ class ReteFA:
                     # dello stato0 della transizione corrente
                     transiz.stato0.addTransizioneUscente(transiz)
 
+            # 9. Compilazione della tabella delle transizioni, una volta per tutte
+            out.compila()
+
         return out
 
+    def compila(self):
+        """
+        Compila la ReteFA nella sua forma compatta (CodificaCompatta), che associa ad ogni stato di ciascun
+        comportamento la lista delle transizioni uscenti compilate, con indici interi di link ed eventi e predicato
+        di abilitazione precalcolato.
+        La compilazione avviene una volta sola: le chiamate successive ritornano la forma già compilata.
+        :return: la CodificaCompatta di questa ReteFA
+        """
+        # getattr gestisce anche le ReteFA recuperate da run precedenti, prive dell'attributo
+        if getattr(self, "compilata", None) is None:
+            self.compilata = CodificaCompatta(self)
+        return self.compilata
+
     def addComportamento(self, comportamento: Comportamento):
         """
         Aggiunge un comportamento alla rete
@@ -510,6 +539,7 @@ class Nodo:
         self.isFinale = False
         self.indiceOsservazione = 0
         self.archiUscenti = []
+        self.archiEntranti = []
         self.chiusura = None
 
     def addStato(self, stato: Stato) -> None:
@@ -562,6 +592,20 @@ class Nodo:
         else:
             return False
 
+    def chiave(self) -> tuple:
+        """
+        Genera la chiave canonica (hashable) del nodo, usata per la ricerca per valore dei nodi di uno
+        SpazioComportamentale.
+        La chiave è composta dalla tupla degli stati, dalla tupla del contenuto dei link, dall'indice
+        dell'osservazione e dal flag isFinale.
+        Nota: gli stati e i buffer di un nodo sono sempre ordinati come i comportamenti e i link della ReteFA.
+        :return: la chiave canonica del nodo
+        """
+        return tuple(self.stati), \
+            tuple(buffer.evento for buffer in self.contenutoLink), \
+            self.indiceOsservazione, \
+            self.isFinale
+
     def __str__(self):
         out = f"Nome: {self.nome}, Stati:"
 
@@ -655,6 +699,33 @@ class Nodo:
         # Dopo averlo costruito e popolato, ritorniamo il nodo output generato dalla transizione
         return nodoOutput
 
+    def applicaTransizione(self, record: tuple):
+        """
+        Ritorna il nodo successivo dello SC a partire dal nodo corrente facendo scattare la transizione compilata data
+        (vedi CodificaCompatta), che si assume abilitata sul nodo corrente.
+        A differenza di verificaFattibilitaTransizione, stati e buffer sono raggiunti per indice e non per ricerca.
+        Il nodo restituito è già flaggato come finale se tutti i suoi link sono scarichi
+        :param record: il record della transizione compilata, abilitata sul nodo corrente
+        :return: il nodo successivo dello Spazio Comportamentale
+        """
+        i, s0, s1, kNec, eNec, uscite, transizione = record[:7]
+
+        nodoOutput: Nodo
+        nodoOutput = self.clone()
+
+        # Consumiamo l'evento necessario
+        if kNec >= 0:
+            nodoOutput.contenutoLink[kNec].evento = ""
+        # Inseriamo gli eventi in uscita nei buffer dei link
+        for (k, e), eo in zip(uscite, transizione.eventiOutput):
+            nodoOutput.contenutoLink[k].evento = eo.evento
+        # Aggiorniamo lo stato relativo al comportamento della transizione
+        nodoOutput.stati[i] = transizione.stato1
+
+        # Il nodo è finale se tutti i suoi link sono scarichi
+        nodoOutput.isFinale = all(buf.evento == "" for buf in nodoOutput.contenutoLink)
+        return nodoOutput
+
     def cercaContenutoLink(self, link: Link) -> Buffer:
         """
         Legge in questo nodo il buffer relativo al link dato e lo ritorna.
@@ -668,6 +739,534 @@ class Nodo:
         return None
 
 
+class CodificaCompatta:
+    """
+    Classe che descrive la codifica compatta degli stati globali di una ReteFA.
+    Gli stati dei comportamenti e gli eventi contenuti nei link sono internati come piccoli interi, in modo che lo
+    stato globale della rete sia una tupla di interi
+        (s_0, ..., s_(n-1), e_0, ..., e_(m-1))
+    dove s_i è l'indice dello stato dell'i-esimo comportamento ed e_k è l'indice dell'evento contenuto nel k-esimo
+    link (0 indica il link vuoto).
+    Le transizioni sono precompilate in record (i, s0, s1, kNec, eNec, uscite, transizione, condizioni, scritture),
+    dove
+        - i è l'indice del comportamento della transizione
+        - s0 e s1 sono gli indici degli stati di partenza e di arrivo
+        - kNec ed eNec sono gli indici di link ed evento necessari (kNec = -1 se non c'è evento necessario)
+        - uscite è la tupla delle coppie (k, e) degli eventi in output
+        - transizione è il riferimento alla Transizione della ReteFA
+        - condizioni è il predicato di abilitazione precalcolato, ovvero la tupla delle coppie (posizione, valore)
+          che il codice deve rispettare ("buffer[kNec] == eNec e buffer di uscita vuoti"), oppure None se la
+          transizione non può mai scattare
+        - scritture è la tupla delle coppie (posizione, valore) da riscrivere nel codice quando la transizione scatta
+    In questo modo il calcolo di un nodo successivo è una semplice riscrittura di tupla, senza clonazione di oggetti.
+    La codifica di una ReteFA è costruita una sola volta da ReteFA.compila().
+    """
+
+    # Codice di controllo il cui hash deve coincidere fra coordinatore e lavoratori remoti (vedi proprietario)
+    CONTROLLO = (3, 1, 4, 1, 5, 9, 2, 6)
+
+    def __init__(self, rete: ReteFA):
+        self.rete = rete
+        self.numComportamenti = len(rete.comportamenti)
+
+        # Indice di ciascuno stato all'interno del proprio comportamento
+        self.indiceStato: Dict[Stato, int]
+        self.indiceStato = {}
+        for comp in rete.comportamenti:
+            for s, stato in enumerate(comp.stati):
+                self.indiceStato[stato] = s
+
+        # Indice di ciascun link della rete
+        self.indiceLink: Dict[Link, int]
+        self.indiceLink = {link: k for k, link in enumerate(rete.links)}
+
+        # Eventi internati: l'evento nullo ha sempre indice 0
+        self.eventi: List[str]
+        self.eventi = [""]
+        self.indiceEvento: Dict[str, int]
+        self.indiceEvento = {"": 0}
+
+        # Buffer condivisi fra i nodi decodificati, uno per ogni coppia (link, evento)
+        self.buffers = {}
+
+        # Record delle transizioni uscenti di ciascuno stato di ciascun comportamento
+        self.transizioniUscenti: List[List[List[tuple]]]
+        self.transizioniUscenti = []
+        for i, comp in enumerate(rete.comportamenti):
+            self.transizioniUscenti.append(
+                [[self.compilaTransizione(i, t) for t in stato.transizioniUscenti] for stato in comp.stati])
+
+        # Insiemi ampi candidati per la riduzione a ordine parziale, calcolati al primo uso (vedi insiemiAmpi)
+        self.ampi = None
+
+    def internaEvento(self, evento: str) -> int:
+        """
+        Ritorna l'intero associato all'evento dato, internandolo se non è ancora stato incontrato
+        :param evento: il nome dell'evento
+        :return: l'indice dell'evento
+        """
+        e = self.indiceEvento.get(evento)
+        if e is None:
+            e = len(self.eventi)
+            self.eventi.append(evento)
+            self.indiceEvento[evento] = e
+        return e
+
+    def compilaTransizione(self, i: int, transizione: Transizione) -> tuple:
+        """
+        Compila una Transizione della ReteFA nel record
+        (i, s0, s1, kNec, eNec, uscite, transizione, condizioni, scritture)
+        :param i: l'indice del comportamento della transizione
+        :param transizione: la transizione da compilare
+        :return: il record della transizione compilata
+        """
+        n = self.numComportamenti
+        s1 = self.indiceStato[transizione.stato1]
+        kNec = -1
+        eNec = 0
+        if transizione.eventoNecessario is not None:
+            kNec = self.indiceLink[transizione.eventoNecessario.link]
+            eNec = self.internaEvento(transizione.eventoNecessario.evento)
+        uscite = tuple((self.indiceLink[eo.link], self.internaEvento(eo.evento)) for eo in transizione.eventiOutput)
+
+        # Predicato di abilitazione: l'evento necessario deve essere nel suo link
+        # e i link di uscita devono essere vuoti (il link dell'evento necessario viene consumato prima)
+        condizioni = [(n + kNec, eNec)] if kNec >= 0 else []
+        # Riscritture: stato del comportamento, consumo dell'evento necessario, eventi in output
+        scritture = [(i, s1)] + ([(n + kNec, 0)] if kNec >= 0 else [])
+        linkUscita = set()
+        for k, e in uscite:
+            if k in linkUscita:
+                # Due eventi in output sullo stesso link: la transizione non può mai scattare
+                condizioni = None
+                break
+            linkUscita.add(k)
+            if k != kNec:
+                condizioni.append((n + k, 0))
+            scritture.append((n + k, e))
+
+        return (i, self.indiceStato[transizione.stato0], s1, kNec, eNec, uscite, transizione,
+                tuple(condizioni) if condizioni is not None else None, tuple(scritture))
+
+    def codiceIniziale(self) -> tuple:
+        """
+        :return: il codice dello stato iniziale della rete (stati iniziali e link vuoti)
+        """
+        return tuple(self.indiceStato[comp.statoIniziale] for comp in self.rete.comportamenti) \
+            + (0,) * len(self.rete.links)
+
+    def codifica(self, nodo: Nodo) -> tuple:
+        """
+        Codifica gli stati e il contenuto dei link di un Nodo in una tupla di interi
+        :param nodo: il nodo da codificare
+        :return: il codice del nodo
+        """
+        return tuple(self.indiceStato[stato] for stato in nodo.stati) \
+            + tuple(self.internaEvento(buffer.evento) for buffer in nodo.contenutoLink)
+
+    def decodifica(self, codice: tuple, indiceOsservazione=0, isFinale=True) -> Nodo:
+        """
+        Costruisce il Nodo corrispondente al codice dato.
+        I buffer del nodo sono condivisi con gli altri nodi decodificati: non vanno modificati sul posto
+        (verificaFattibilitaTransizione lavora sempre su un clone del nodo).
+        :param codice: il codice del nodo
+        :param indiceOsservazione: l'indice dell'osservazione del nodo
+        :param isFinale: True se il nodo (oltre ad avere i link vuoti) è finale rispetto all'osservazione
+        :return: il nodo decodificato
+        """
+        n = self.numComportamenti
+        nodo = Nodo()
+        for i, comp in enumerate(self.rete.comportamenti):
+            nodo.addStato(comp.stati[codice[i]])
+        for k, link in enumerate(self.rete.links):
+            e = codice[n + k]
+            buffer = self.buffers.get((k, e))
+            if buffer is None:
+                buffer = Buffer(link, self.eventi[e])
+                self.buffers[(k, e)] = buffer
+            nodo.addContenutoLink(buffer)
+        nodo.indiceOsservazione = indiceOsservazione
+        nodo.isFinale = isFinale and self.isFinale(codice)
+        return nodo
+
+    def isFinale(self, codice: tuple) -> bool:
+        """
+        :param codice: il codice di un nodo
+        :return: True se tutti i link del codice sono vuoti
+        """
+        return not any(codice[self.numComportamenti:])
+
+    @staticmethod
+    def abilitata(codice: tuple, record: tuple) -> bool:
+        """
+        Valuta il predicato di abilitazione precalcolato di una transizione compilata sul codice dato
+        :param codice: il codice del nodo corrente
+        :param record: il record della transizione compilata
+        :return: True se la transizione può scattare dal nodo corrente
+        """
+        condizioni = record[7]
+        if condizioni is None:
+            return False
+        for p, v in condizioni:
+            if codice[p] != v:
+                return False
+        return True
+
+    def successore(self, codice: tuple, record: tuple):
+        """
+        Calcola il codice successivo allo scatto della transizione compilata data, secondo la stessa semantica di
+        Nodo.verificaFattibilitaTransizione.
+        :param codice: il codice del nodo corrente
+        :param record: il record della transizione compilata
+        :return: il codice del nodo successivo se la transizione è fattibile, None altrimenti
+        """
+        if not CodificaCompatta.abilitata(codice, record):
+            return None
+        nuovo = list(codice)
+        for p, v in record[8]:
+            nuovo[p] = v
+        return tuple(nuovo)
+
+    def insiemiAmpi(self) -> List[List[tuple]]:
+        """
+        Precalcola, per ciascuno stato di ciascun comportamento, l'insieme ampio candidato per la riduzione a ordine
+        parziale, ovvero le transizioni uscenti dallo stato (escluse quelle che non possono mai scattare).
+        Lo stato si presta alla riduzione solo se ciascuna di queste transizioni
+            - è invisibile, cioè priva di etichetta di osservabilità e di rilevanza
+            - legge solo da link che nessun altro comportamento legge
+            - scrive solo su link su cui nessun altro comportamento scrive
+        e inoltre almeno una di esse legge da un link oppure nessuna di esse tocca i link.
+        Le prime condizioni, dati gli insiemi di link letti e scritti da ciascuna transizione, rendono l'insieme
+        persistente quando tutte le sue transizioni sono abilitate: finché il comportamento resta nello stato, i link
+        che legge restano pieni e quelli su cui scrive restano vuoti, per cui nessuna transizione degli altri
+        comportamenti può interferire con quelle dell'insieme. L'ultima condizione garantisce che un cammino verso un
+        nodo finale che non passa per l'insieme resti tale anche anticipando una sua transizione: se una transizione
+        legge da un link, quel link resta pieno fino allo scatto di una transizione dell'insieme, mentre le
+        transizioni che non toccano i link non cambiano la finalità dei nodi.
+        :return: la lista ampi, dove ampi[i][s] è la tupla dei record dell'insieme ampio dello stato s del
+                 comportamento i, oppure None se lo stato non si presta alla riduzione
+        """
+        if self.ampi is not None:
+            return self.ampi
+
+        # Comportamenti che leggono e che scrivono su ciascun link
+        lettori = [set() for _ in self.rete.links]
+        scrittori = [set() for _ in self.rete.links]
+        for i, stati in enumerate(self.transizioniUscenti):
+            for records in stati:
+                for record in records:
+                    if record[3] >= 0:
+                        lettori[record[3]].add(i)
+                    for k, _ in record[5]:
+                        scrittori[k].add(i)
+
+        self.ampi = []
+        for i, stati in enumerate(self.transizioniUscenti):
+            ampiComportamento = []
+            for records in stati:
+                ampio = tuple(record for record in records if record[7] is not None)
+                if not ampio or not all(not record[6].osservabilita and not record[6].rilevanza
+                                        and (record[3] < 0 or lettori[record[3]] == {i})
+                                        and all(scrittori[k] == {i} for k, _ in record[5])
+                                        for record in ampio):
+                    ampio = None
+                elif not any(record[3] >= 0 for record in ampio) \
+                        and not all(record[3] < 0 and not record[5] for record in ampio):
+                    ampio = None
+                ampiComportamento.append(ampio)
+            self.ampi.append(ampiComportamento)
+        return self.ampi
+
+    def insiemeAmpio(self, codice: tuple, indiceOss: int, indice: dict):
+        """
+        Cerca un insieme ampio per il nodo dato: quello del primo comportamento il cui stato si presta alla
+        riduzione (vedi insiemiAmpi) e le cui transizioni sono tutte abilitate nel nodo.
+        Per non rimandare indefinitamente le transizioni escluse lungo un ciclo, l'insieme è accettato solo se tutti
+        i suoi successori sono nodi nuovi: un ciclo dello spazio ridotto si chiude quindi sempre su un nodo espanso
+        completamente.
+        :param codice: il codice del nodo
+        :param indiceOss: l'indice dell'osservazione del nodo (le transizioni dell'insieme non lo fanno avanzare)
+        :param indice: l'indice dei nodi già scoperti, per chiave (codice, indiceOsservazione)
+        :return: la tupla dei record dell'insieme ampio, oppure None se il nodo va espanso completamente
+        """
+        ampi = self.insiemiAmpi()
+        for i in range(self.numComportamenti):
+            ampio = ampi[i][codice[i]]
+            if ampio is None:
+                continue
+            successori = [self.successore(codice, record) for record in ampio]
+            if all(succ is not None and (succ, indiceOss) not in indice for succ in successori):
+                return ampio
+        return None
+
+    def esplora(self, osservazioneLineare: List[str] = None, riduzione=False):
+        """
+        Esplora gli stati raggiungibili della rete lavorando unicamente sui codici compatti.
+        L'ordine di esplorazione è lo stesso di SpazioComportamentale.creaSpazioComportamentale (e, se è data
+        un'osservazione lineare, di SpazioComportamentale.creaSpazioComportamentaleOsservazioneLineare).
+        Con la riduzione a ordine parziale, da ciascun nodo per cui esiste un insieme ampio (vedi insiemeAmpio)
+        sono esplorate solo le transizioni dell'insieme, ovvero un solo ordinamento delle transizioni indipendenti
+        di comportamenti diversi: lo spazio ottenuto è più piccolo ma, una volta potato, porta agli stessi nodi
+        finali con le stesse sequenze di etichette di osservabilità e rilevanza, e quindi alle stesse diagnosi.
+        :param osservazioneLineare: l'eventuale osservazione lineare a cui restringere l'esplorazione
+        :param riduzione: True per applicare la riduzione a ordine parziale
+        :return: la coppia (codici, archi), dove codici è la lista delle coppie (codice, indiceOsservazione)
+                 in ordine di scoperta e archi è la lista delle terne (indice nodo0, indice nodo1, transizione)
+        """
+        n = self.numComportamenti
+        iniziale = (self.codiceIniziale(), 0)
+        codici = [iniziale]
+        indice = {iniziale: 0}
+        archi = []
+
+        # Pila degli indici dei codici da esplorare
+        daEsplorare = [0]
+        while daEsplorare:
+            j = daEsplorare.pop()
+            codice, indiceOss = codici[j]
+            records = self.insiemeAmpio(codice, indiceOss, indice) if riduzione else None
+            if records is None:
+                records = (record for i in range(n) for record in self.transizioniUscenti[i][codice[i]])
+            for record in records:
+                transizione = record[6]
+                indiceSucc = indiceOss
+                if osservazioneLineare is not None and transizione.osservabilita != "":
+                    # (filtro) la transizione osservabile deve corrispondere all'osservazione successiva
+                    if indiceOss < len(osservazioneLineare) \
+                            and transizione.osservabilita == osservazioneLineare[indiceOss]:
+                        indiceSucc = indiceOss + 1
+                    else:
+                        continue
+
+                succ = self.successore(codice, record)
+                if succ is None:
+                    continue
+
+                chiave = (succ, indiceSucc)
+                h = indice.get(chiave)
+                if h is None:
+                    h = len(codici)
+                    codici.append(chiave)
+                    indice[chiave] = h
+                    daEsplorare.append(h)
+                archi.append((j, h, transizione))
+        return codici, archi
+
+    @staticmethod
+    def proprietario(codice: tuple, processi: int) -> int:
+        """
+        La partizione è calcolata da ciascun processo per conto suo: l'hash di una tupla di interi non dipende dal
+        processo, ma solo dalla versione dell'interprete (vedi lavoratoreRemoto).
+        :param codice: il codice di un nodo
+        :param processi: il numero di processi dell'esplorazione parallela
+        :return: l'indice del processo a cui spetta il codice (partizione per hash del codice)
+        """
+        return hash(codice) % processi
+
+    @staticmethod
+    def lavoratoreParallelo(rete: ReteFA, indice: int, pari: list, coordinatore, lotto=1024) -> None:
+        """
+        Ciclo di un processo dell'esplorazione parallela (vedi SpazioComportamentale.creaSpazioComportamentaleParallelo).
+        Il processo custodisce i codici visitati della sua partizione (vedi proprietario) e ne espande la frontiera;
+        i successori che spettano a un altro processo sono raccolti per destinatario e inviati direttamente al
+        proprietario a lotti di al più lotto codici. Gli archi non sono conservati: sono ricalcolati dai codici della
+        partizione quando il coordinatore li richiede.
+        Un filo di ricezione accoda i messaggi in arrivo dagli altri processi e dal coordinatore, così che gli invii
+        (bloccanti) fra due processi non possano mai attendersi a vicenda.
+        Per il rilevamento della terminazione il processo conta i lotti inviati e quelli ricevuti, e risponde a ogni
+        "sonda" del coordinatore con la coppia (inviati, ricevuti) appena è inattivo, cioè con la frontiera vuota e
+        i lotti in uscita già inviati (vedi SpazioComportamentale.coordinaEsplorazione).
+        Terminata l'esplorazione il processo esegue i comandi del coordinatore:
+            - "nodi": invia i codici della partizione a blocchi, seguiti da None
+            - "archi": invia gli archi della partizione a blocchi di quaterne (codice, i, r, successore), dove r è la
+              posizione del record fra le transizioni uscenti del comportamento i, seguiti da None
+            - "fine": chiude le connessioni e termina
+        :param rete: la ReteFA da esplorare
+        :param indice: l'indice del processo, ovvero della sua partizione
+        :param pari: le connessioni verso gli altri processi, per indice (None in posizione indice)
+        :param coordinatore: la connessione verso il processo coordinatore
+        :param lotto: il numero massimo di codici per lotto (e per blocco inviato al coordinatore)
+        """
+        codifica = rete.compila()
+        processi = len(pari)
+        arrivi = queue.Queue()
+
+        def ricevi():
+            # Filo di ricezione: accoda (mittente, messaggio), con mittente None per il coordinatore
+            mittenti = {c: j for j, c in enumerate(pari) if c is not None}
+            mittenti[coordinatore] = None
+            attive = list(mittenti)
+            while attive:
+                try:
+                    pronte = wait(attive)
+                except (OSError, ValueError):
+                    # Connessioni chiuse dal processo a fine esplorazione
+                    return
+                for c in pronte:
+                    try:
+                        arrivi.put((mittenti[c], c.recv_bytes()))
+                    except (EOFError, OSError):
+                        attive.remove(c)
+                        if mittenti[c] is None:
+                            # Il coordinatore è caduto: non c'è più nessuno a cui consegnare la partizione
+                            arrivi.put((None, dumps("fine")))
+
+        threading.Thread(target=ricevi, daemon=True).start()
+
+        visitati = set()
+        frontiera = []
+        uscite = [set() for _ in range(processi)]
+        inviati = 0
+        ricevuti = 0
+        sonda = False
+
+        def visita(codice):
+            if codice not in visitati:
+                visitati.add(codice)
+                frontiera.append(codice)
+
+        def invia(j):
+            nonlocal inviati
+            pari[j].send_bytes(dumps(list(uscite[j])))
+            uscite[j].clear()
+            inviati += 1
+
+        iniziale = codifica.codiceIniziale()
+        if CodificaCompatta.proprietario(iniziale, processi) == indice:
+            visita(iniziale)
+
+        while True:
+            if frontiera:
+                # Espandiamo una porzione della frontiera, poi controlliamo i messaggi in arrivo
+                for _ in range(min(lotto, len(frontiera))):
+                    codice = frontiera.pop()
+                    for i in range(codifica.numComportamenti):
+                        for record in codifica.transizioniUscenti[i][codice[i]]:
+                            succ = codifica.successore(codice, record)
+                            if succ is None:
+                                continue
+                            j = CodificaCompatta.proprietario(succ, processi)
+                            if j == indice:
+                                visita(succ)
+                            else:
+                                uscite[j].add(succ)
+                                if len(uscite[j]) >= lotto:
+                                    invia(j)
+                try:
+                    mittente, messaggio = arrivi.get_nowait()
+                except queue.Empty:
+                    continue
+            else:
+                # Il processo è inattivo: svuotiamo i lotti in uscita e rispondiamo all'eventuale sonda
+                for j in range(processi):
+                    if uscite[j]:
+                        invia(j)
+                if sonda:
+                    coordinatore.send((inviati, ricevuti))
+                    sonda = False
+                mittente, messaggio = arrivi.get()
+
+            if mittente is not None:
+                ricevuti += 1
+                for codice in loads(messaggio):
+                    visita(codice)
+            elif loads(messaggio) == "sonda":
+                sonda = True
+            else:
+                break
+
+        # Esplorazione terminata: consegniamo la partizione al coordinatore su richiesta
+        comando = loads(messaggio)
+        while comando != "fine":
+            if comando == "nodi":
+                blocco = []
+                for codice in sorted(visitati):
+                    blocco.append(codice)
+                    if len(blocco) >= lotto:
+                        coordinatore.send(blocco)
+                        blocco = []
+            else:
+                blocco = []
+                for codice in sorted(visitati):
+                    for i in range(codifica.numComportamenti):
+                        for r, record in enumerate(codifica.transizioniUscenti[i][codice[i]]):
+                            succ = codifica.successore(codice, record)
+                            if succ is not None:
+                                blocco.append((codice, i, r, succ))
+                    if len(blocco) >= lotto:
+                        coordinatore.send(blocco)
+                        blocco = []
+            if blocco:
+                coordinatore.send(blocco)
+            coordinatore.send(None)
+            comando = loads(arrivi.get()[1])
+
+        for c in pari:
+            if c is not None:
+                c.close()
+        coordinatore.close()
+
+    @staticmethod
+    def lavoratoreRemoto(indirizzo: tuple, chiave: bytes, ascolto=("localhost", 0), attesa=30) -> None:
+        """
+        Collega un lavoratore al coordinatore di un'esplorazione distribuita (vedi
+        SpazioComportamentale.creaSpazioComportamentaleDistribuito) e ne esegue il ciclo fino al termine
+        dell'esplorazione. Il lavoratore si mette in ascolto per gli altri lavoratori e comunica il suo indirizzo al
+        coordinatore, che risponde con la ReteFA, l'indice del lavoratore, gli indirizzi di tutti i lavoratori e
+        l'hash di un codice di controllo. Ciascun lavoratore si collega poi a quelli di indice minore e accetta i
+        collegamenti di quelli di indice maggiore, così che ogni coppia di lavoratori abbia una connessione diretta.
+        I messaggi ricevuti sono deserializzati con pickle: la chiave va tenuta segreta, perché chi la conosce può
+        far eseguire codice arbitrario al lavoratore.
+        :param indirizzo: la coppia (host, porta) del coordinatore
+        :param chiave: la chiave segreta condivisa con il coordinatore e con gli altri lavoratori
+        :param ascolto: la coppia (host, porta) su cui attendere gli altri lavoratori (porta 0 per una porta libera);
+                        l'host deve essere raggiungibile dalle macchine degli altri lavoratori
+        :param attesa: per quanti secondi ritentare il collegamento se il coordinatore non è ancora in ascolto
+        :raises RuntimeError: se la partizione dei codici non coincide con quella del coordinatore
+        """
+        with Listener(ascolto, authkey=chiave) as ascoltatore:
+            scadenza = time.time() + attesa
+            while True:
+                try:
+                    coordinatore = Client(indirizzo, authkey=chiave)
+                    break
+                except ConnectionRefusedError:
+                    if time.time() > scadenza:
+                        raise
+                    time.sleep(0.5)
+            coordinatore.send(ascoltatore.address)
+            rete, indice, indirizzi, controllo = coordinatore.recv()
+            if hash(CodificaCompatta.CONTROLLO) != controllo:
+                coordinatore.close()
+                raise RuntimeError("La partizione dei codici del lavoratore non coincide con quella del coordinatore: "
+                                   "usare la stessa versione dell'interprete")
+
+            pari = [None] * len(indirizzi)
+            for j in range(indice):
+                pari[j] = Client(indirizzi[j], authkey=chiave)
+                pari[j].send(indice)
+            for _ in range(indice + 1, len(indirizzi)):
+                connessione = ascoltatore.accept()
+                pari[connessione.recv()] = connessione
+
+        CodificaCompatta.lavoratoreParallelo(rete, indice, pari, coordinatore)
+
+    @staticmethod
+    def leggiBlocchi(percorso: str):
+        """
+        Legge uno dopo l'altro i blocchi di un file di partizione scritto da
+        SpazioComportamentale.coordinaEsplorazione, senza caricare in memoria l'intero file.
+        I blocchi sono letti con pickle: il file deve provenire da una fonte fidata.
+        :param percorso: il percorso del file di partizione
+        :return: un generatore dei blocchi del file
+        """
+        with open(percorso, "rb") as file:
+            while True:
+                try:
+                    yield load(file)
+                except EOFError:
+                    return
+
 class Arco:
     """
         Classe che descrive un arco in uno SpazioComportamentale
@@ -683,9 +1282,439 @@ class Arco:
     def __str__(self):
         if self.transizione:
             return "(" + self.nodo0.nome + "," + self.nodo1.nome + "), " + self.transizione.nome + ", " + \
-                   self.transizione.osservabilita + ", " + self.rilevanza
+                   self.transizione.osservabilita + ", " + str(self.rilevanza)
         else:
-            return "(" + self.nodo0.nome + "," + self.nodo1.nome + "), " + self.rilevanza
+            return "(" + self.nodo0.nome + "," + self.nodo1.nome + "), " + str(self.rilevanza)
+
+
+class Espressione:
+    """
+    Classe che descrive un'espressione regolare di rilevanza come albero sintattico immutabile.
+    Un'espressione è ε, un simbolo (un'etichetta di rilevanza), una concatenazione, un'alternativa o una stella.
+    I nodi sono condivisi (hash-consing): le fabbriche simbolo, concatenazione, alternativa e stella restituiscono
+    sempre lo stesso oggetto per espressioni strutturalmente uguali, dunque il confronto fra espressioni è un
+    confronto per riferimento e i sottotermini comuni non sono mai duplicati. ε è il singoletto Espressione.EPSILON.
+    La stringa nella sintassi delle diagnosi si ottiene con str() solo al momento dell'uscita.
+    """
+    __slots__ = ("tipo", "etichetta", "figli", "_stringa", "__weakref__")
+
+    # Tipi di espressione
+    TIPO_EPSILON = "ε"
+    TIPO_SIMBOLO = "simbolo"
+    TIPO_CONCATENAZIONE = "concatenazione"
+    TIPO_ALTERNATIVA = "alternativa"
+    TIPO_STELLA = "stella"
+
+    # Il singoletto ε, definito dopo la classe
+    EPSILON: 'Espressione'
+
+    # Tabella delle espressioni già costruite, per chiave strutturale
+    _interne = weakref.WeakValueDictionary()
+
+    def __init__(self, tipo: str, etichetta: str, figli: tuple):
+        self.tipo = tipo
+        self.etichetta = etichetta
+        self.figli = figli
+        self._stringa = None
+
+    @staticmethod
+    def _interna(tipo: str, etichetta: str = None, figli: tuple = ()):
+        """
+        Ritorna l'unica istanza dell'espressione con la struttura data, creandola se necessario
+        :param tipo: il tipo dell'espressione
+        :param etichetta: l'etichetta del simbolo (solo per i simboli)
+        :param figli: la tupla delle sottoespressioni (già interne)
+        :return: l'espressione interna
+        """
+        chiave = (tipo, etichetta, figli)
+        espressione = Espressione._interne.get(chiave)
+        if espressione is None:
+            espressione = Espressione(tipo, etichetta, figli)
+            Espressione._interne[chiave] = espressione
+        return espressione
+
+    def __reduce__(self):
+        # Le espressioni ricaricate da pickle tornano nella tabella delle espressioni interne
+        if self.tipo == Espressione.TIPO_EPSILON:
+            return Espressione._epsilon, ()
+        return Espressione._interna, (self.tipo, self.etichetta, self.figli)
+
+    @staticmethod
+    def _epsilon():
+        return Espressione.EPSILON
+
+    @staticmethod
+    def simbolo(etichetta: str):
+        """
+        Ritorna l'espressione corrispondente ad un'etichetta di rilevanza
+        :param etichetta: l'etichetta di rilevanza ("" e "ε" indicano la stringa vuota)
+        :return: l'espressione del simbolo, oppure ε
+        """
+        if etichetta == "" or etichetta == "ε":
+            return Espressione.EPSILON
+        return Espressione._interna(Espressione.TIPO_SIMBOLO, etichetta)
+
+    @staticmethod
+    def concatenazione(*termini):
+        """
+        Ritorna la concatenazione dei termini dati, eliminando ε, appiattendo le concatenazioni annidate
+        e fondendo le stelle ripetute (r*r* = r*)
+        :param termini: le espressioni da concatenare, in ordine
+        :return: l'espressione concatenazione
+        """
+        figli = []
+        for t in termini:
+            for f in (t.figli if t.tipo == Espressione.TIPO_CONCATENAZIONE else (t,)):
+                if f is Espressione.EPSILON:
+                    continue
+                if figli and f.tipo == Espressione.TIPO_STELLA and figli[-1] is f:
+                    continue
+                figli.append(f)
+        if not figli:
+            return Espressione.EPSILON
+        if len(figli) == 1:
+            return figli[0]
+        return Espressione._interna(Espressione.TIPO_CONCATENAZIONE, figli=tuple(figli))
+
+    @staticmethod
+    def alternativa(*termini):
+        """
+        Ritorna l'alternativa dei termini dati in forma canonica:
+        - le alternative annidate sono appiattite e i rami duplicati eliminati (r|r = r)
+        - ε è assorbito dai rami stella (ε|r* = r*)
+        - i rami con un fattore iniziale o finale in comune sono fattorizzati (xy|xz = x(y|z), yx|zx = (y|z)x)
+        - i rami sono ordinati secondo la loro stringa
+        :param termini: le espressioni in alternativa
+        :return: l'espressione alternativa
+        """
+        rami = Espressione._rami(termini)
+        if len(rami) > 1:
+            rami = Espressione._rami(Espressione._fattorizza(Espressione._fattorizza(rami, 0), -1))
+        if len(rami) == 1:
+            return rami[0]
+        return Espressione._interna(Espressione.TIPO_ALTERNATIVA, figli=tuple(sorted(rami, key=str)))
+
+    @staticmethod
+    def _rami(termini) -> list:
+        """
+        :param termini: le espressioni in alternativa
+        :return: la lista dei rami al primo livello, senza duplicati e con ε assorbito dai rami stella
+        """
+        rami = {}
+        for t in termini:
+            for f in t.alternative():
+                rami[f] = None
+        if len(rami) > 1 and Espressione.EPSILON in rami \
+                and any(f.tipo == Espressione.TIPO_STELLA for f in rami):
+            del rami[Espressione.EPSILON]
+        return list(rami)
+
+    @staticmethod
+    def _fattorizza(rami: list, lato: int) -> list:
+        """
+        Raggruppa i rami di un'alternativa secondo il loro primo (lato = 0) o ultimo (lato = -1) fattore e
+        sostituisce ogni gruppo di più rami con il fattore comune concatenato all'alternativa dei resti
+        :param rami: i rami dell'alternativa
+        :param lato: 0 per i prefissi comuni, -1 per i suffissi comuni
+        :return: la lista dei rami fattorizzati
+        """
+        gruppi = {}
+        for r in rami:
+            fattori = r.figli if r.tipo == Espressione.TIPO_CONCATENAZIONE else (r,)
+            gruppi.setdefault(fattori[lato], []).append((r, fattori))
+        fattorizzati = []
+        for fattore, gruppo in gruppi.items():
+            if len(gruppo) == 1:
+                fattorizzati.append(gruppo[0][0])
+            elif lato == 0:
+                resti = Espressione.alternativa(*[Espressione.concatenazione(*f[1:]) for _, f in gruppo])
+                fattorizzati.append(Espressione.concatenazione(fattore, resti))
+            else:
+                resti = Espressione.alternativa(*[Espressione.concatenazione(*f[:-1]) for _, f in gruppo])
+                fattorizzati.append(Espressione.concatenazione(resti, fattore))
+        return fattorizzati
+
+    @staticmethod
+    def stella(termine):
+        """
+        Ritorna la chiusura di Kleene del termine dato, semplificata secondo (r*)* = r* e (ε|r)* = r*
+        :param termine: l'espressione da ripetere
+        :return: l'espressione stella (ε se il termine è ε)
+        """
+        if termine.tipo == Espressione.TIPO_ALTERNATIVA and Espressione.EPSILON in termine.figli:
+            termine = Espressione.alternativa(*[f for f in termine.figli if f is not Espressione.EPSILON])
+        if termine is Espressione.EPSILON or termine.tipo == Espressione.TIPO_STELLA:
+            return termine
+        return Espressione._interna(Espressione.TIPO_STELLA, figli=(termine,))
+
+    def alternative(self) -> tuple:
+        """
+        :return: la tupla delle espressioni in alternativa al primo livello di questa espressione
+        """
+        if self.tipo == Espressione.TIPO_ALTERNATIVA:
+            return self.figli
+        return (self,)
+
+    def __str__(self):
+        if self._stringa is None:
+            if self.tipo == Espressione.TIPO_SIMBOLO:
+                self._stringa = self.etichetta
+            elif self.tipo == Espressione.TIPO_CONCATENAZIONE:
+                self._stringa = "".join(f"({f})" if f.tipo == Espressione.TIPO_ALTERNATIVA else str(f)
+                                        for f in self.figli)
+            elif self.tipo == Espressione.TIPO_ALTERNATIVA:
+                self._stringa = "|".join(str(f) or "ε" for f in self.figli)
+            elif self.tipo == Espressione.TIPO_STELLA:
+                self._stringa = f"({self.figli[0]})*"
+            else:
+                self._stringa = ""
+        return self._stringa
+
+    def __repr__(self):
+        return f"Espressione({str(self)!r})"
+
+
+# L'espressione ε è un singoletto
+Espressione.EPSILON = Espressione(Espressione.TIPO_EPSILON, None, ())
+
+
+class GrafoRiduzione:
+    """
+    Classe che descrive un grafo di lavoro leggero per la riduzione di uno SpazioComportamentale ad espressione
+    regolare.
+    Contiene solo gli identificativi interi dei nodi, le liste di adiacenza (dizionari ordinati di identificativi
+    di archi) e le etichette di rilevanza degli archi: a differenza di una copia profonda dello spazio non porta con
+    sé stati, buffer, transizioni e ReteFA.
+    L'identificativo di un nodo costruito con daSpazio corrisponde alla sua posizione fra i nodi dello spazio
+    d'origine.
+    """
+
+    def __init__(self):
+        # Insieme ordinato dei nodi presenti nel grafo
+        self.nodi: Dict[int, None]
+        self.nodi = {}
+        self.isFinale: List[bool]
+        self.isFinale = []
+        self.nomi: List[str]
+        self.nomi = []
+        self.nodoIniziale = None
+
+        # Attributi degli archi, indicizzati per identificativo dell'arco
+        self.nodo0: List[int]
+        self.nodo0 = []
+        self.nodo1: List[int]
+        self.nodo1 = []
+        self.rilevanza: List[Espressione]
+        self.rilevanza = []
+        # Insieme ordinato degli archi presenti nel grafo
+        self.archi: Dict[int, None]
+        self.archi = {}
+
+        # Liste di adiacenza: per ciascun nodo, insiemi ordinati degli archi uscenti ed entranti
+        self.uscenti: List[Dict[int, None]]
+        self.uscenti = []
+        self.entranti: List[Dict[int, None]]
+        self.entranti = []
+
+    @staticmethod
+    def daSpazio(spazio):
+        """
+        Costruisce in un'unica passata il grafo di lavoro corrispondente allo spazio dato, considerando solo gli archi
+        dello spazio (anche se i nodi hanno altri archi nelle loro liste di adiacenza)
+        :param spazio: lo SpazioComportamentale da ridurre
+        :return: il grafo di lavoro
+        """
+        g = GrafoRiduzione()
+        idNodi = {}
+        for nodo in spazio.nodi:
+            idNodi[id(nodo)] = g.addNodo(nodo.isFinale, nodo.nome)
+        for arco in spazio.archi:
+            g.addArco(idNodi[id(arco.nodo0)], idNodi[id(arco.nodo1)], Espressione.simbolo(arco.rilevanza))
+        g.nodoIniziale = idNodi[id(spazio.nodoIniziale)]
+        return g
+
+    def addNodo(self, isFinale=False, nome="") -> int:
+        """
+        Aggiunge un nuovo nodo al grafo
+        :param isFinale: True se il nodo è finale
+        :param nome: il nome del nodo (usato solo per le stampe di debug)
+        :return: l'identificativo del nuovo nodo
+        """
+        n = len(self.isFinale)
+        self.isFinale.append(isFinale)
+        self.nomi.append(nome)
+        self.uscenti.append({})
+        self.entranti.append({})
+        self.nodi[n] = None
+        return n
+
+    def addArco(self, n0: int, n1: int, rilevanza: Espressione) -> int:
+        """
+        Aggiunge un nuovo arco al grafo, aggiornando le liste di adiacenza dei suoi estremi
+        :param n0: il nodo di origine
+        :param n1: il nodo di destinazione
+        :param rilevanza: l'etichetta di rilevanza dell'arco
+        :return: l'identificativo del nuovo arco
+        """
+        a = len(self.nodo0)
+        self.nodo0.append(n0)
+        self.nodo1.append(n1)
+        self.rilevanza.append(rilevanza)
+        self.archi[a] = None
+        self.uscenti[n0][a] = None
+        self.entranti[n1][a] = None
+        return a
+
+    def rimuoviArco(self, a: int) -> None:
+        """
+        Rimuove un arco dal grafo e dalle liste di adiacenza dei suoi estremi
+        :param a: l'identificativo dell'arco
+        """
+        del self.archi[a]
+        del self.uscenti[self.nodo0[a]][a]
+        del self.entranti[self.nodo1[a]][a]
+
+    def rimuoviNodo(self, n: int) -> None:
+        """
+        Rimuove un nodo dal grafo insieme a tutti i suoi archi entranti e uscenti
+        :param n: l'identificativo del nodo
+        """
+        for a in list(self.uscenti[n]):
+            self.rimuoviArco(a)
+        for a in list(self.entranti[n]):
+            self.rimuoviArco(a)
+        del self.nodi[n]
+
+    def trovaSerieArchi(self) -> List[int]:
+        """
+        Ricerca di una sequenza "obbligata" di archi,
+        senza possibili bivi al suo interno (ovvero una serie).
+        :return: la lista degli identificativi degli archi di una serie nel grafo
+        """
+        # Cerco e compilo una sequenza obbligata nel grafo
+        # (la prima che trovo a partire dal primo nodo)
+        for ni in self.nodi:
+            for t in self.uscenti[ni]:
+                sequenza = []
+                while t is not None:
+                    nodo1 = self.nodo1[t]
+                    if len(self.uscenti[nodo1]) == 1:
+                        sequenza.append(t)
+                        # Proseguo solo se c'è un solo arco entrante in nodo1[t]
+                        if len(self.entranti[nodo1]) == 1:
+                            t = next(iter(self.uscenti[nodo1]))
+                        else:
+                            t = None
+                    else:
+                        # nodo di fine sequenza con più uscite o con 0 uscite
+                        if sequenza:
+                            sequenza.append(t)
+                        t = None
+                # Se ho già trovato una sequenza, non esploro più un altro arco del nodo di partenza
+                if len(sequenza) >= 2:
+                    return sequenza
+        return []
+
+    def trovaParalleloArchi(self) -> List[int]:
+        """
+        Ricerca di un parallelo di archi fra due nodi del grafo
+        :return: la lista degli identificativi degli archi paralleli
+        """
+        for n in self.nodi:
+            nodiOsservati = set()
+            for a in self.uscenti[n]:
+                if self.nodo1[a] in nodiOsservati:
+                    # Abbiamo trovato un nodo che si ripete fra quelli adiacenti a n
+                    return [b for b in self.uscenti[n] if self.nodo1[b] == self.nodo1[a]]
+                nodiOsservati.add(self.nodo1[a])
+        return []
+
+    def trovaParalleloArchiStessoPedice(self, pedici: Dict[int, int]) -> List[int]:
+        """
+        Controllo esistenza di un insieme di archi paralleli uscenti da uno stesso nodo e diretti
+        allo stesso nodo, tutti aventi lo stesso pedice o nessun pedice.
+        :param pedici: il dizionario che associa agli identificativi degli archi il nodo di accettazione pedice
+        :return: la lista degli identificativi degli archi paralleli con lo stesso pedice
+        """
+        parallelo = []
+        for n in self.nodi:
+            nodiOsservati = set()
+            for a in self.uscenti[n]:
+                pedice_a = pedici.get(a)
+                if (self.nodo1[a], pedice_a) in nodiOsservati:
+                    # Abbiamo trovato un nodo che si ripete fra quelli adiacenti a n con lo stesso pedice
+                    return [b for b in self.uscenti[n]
+                            if self.nodo1[b] == self.nodo1[a] and pedici.get(b) == pedice_a]
+                nodiOsservati.add((self.nodo1[a], pedice_a))
+            # Si esamina solo il primo nodo del grafo: gli altri paralleli sono risolti dall'eliminazione
+            # dei nodi intermedi
+            break
+        return parallelo
+
+    def esistonoPiuArchiStessoPedice(self, pedici: Dict[int, int], nodiAccettazione: List[int]) -> bool:
+        """
+        Ritorna True se esistono più archi del grafo marchiati dallo stesso pedice (anche None).
+        :param pedici: il dizionario che associa agli identificativi degli archi il nodo di accettazione pedice
+        :param nodiAccettazione: gli identificativi dei nodi di accettazione
+        :return: True se esistono più archi marchiati dallo stesso pedice, False altrimenti
+        """
+        # Più archi con pedice None
+        if len(self.archi) - len(pedici) > 1:
+            return True
+
+        # Conto le occorrenze di ciascun nodo di accettazione fra i pedici
+        count = {n: 0 for n in nodiAccettazione}
+        for pedice in pedici.values():
+            count[pedice] += 1
+            if count[pedice] > 1:
+                return True
+        return False
+
+    def makeDotGraph(self, nodiEvidenziati=(), archiEvidenziati=()) -> str:
+        """
+        Genera la rappresentazione in formato DOT del grafo, visualizzabile tramite GraphViz.
+        :param nodiEvidenziati: gli identificativi dei nodi da evidenziare (ad esempio perché da rimuovere)
+        :param archiEvidenziati: gli identificativi degli archi da evidenziare
+        :return: la rappresentazione in formato DOT del grafo
+        """
+        nodi = "start[shape=\"circle\"]"
+        archi = f"start\t->\tn{self.nomi[self.nodoIniziale]}"
+
+        for n in self.nodi:
+            finale = ' peripheries=2' if self.isFinale[n] else ''
+            evidenziato = " color=red" if n in nodiEvidenziati else ""
+            # Compilo i nodi
+            nodi += f"\n\tn{self.nomi[n]} [label=<<b>{self.nomi[n]}</b>>{finale}{evidenziato}]"
+            for a in self.uscenti[n]:
+                rilevanza = str(self.rilevanza[a])
+                rilevanza = f"<br/><font color=\"red\">{rilevanza}</font>" if rilevanza != "" else ""
+                evidenziato = " color=red" if a in archiEvidenziati else ""
+                # Compilo gli archi
+                archi += f"\n\tn{self.nomi[n]}\t->\tn{self.nomi[self.nodo1[a]]} [label=<{rilevanza}>{evidenziato}]"
+
+        # Compilo l'output
+        out = f"""digraph GrafoRiduzione {{
+    // ARCHI
+    {archi}
+
+    // NODI
+    {nodi}
+}}
+"""
+        return out
+
+    def debugPrintDotGraph(self, debug_on, debug_path, nodiEvidenziati=(), archiEvidenziati=()):
+        """
+        Stampa il grafo nella cartella degli output di debug, se il debug è attivo
+        :param debug_on: True se il debug è attivo
+        :param debug_path: la cartella degli output di debug
+        :param nodiEvidenziati: gli identificativi dei nodi da evidenziare
+        :param archiEvidenziati: gli identificativi degli archi da evidenziare
+        """
+        if debug_on:
+            Main.printDotGraph(self.makeDotGraph(nodiEvidenziati, archiEvidenziati),
+                               f"{debug_path}/{str(SpazioComportamentale.debug_counter).zfill(4)}_expreg")
+            SpazioComportamentale.debug_counter += 1
 
 
 class SpazioComportamentale:
@@ -699,10 +1728,13 @@ class SpazioComportamentale:
         self.nodi: List[Nodo]
         self.archi: List[Arco]
         self.nodoIniziale: Nodo
+        self.indiceNodi: Dict[tuple, Nodo]
 
         self.nodi = []
         self.archi = []
         self.nodoIniziale = Nodo()
+        # Indice che associa la chiave canonica di ciascun nodo al nodo stesso (vedi Nodo.chiave)
+        self.indiceNodi = {}
 
     def creaSpazioComportamentale(self, rete: ReteFA):
         """
@@ -714,7 +1746,7 @@ class SpazioComportamentale:
         self.creaNodoIniziale(rete)
 
         # Aggiungiamo il nodo iniziale allo SC
-        self.nodi.append(self.nodoIniziale)
+        self.addNodo(self.nodoIniziale)
 
         # Ora dobbiamo esplorare la Rete FA per costruire lo SC
 
@@ -724,16 +1756,24 @@ class SpazioComportamentale:
         # Inizializza il nodo di SC correntemente osservato
         nodoCorr = self.nodoIniziale
 
+        # Recuperiamo la tabella delle transizioni compilate della rete
+        compilata = rete.compila()
+
         # Esploriamo la rete FA e creiamo lo spazio comportamentale
         # a partire dal nodo iniziale
         while nodoCorr is not None:
-            # Scorri la lista degli stati correnti del nodo corrente
-            # scorri ogni transizione uscente di ciascuno stato corrente
-            for stato in nodoCorr.stati:
-                for trans in stato.transizioniUscenti:
+            # Codifichiamo una volta sola il nodo corrente
+            codice = compilata.codifica(nodoCorr)
+            # Scorri gli stati correnti del nodo corrente
+            # scorri ogni transizione uscente compilata di ciascuno stato corrente
+            for i in range(compilata.numComportamenti):
+                for record in compilata.transizioniUscenti[i][codice[i]]:
+                    trans = record[6]
                     # Ricaviamo il nodo successivo a partire dal nodo corrente
-                    # verificando la fattibilità della transizione uscente
-                    nodoSucc = nodoCorr.verificaFattibilitaTransizione(trans)
+                    # solo se la transizione uscente è abilitata
+                    nodoSucc = None
+                    if CodificaCompatta.abilitata(codice, record):
+                        nodoSucc = nodoCorr.applicaTransizione(record)
 
                     # Se esiste una transizione fattibile (ovvero il nodo successivo non è None)
                     if nodoSucc is not None:
@@ -782,7 +1822,7 @@ class SpazioComportamentale:
             osservazioneLineare))
 
         # Aggiungiamo il nodo iniziale allo SC
-        self.nodi.append(self.nodoIniziale)
+        self.addNodo(self.nodoIniziale)
 
         # Ora dobbiamo esplorare la Rete FA per costruire lo SC
 
@@ -792,13 +1832,19 @@ class SpazioComportamentale:
         # Inizializza il nodo di SC correntemente osservato
         nodoCorr = self.nodoIniziale
 
+        # Recuperiamo la tabella delle transizioni compilate della rete
+        compilata = rete.compila()
+
         # Esploriamo la rete FA e creiamo lo spazio comportamentale
         # a partire dal nodo iniziale
         while nodoCorr is not None:
-            # Scorri la lista degli stati correnti del nodo corrente
-            # scorri ogni transizione uscente di ciascuno stato corrente
-            for stato in nodoCorr.stati:
-                for trans in stato.transizioniUscenti:
+            # Codifichiamo una volta sola il nodo corrente
+            codice = compilata.codifica(nodoCorr)
+            # Scorri gli stati correnti del nodo corrente
+            # scorri ogni transizione uscente compilata di ciascuno stato corrente
+            for i in range(compilata.numComportamenti):
+                for record in compilata.transizioniUscenti[i][codice[i]]:
+                    trans = record[6]
                     # Ricaviamo il nodo successivo a partire dal nodo corrente
 
                     # (filtro) Procedi lungo questo ramo solo se
@@ -809,7 +1855,9 @@ class SpazioComportamentale:
                                 and trans.osservabilita == osservazioneLineare[nodoCorr.indiceOsservazione]):
 
                         # verificando la fattibilità della transizione uscente
-                        nodoSucc = nodoCorr.verificaFattibilitaTransizione(trans)
+                        nodoSucc = None
+                        if CodificaCompatta.abilitata(codice, record):
+                            nodoSucc = nodoCorr.applicaTransizione(record)
 
                         # Se esiste una transizione fattibile (ovvero il nodo successivo non è None)
                         if nodoSucc is not None:
@@ -847,6 +1895,446 @@ class SpazioComportamentale:
                 nodoCorr = None
             # Proseguiamo col while
 
+    def creaSpazioComportamentaleCompatto(self, rete: ReteFA, osservazioneLineare: List[str] = None,
+                                          riduzione=False):
+        """
+        Crea lo Spazio Comportamentale (eventualmente relativo all'osservazione lineare data) esplorando la ReteFA
+        sulla codifica compatta degli stati (vedi CodificaCompatta), senza clonare nodi e buffer ad ogni transizione.
+        I nodi vengono materializzati solo a fine esplorazione: il risultato è identico a quello di
+        creaSpazioComportamentale o di creaSpazioComportamentaleOsservazioneLineare.
+        :param rete: la ReteFA in input
+        :param osservazioneLineare: l'eventuale osservazione lineare in input
+        :param riduzione: True per applicare la riduzione a ordine parziale (vedi CodificaCompatta.esplora): lo
+                          spazio ottenuto è più piccolo, ma porta alle stesse diagnosi
+        :raises ValueError: se l'osservazione lineare in input presenta errori
+        """
+        if osservazioneLineare is not None:
+            # Verifichiamo la validità dell'osservazione lineare in input
+            rete.verificaOsservazioneLineare(osservazioneLineare)
+
+        codifica = rete.compila()
+        codici, archi = codifica.esplora(osservazioneLineare, riduzione)
+
+        # Materializziamo i nodi dello SC nell'ordine di scoperta
+        nodi = []
+        for codice, indiceOss in codici:
+            isFinale = osservazioneLineare is None or indiceOss == len(osservazioneLineare)
+            nodo = codifica.decodifica(codice, indiceOss, isFinale)
+            nodi.append(nodo)
+            self.addNodo(nodo)
+        self.nodoIniziale = nodi[0]
+
+        # Materializziamo gli archi
+        for j, h, trans in archi:
+            self.addArco(Arco(nodi[j], nodi[h], trans, trans.rilevanza, trans.osservabilita))
+
+    def creaSpazioComportamentaleParallelo(self, rete: ReteFA, processi=None, cartella: str = None):
+        """
+        Crea lo Spazio Comportamentale esplorando la ReteFA con più processi (sulla codifica compatta degli stati).
+        L'insieme dei nodi visitati è partizionato per hash del codice fra i processi (vedi
+        CodificaCompatta.lavoratoreParallelo): ciascun processo espande la frontiera della sua partizione e inoltra
+        a lotti i successori scoperti al processo proprietario, attraverso una connessione diretta per ciascuna
+        coppia di processi. Questo processo si limita a rilevare la terminazione e a raccogliere il risultato (vedi
+        coordinaEsplorazione).
+        Nodi e archi sono gli stessi di creaSpazioComportamentale, in un ordine diverso (ma deterministico).
+        :param rete: la ReteFA in input
+        :param processi: il numero di processi (None per usare tutti i core disponibili)
+        :param cartella: se data, le partizioni sono scritte in questa cartella anziché materializzate in questo
+                         Spazio Comportamentale (vedi coordinaEsplorazione)
+        """
+        if processi is None:
+            processi = os.cpu_count() or 1
+
+        pari = [[None] * processi for _ in range(processi)]
+        for a in range(processi):
+            for b in range(a + 1, processi):
+                pari[a][b], pari[b][a] = Pipe()
+
+        connessioni = []
+        lavoratori = []
+        for k in range(processi):
+            coordinatore, lavoratore = Pipe()
+            p = Process(target=CodificaCompatta.lavoratoreParallelo, args=(rete, k, pari[k], lavoratore),
+                        daemon=True)
+            p.start()
+            lavoratore.close()
+            connessioni.append(coordinatore)
+            lavoratori.append(p)
+
+        # Le estremità fra i processi appartengono ormai ai lavoratori
+        for riga in pari:
+            for connessione in riga:
+                if connessione is not None:
+                    connessione.close()
+
+        try:
+            self.coordinaEsplorazione(rete, connessioni, cartella)
+        finally:
+            for p in lavoratori:
+                p.join()
+
+    def creaSpazioComportamentaleDistribuito(self, rete: ReteFA, indirizzo: tuple, processi: int, chiave: bytes,
+                                             cartella: str = None):
+        """
+        Crea lo Spazio Comportamentale esplorando la ReteFA con processi lavoratori anche su macchine diverse, che
+        comunicano fra loro e con questo processo via TCP (vedi CodificaCompatta.lavoratoreRemoto).
+        Il metodo resta in ascolto all'indirizzo dato finché non si sono collegati tutti i lavoratori attesi, invia a
+        ciascuno la ReteFA e gli indirizzi degli altri e poi coordina l'esplorazione come
+        creaSpazioComportamentaleParallelo.
+        Il coordinatore non conserva nulla durante l'esplorazione. Se lo spazio non entra nella memoria di una sola
+        macchina conviene passare una cartella: le partizioni vi sono scritte a blocchi man mano che arrivano, senza
+        materializzare lo Spazio Comportamentale (vedi coordinaEsplorazione e creaSpazioComportamentaleDaPartizioni).
+        I messaggi dei lavoratori sono deserializzati con pickle: la chiave va tenuta segreta, perché chi la conosce
+        può far eseguire codice arbitrario al coordinatore.
+        :param rete: la ReteFA in input
+        :param indirizzo: la coppia (host, porta) su cui attendere i lavoratori
+        :param processi: il numero di lavoratori da attendere
+        :param chiave: la chiave segreta condivisa con cui i lavoratori si autenticano
+        :param cartella: l'eventuale cartella in cui scrivere le partizioni anziché materializzarle
+        """
+        connessioni = []
+        indirizzi = []
+        with Listener(indirizzo, authkey=chiave) as ascolto:
+            Log.new("\tIn attesa dei lavoratori", f"{ascolto.address[0]}:{ascolto.address[1]}")
+            while len(connessioni) < processi:
+                connessione = ascolto.accept()
+                indirizzi.append(connessione.recv())
+                connessioni.append(connessione)
+                Log.new("\tLavoratore collegato", f"{len(connessioni)}/{processi}")
+
+        try:
+            for k, connessione in enumerate(connessioni):
+                connessione.send((rete, k, indirizzi, hash(CodificaCompatta.CONTROLLO)))
+            self.coordinaEsplorazione(rete, connessioni, cartella)
+        finally:
+            for connessione in connessioni:
+                connessione.close()
+
+    def coordinaEsplorazione(self, rete: ReteFA, connessioni: list, cartella: str = None):
+        """
+        Coordina un'esplorazione partizionata della ReteFA e ne raccoglie il risultato in questo Spazio
+        Comportamentale. Ciascuna connessione porta a un processo che esegue CodificaCompatta.lavoratoreParallelo
+        e custodisce la partizione dei codici che gli spetta secondo CodificaCompatta.proprietario.
+        I processi si scambiano i successori direttamente: il coordinatore ne rileva soltanto la terminazione con
+        il metodo dei quattro contatori. A ogni giro invia una sonda a tutti i processi, che rispondono appena
+        inattivi con il numero di lotti inviati e ricevuti; l'esplorazione è terminata quando due giri consecutivi
+        restituiscono gli stessi contatori, con tanti lotti ricevuti quanti inviati (nessun lotto è in viaggio e
+        nessun processo ha ricevuto o inviato lotti fra i due giri).
+        Poi raccoglie i nodi di tutte le partizioni e quindi i loro archi, e infine congeda i processi.
+        Se è data una cartella, i blocchi di nodi e di archi di ciascuna partizione k sono invece scritti man mano
+        nei file nodi_k.pickle e archi_k.pickle (vedi CodificaCompatta.leggiBlocchi), insieme al file indice.pickle
+        con il numero di partizioni e il codice iniziale: in memoria resta un blocco alla volta, e lo Spazio
+        Comportamentale può essere materializzato in seguito con creaSpazioComportamentaleDaPartizioni.
+        :param rete: la ReteFA in input
+        :param connessioni: le connessioni verso i processi, nell'ordine delle partizioni
+        :param cartella: l'eventuale cartella in cui scrivere le partizioni, anziché materializzarle
+        """
+        codifica = rete.compila()
+        try:
+            # Rilevamento della terminazione
+            precedenti = None
+            while True:
+                for connessione in connessioni:
+                    connessione.send("sonda")
+                contatori = [connessione.recv() for connessione in connessioni]
+                if contatori == precedenti and sum(s for s, _ in contatori) == sum(r for _, r in contatori):
+                    break
+                precedenti = contatori
+
+            if cartella is not None:
+                os.makedirs(cartella, exist_ok=True)
+                for k, connessione in enumerate(connessioni):
+                    for tipo in ("nodi", "archi"):
+                        connessione.send(tipo)
+                        with open(os.path.join(cartella, f"{tipo}_{k}.pickle"), "wb") as file:
+                            for blocco in iter(connessione.recv, None):
+                                dump(blocco, file)
+                with open(os.path.join(cartella, "indice.pickle"), "wb") as file:
+                    dump((len(connessioni), codifica.codiceIniziale()), file)
+                return
+
+            def blocchi(tipo):
+                # Blocchi di un tipo ("nodi" o "archi") di tutte le partizioni, nell'ordine delle partizioni
+                for connessione in connessioni:
+                    connessione.send(tipo)
+                    yield from iter(connessione.recv, None)
+
+            self.materializzaPartizioni(codifica, blocchi("nodi"), blocchi("archi"))
+        finally:
+            for connessione in connessioni:
+                try:
+                    connessione.send("fine")
+                except OSError:
+                    # Il processo è già terminato: non deve nascondere l'errore che ha interrotto l'esplorazione
+                    pass
+
+    def creaSpazioComportamentaleDaPartizioni(self, rete: ReteFA, cartella: str):
+        """
+        Materializza lo Spazio Comportamentale a partire dalle partizioni scritte su disco da un'esplorazione
+        parallela o distribuita (vedi coordinaEsplorazione).
+        I file sono letti con pickle: la cartella deve provenire da una fonte fidata.
+        :param rete: la stessa ReteFA dell'esplorazione che ha scritto le partizioni
+        :param cartella: la cartella delle partizioni
+        """
+        with open(os.path.join(cartella, "indice.pickle"), "rb") as file:
+            processi, iniziale = load(file)
+        codifica = rete.compila()
+        if codifica.codiceIniziale() != iniziale:
+            raise ValueError(f"Le partizioni in '{cartella}' non appartengono alla ReteFA data")
+
+        def blocchi(tipo):
+            for k in range(processi):
+                yield from CodificaCompatta.leggiBlocchi(os.path.join(cartella, f"{tipo}_{k}.pickle"))
+
+        self.materializzaPartizioni(codifica, blocchi("nodi"), blocchi("archi"))
+
+    def materializzaPartizioni(self, codifica: CodificaCompatta, blocchiNodi, blocchiArchi):
+        """
+        Materializza in questo Spazio Comportamentale i nodi e gli archi di un'esplorazione partizionata
+        :param codifica: la codifica compatta della ReteFA esplorata
+        :param blocchiNodi: i blocchi di codici dei nodi (vengono consumati tutti prima degli archi)
+        :param blocchiArchi: i blocchi di archi come quaterne (codice, i, r, successore)
+        """
+        nodi = {}
+        for blocco in blocchiNodi:
+            for codice in blocco:
+                nodo = codifica.decodifica(codice)
+                nodi[codice] = nodo
+                self.addNodo(nodo)
+        self.nodoIniziale = nodi[codifica.codiceIniziale()]
+
+        for blocco in blocchiArchi:
+            for codice, i, r, succ in blocco:
+                trans = codifica.transizioniUscenti[i][codice[i]][r][6]
+                self.addArco(Arco(nodi[codice], nodi[succ], trans, trans.rilevanza, trans.osservabilita))
+
+    def creaSpazioComportamentaleComposizionale(self, rete: ReteFA, cartellaCache: str = None):
+        """
+        Crea lo Spazio Comportamentale componendo gli spazi locali dei comportamenti della ReteFA (vedi
+        SpazioLocale). Lo spazio locale di ciascun comportamento, minimizzato rispetto alle operazioni sui link
+        condivisi e alle etichette di osservabilità e rilevanza, è riusato dalla cache se il comportamento è già
+        stato incontrato (anche in un'altra rete). I gruppi di comportamenti sono poi composti a coppie, scegliendo
+        ogni volta la coppia che condivide almeno un link con il prodotto delle dimensioni più piccolo, e ciascun
+        prodotto è minimizzato prima del passo successivo.
+        Lo spazio ottenuto è bisimile a quello di creaSpazioComportamentale, e porta quindi alle stesse diagnosi,
+        ma ha in generale meno nodi: ciascun nodo rappresenta una classe di nodi bisimili.
+        :param rete: la ReteFA in input
+        :param cartellaCache: l'eventuale cartella su disco in cui conservare gli spazi locali dei comportamenti
+        """
+        codifica = rete.compila()
+        n = codifica.numComportamenti
+
+        # Comportamenti che operano su ciascun link
+        toccati = [set() for _ in rete.links]
+        for i, stati in enumerate(codifica.transizioniUscenti):
+            for records in stati:
+                for record in records:
+                    if record[3] >= 0:
+                        toccati[record[3]].add(i)
+                    for k, _ in record[5]:
+                        toccati[k].add(i)
+
+        gruppi = []
+        for i in range(n):
+            interni = tuple(k for k, c in enumerate(toccati) if c == {i})
+            gruppi.append(SpazioLocale.daComportamento(codifica, i, interni, cartellaCache))
+
+        while len(gruppi) > 1:
+            # Coppia di gruppi da comporre: quelle che condividono un link hanno la precedenza
+            migliore = None
+            for a in range(len(gruppi)):
+                for b in range(a + 1, len(gruppi)):
+                    unione = set(gruppi[a].comportamenti) | set(gruppi[b].comportamenti)
+                    condivisi = any(c and c <= unione and not c <= set(gruppi[a].comportamenti)
+                                    and not c <= set(gruppi[b].comportamenti) for c in toccati)
+                    chiave = (not condivisi, len(gruppi[a].rappresentanti) * len(gruppi[b].rappresentanti))
+                    if migliore is None or chiave < migliore[0]:
+                        migliore = (chiave, a, b)
+            _, a, b = migliore
+            unione = set(gruppi[a].comportamenti) | set(gruppi[b].comportamenti)
+            nuoviInterni = tuple(k for k, c in enumerate(toccati)
+                                 if c and c <= unione and not c <= set(gruppi[a].comportamenti)
+                                 and not c <= set(gruppi[b].comportamenti))
+            prodotto = SpazioLocale.prodotto([gruppi[a], gruppi[b]], nuoviInterni).minimizza()
+            gruppi = [g for j, g in enumerate(gruppi) if j not in (a, b)] + [prodotto]
+        spazio = gruppi[0]
+
+        # Materializziamo i nodi dei rappresentanti: i link non usati da nessun comportamento restano vuoti
+        nodi = []
+        for stati, contenuto in spazio.rappresentanti:
+            codice = [0] * (n + len(rete.links))
+            for i, s in zip(spazio.comportamenti, stati):
+                codice[i] = s
+            for k, e in zip(spazio.linkInterni, contenuto):
+                codice[n + k] = e
+            nodo = codifica.decodifica(tuple(codice))
+            nodi.append(nodo)
+            self.addNodo(nodo)
+        self.nodoIniziale = nodi[spazio.iniziale]
+
+        # Materializziamo gli archi
+        for x, mosse in enumerate(spazio.uscenti):
+            for _, y, trans in mosse:
+                self.addArco(Arco(nodi[x], nodi[y], trans, trans.rilevanza, trans.osservabilita))
+
+    def creaSpazioComportamentaleStratificato(self, rete: ReteFA, osservazioneLineare: List[str],
+                                              potaturaAnticipata=False):
+        """
+        Crea lo Spazio Comportamentale relativo all'osservazione lineare esplorando la ReteFA uno strato alla volta:
+        lo strato k contiene i nodi con indiceOsservazione k, ed è esplorato in ampiezza (sulla codifica compatta)
+        solo dopo aver completato lo strato k-1. L'indice per riconoscere i nodi già visitati è tenuto per il solo
+        strato corrente e per il successivo.
+        Se uno strato risulta vuoto l'osservazione lineare non è compatibile con la rete e l'esplorazione termina
+        subito (lo spazio ottenuto sarà poi rifiutato da potaturaRidenominazione).
+        Nodi e archi sono gli stessi di creaSpazioComportamentaleOsservazioneLineare, ma in un ordine diverso.
+        :param rete: la ReteFA in input
+        :param osservazioneLineare: l'osservazione lineare in input
+        :param potaturaAnticipata: True per eliminare i nodi senza uscita di ciascuno strato (quelli da cui non si
+                                   raggiunge lo strato successivo) non appena lo strato è completo
+        :raises ValueError: se l'osservazione lineare in input presenta errori
+        """
+        # Verifichiamo la validità dell'osservazione lineare in input
+        rete.verificaOsservazioneLineare(osservazioneLineare)
+
+        codifica = rete.compila()
+        # Coppie (codice, indiceOsservazione) in ordine di scoperta, archi come terne (nodo0, nodo1, transizione)
+        codici = [(codifica.codiceIniziale(), 0)]
+        archi = []
+        potati = set()
+
+        # Indice dello strato corrente: codice -> posizione in codici
+        strato = {codici[0][0]: 0}
+        for k in range(len(osservazioneLineare) + 1):
+            osservazione = osservazioneLineare[k] if k < len(osservazioneLineare) else None
+            prossimo = {}
+            archiStrato = []
+
+            # Visita in ampiezza dello strato k
+            coda = deque(strato.values())
+            while coda:
+                j = coda.popleft()
+                codice = codici[j][0]
+                for i in range(codifica.numComportamenti):
+                    for record in codifica.transizioniUscenti[i][codice[i]]:
+                        trans = record[6]
+                        # (filtro) le transizioni non osservabili restano nello strato, quelle corrispondenti
+                        # all'osservazione k portano allo strato successivo
+                        if trans.osservabilita == "":
+                            indice, indiceSucc = strato, k
+                        elif trans.osservabilita == osservazione:
+                            indice, indiceSucc = prossimo, k + 1
+                        else:
+                            continue
+
+                        succ = codifica.successore(codice, record)
+                        if succ is None:
+                            continue
+
+                        h = indice.get(succ)
+                        if h is None:
+                            h = len(codici)
+                            codici.append((succ, indiceSucc))
+                            indice[succ] = h
+                            if indiceSucc == k:
+                                coda.append(h)
+                        archiStrato.append((j, h, trans))
+
+            if potaturaAnticipata and osservazione is not None:
+                # Sono vivi i nodi dello strato da cui si raggiunge un arco verso lo strato successivo
+                entranti = {}
+                vivi = set()
+                for j, h, trans in archiStrato:
+                    if codici[h][1] == k:
+                        entranti.setdefault(h, []).append(j)
+                    else:
+                        vivi.add(j)
+                pila = list(vivi)
+                while pila:
+                    h = pila.pop()
+                    for j in entranti.get(h, ()):
+                        if j not in vivi:
+                            vivi.add(j)
+                            pila.append(j)
+                potati.update(j for j in strato.values() if j not in vivi)
+                archiStrato = [(j, h, trans) for j, h, trans in archiStrato if j in vivi and h not in potati]
+
+            archi.extend(archiStrato)
+            if not prossimo:
+                if osservazione is not None:
+                    Log.new("creaSpazioComportamentaleStratificato",
+                            f"Nessun nodo compatibile con l'osservazione {k}, esplorazione interrotta")
+                break
+            strato = prossimo
+
+        # Materializziamo i nodi dello SC
+        nodi = {}
+        for j, (codice, indiceOss) in enumerate(codici):
+            if j in potati:
+                continue
+            nodo = codifica.decodifica(codice, indiceOss, indiceOss == len(osservazioneLineare))
+            nodi[j] = nodo
+            self.addNodo(nodo)
+        self.nodoIniziale = nodi.get(0)
+
+        # Materializziamo gli archi (senza quelli che entrano in nodi potati dello strato successivo)
+        for j, h, trans in archi:
+            if h in nodi:
+                self.addArco(Arco(nodi[j], nodi[h], trans, trans.rilevanza, trans.osservabilita))
+
+    def creaSpazioComportamentaleProdotto(self, spazio: 'SpazioComportamentale', osservazioneLineare: List[str],
+                                          rete: ReteFA = None):
+        """
+        Crea lo Spazio Comportamentale relativo all'osservazione lineare come prodotto sincrono di uno Spazio
+        Comportamentale già costruito (e potato) per la stessa rete con l'automa lineare dell'osservazione, senza
+        riesplorare la ReteFA: gli archi non osservabili dello spazio lasciano invariato l'indice dell'osservazione,
+        quelli osservabili lo fanno avanzare solo se corrispondono all'osservazione successiva.
+        Dopo la potatura il risultato ha gli stessi nodi e archi di creaSpazioComportamentaleOsservazioneLineare
+        (i nodi che lo spazio di partenza ha già potato non possono comunque raggiungere un nodo finale).
+        I nodi condividono stati e buffer con i nodi dello spazio di partenza: non vanno modificati sul posto.
+        :param spazio: lo SpazioComportamentale della rete (ad esempio quello generato da compito 1)
+        :param osservazioneLineare: l'osservazione lineare in input
+        :param rete: la ReteFA dello spazio, se data l'osservazione lineare viene verificata
+        :raises ValueError: se l'osservazione lineare in input presenta errori
+        """
+        if rete is not None:
+            # Verifichiamo la validità dell'osservazione lineare in input
+            rete.verificaOsservazioneLineare(osservazioneLineare)
+
+        # Nodi del prodotto, per coppia (id del nodo dello spazio, indice dell'osservazione)
+        prodotto: Dict[tuple, Nodo]
+        prodotto = {}
+
+        def nodoProdotto(nodo: Nodo, indiceOss: int) -> Nodo:
+            chiave = (id(nodo), indiceOss)
+            nuovo = prodotto.get(chiave)
+            if nuovo is None:
+                nuovo = Nodo()
+                nuovo.stati = list(nodo.stati)
+                nuovo.contenutoLink = list(nodo.contenutoLink)
+                nuovo.indiceOsservazione = indiceOss
+                nuovo.isFinale = nodo.isFinale and indiceOss == len(osservazioneLineare)
+                prodotto[chiave] = nuovo
+                self.addNodo(nuovo)
+                nodiDaEsplorare.append((nodo, nuovo))
+            return nuovo
+
+        nodiDaEsplorare = []
+        self.nodoIniziale = nodoProdotto(spazio.nodoIniziale, 0)
+        while nodiDaEsplorare:
+            nodo, nodoCorr = nodiDaEsplorare.pop()
+            indiceOss = nodoCorr.indiceOsservazione
+            a: Arco
+            for a in nodo.archiUscenti:
+                # (filtro) come in creaSpazioComportamentaleOsservazioneLineare
+                if a.osservabilita == "":
+                    indiceSucc = indiceOss
+                elif indiceOss < len(osservazioneLineare) and a.osservabilita == osservazioneLineare[indiceOss]:
+                    indiceSucc = indiceOss + 1
+                else:
+                    continue
+                nodoSucc = nodoProdotto(a.nodo1, indiceSucc)
+                self.addArco(Arco(nodoCorr, nodoSucc, a.transizione, a.rilevanza, a.osservabilita))
+
     def creaNodoIniziale(self, rete: ReteFA):
         """
         Generazione del nodo iniziale dello SC
@@ -867,65 +2355,33 @@ class SpazioComportamentale:
 
     def addArco(self, arco: Arco) -> None:
         """
-        Aggiunge un arco alla lista degli archi di questo Spazio Comportamentale
-        e alla lista di archi uscenti dal nodo di origine dell'arco
+        Aggiunge un arco alla lista degli archi di questo Spazio Comportamentale,
+        alla lista di archi uscenti dal nodo di origine dell'arco
+        e alla lista di archi entranti nel nodo di destinazione dell'arco
         :param arco: l'arco da aggiungere
         """
         self.archi.append(arco)
         arco.nodo0.archiUscenti.append(arco)
+        arco.nodo1.archiEntranti.append(arco)
 
     def addNodo(self, nodo: Nodo) -> None:
         """
         Aggiunge un nodo alla lista degli nodi di questo Spazio Comportamentale
+        e all'indice dei nodi per chiave
         :param nodo: il nodo da aggiungere
         """
         self.nodi.append(nodo)
+        self.indiceNodi[nodo.chiave()] = nodo
 
     def ricercaNodo(self, nodo: Nodo) -> Nodo:
         """
-        Ricerca per valore il nodo dato fra i nodi dello SpazioComportamentale
+        Ricerca per valore il nodo dato fra i nodi dello SpazioComportamentale.
+        La ricerca avviene in tempo costante attraverso l'indice dei nodi per chiave.
         :param nodo: il nodo da cercare per valore in questa struttura
         :return: il riferimento al nodo cercato se presente, None altrimenti
         """
-        # Scorriamo i nodi dello spazio comportamentale
-        # alla ricerca di un nodo che sia come quello in input
-        for nodoCorr in self.nodi:
-            # # Verifichiamo tutte le features del nodo
-            # # da trovare confrontandole con quelle del nodo
-            # # correntemente analizzato dal ciclo partendo da
-            # # quelle meno dispendiose per risparmiare cicli
-            #
-            # # Se il nodo corrente non è come il nodo in input
-            # # rispetto a isFinale, passa all'iter successiva
-            # if nodo.isFinale != nodoCorr.isFinale:
-            #     continue
-            #
-            # # (ipotizziamo ora che vi siano sempre meno stati che li
-            # # quindi valutiamo prima la corrispondenza sugli stati)
-            # # Se il nodo corrente non è come il nodo in input
-            # # rispetto agli stati (confronto per valore con cortocircuito),
-            # # passa all'iterazione successiva del for each
-            # # todo: forse è meglio gestire gli stati come set?
-            # if set(nodo.stati) != set(nodoCorr.stati):
-            #     continue
-            #
-            # # Se il nodo corrente non è come il nodo in input
-            # # rispetto al contenuto dei buffer
-            # # (confronto per valore con cortocircuito),
-            # # passa all'iterazione successiva
-            # # todo: controlla che faccia bene il confronto fra i buffer!
-            # if set(nodo.contenutoLink) != set(nodoCorr.contenutoLink):
-            #     continue
-            ## NOTA: questo codice serve per riparare l'== in caso in cui ci venga in mente che il confronto per valore
-            ## non ci piace più
-
-            # Se abbiamo trovato il nodo corrispondente a quello in input
-            # lo ritorniamo
-            if nodo == nodoCorr:
-                return nodoCorr
-
-        # Se il nodo non è stato trovato
-        return None
+        # Cerchiamo nell'indice il nodo con la stessa chiave canonica di quello in input
+        return self.indiceNodi.get(nodo.chiave(), None)
 
     def decidiPotatura(self) -> None:
         """
@@ -954,13 +2410,13 @@ class SpazioComportamentale:
                 nextArco = not None
                 while nextArco is not None:
                     nodoCorrente.isPotato = False
-                    for arco in self.archi:
-                        if arco.nodo1 == nodoCorrente:
-                            arco.isPotato = False
-                            # Faccio il push dell'arco da eplorare solo se non ho ancora visitato il nodo
-                            # Questo meccanismo evita i cicli sul grafo
-                            if arco.nodo0.isPotato:
-                                archiDaEsplorare.append(arco)
+                    # Risaliamo gli archi entranti nel nodo corrente
+                    for arco in nodoCorrente.archiEntranti:
+                        arco.isPotato = False
+                        # Faccio il push dell'arco da eplorare solo se non ho ancora visitato il nodo
+                        # Questo meccanismo evita i cicli sul grafo
+                        if arco.nodo0.isPotato:
+                            archiDaEsplorare.append(arco)
                     # Estrai il prossimo arco da esplorare se c'è
                     if archiDaEsplorare:
                         nextArco = archiDaEsplorare.pop()
@@ -982,9 +2438,10 @@ class SpazioComportamentale:
         # Elimina gli archi da potare
         self.archi = [a for a in self.archi if not a.isPotato]
 
-        # Elimino gli archi potati dalle liste di adiacenza di ogni nodo non potato
+        # Elimino gli archi potati dalle liste di adiacenza (uscenti ed entranti) di ogni nodo non potato
         for nodo in self.nodi:
             nodo.archiUscenti = [a for a in nodo.archiUscenti if not a.isPotato]
+            nodo.archiEntranti = [a for a in nodo.archiEntranti if not a.isPotato]
 
     def potatura(self) -> None:
         """
@@ -999,22 +2456,70 @@ class SpazioComportamentale:
             if not nodo.isPotato:
                 nodiClone.append(nodo)
             else:
+                # rimuovo il nodo dall'indice dei nodi per chiave
+                chiave = nodo.chiave()
+                if self.indiceNodi.get(chiave) is nodo:
+                    del self.indiceNodi[chiave]
                 # flaggo come da potare tutti gli archi entranti e uscenti dal nodo
                 a: Arco
-                for a in self.archi:
-                    if a.nodo0 is nodo or a.nodo1 is nodo:
-                        a.isPotato = True
+                for a in nodo.archiUscenti:
+                    a.isPotato = True
+                for a in nodo.archiEntranti:
+                    a.isPotato = True
         # Aggiorno i nodi coi nodi non potati
         self.nodi = nodiClone
         # Pota gli archi da potare, sia dalla lista degli archi,
         # sia dalle liste d'adiacenza di ciascun nodo
         self.potaturaArchi()
 
-    def potaturaRidenominazione(self) -> None:
+    def potaturaLineare(self) -> None:
+        """
+        Decide quali nodi e archi potare e li rimuove dallo Spazio Comportamentale in tempo lineare.
+        Effettua un'unica visita in ampiezza all'indietro (sugli archi entranti) a partire da tutti i nodi finali,
+        poi un'unica passata di compattazione che ricostruisce nodi, archi e liste di adiacenza.
+        Il risultato è identico a quello di decidiPotatura seguito da potatura.
+        """
+        # precondizione: ogni nuovo nodo e arco ha inizialmente isPotato=true
+        self.setAllIsPotato(True)
+
+        # Inizializzo la coda della visita con tutti i nodi finali
+        nodiDaEsplorare = deque()
+        for nodo in self.nodi:
+            if nodo.isFinale:
+                nodo.isPotato = False
+                nodiDaEsplorare.append(nodo)
+
+        # Visita in ampiezza all'indietro: ogni nodo e ogni arco sono esaminati una volta sola
+        while nodiDaEsplorare:
+            nodoCorrente = nodiDaEsplorare.popleft()
+            for arco in nodoCorrente.archiEntranti:
+                arco.isPotato = False
+                if arco.nodo0.isPotato:
+                    arco.nodo0.isPotato = False
+                    nodiDaEsplorare.append(arco.nodo0)
+
+        # Compattazione: teniamo solo nodi e archi non potati.
+        # Gli archi entranti in un nodo non potato non sono mai potati, mentre
+        # gli archi uscenti possono portare a nodi potati e vanno filtrati
+        nodi = []
+        for nodo in self.nodi:
+            if nodo.isPotato:
+                # rimuovo il nodo dall'indice dei nodi per chiave
+                chiave = nodo.chiave()
+                if self.indiceNodi.get(chiave) is nodo:
+                    del self.indiceNodi[chiave]
+            else:
+                nodo.archiUscenti = [a for a in nodo.archiUscenti if not a.isPotato]
+                nodi.append(nodo)
+        self.nodi = nodi
+        self.archi = [a for a in self.archi if not a.isPotato]
+
+    def potaturaRidenominazione(self, lineare=False) -> None:
         """
         Decide quali nodi e archi potare (ovvero quelli che non portano ad un nodo finale), li rimuove dallo Spazio
         Comportamentale e dunque li ridenomina usando un ID progressivo dato dall'ordine di esplorazione.
 
+        :param lineare: True per usare la potatura in tempo lineare (vedi potaturaLineare), con risultato identico
         :raises ValueError: se lo spazio comportamentale è vuoto prima o dopo la potatura
         """
         # Verifichiamo se ci sono nodi nello spazio comportamentale, in tal caso la potatura non ha senso
@@ -1024,16 +2529,20 @@ class SpazioComportamentale:
             Log.new("potaturaRidenominazione, ValueError", messaggio)
             raise ValueError(messaggio)
 
-        # Decidi quali archi e quali nodi potare
-        self.decidiPotatura()
-
         # Effettua potatura e ridenominazione dei nodi
         # Logga le stat prima della potatura
         nodi_pre_potatura = len(self.nodi)
         archi_pre_potatura = len(self.archi)
 
-        # Elimina nodi e archi da potare
-        self.potatura()
+        if lineare:
+            # Decidi quali archi e quali nodi potare e eliminali in un'unica passata
+            self.potaturaLineare()
+        else:
+            # Decidi quali archi e quali nodi potare
+            self.decidiPotatura()
+
+            # Elimina nodi e archi da potare
+            self.potatura()
 
         # Logga le stat dopo la potatura
         nodi_post_potatura = len(self.nodi)
@@ -1061,85 +2570,6 @@ class SpazioComportamentale:
             Log.new("potaturaRidenominazione, ValueError", messaggio)
             raise ValueError(messaggio)
 
-    def trovaSerieArchi(self) -> List[Arco]:
-        """
-        Ricerca di una sequenza "obbligata" di archi,
-        senza possibili bivi al suo interno (ovvero una serie).
-        :return: una serie di archi all'interno di questo SpazioComportamentale
-        """
-        # Inizializzo la sequenza in modo da darle lo scope corretto
-        sequenza = []
-
-        # Cerco e compilo una sequenza obbligata nello sc
-        # (la prima che trovo a partire dal nodo iniziale ni)
-        ni: Nodo
-        for ni in self.nodi:
-            t: Arco
-            for t in ni.archiUscenti:
-                sequenza = []
-                while t is not None:
-                    if len(t.nodo1.archiUscenti) == 1:
-                        # verifico se ci sono più di due archi entranti in nodo1[t]
-                        # metto questa verifica nell'if per risparmiare calcoli inutili
-                        # (mi interessa che ci sia un solo arco entrante in nodo1[t])
-                        numeroArchiEntranti = 0
-                        a: Arco
-                        for a in self.archi:
-                            if a.nodo1 is t.nodo1:
-                                numeroArchiEntranti += 1
-                            if numeroArchiEntranti > 1:
-                                break
-
-                        # Se anche gli archi entranti sono uguali a 1 procedo
-                        if numeroArchiEntranti == 1:
-                            sequenza.append(t)
-                            t = t.nodo1.archiUscenti[0]
-                        else:
-                            # sono giunto ad un nodo di fine sequenza con più entrate
-                            sequenza.append(t)
-                            t = None
-                        # fine if lunghezza archi entranti
-                    else:
-                        # siamo di fronte a un nodo di fine sequenza con più uscite
-                        # o quando siamo di fronte a un nodo di fine sequenza con 0 uscite
-                        if sequenza:
-                            sequenza.append(t)
-                        t = None
-                    # fine if sulla lunghezza degli archi uscenti
-                # fine del while che compone la sequenza
-                # Se ho già trovato una sequenza, non esploro più un altro arco del nodo di partenza
-                if len(sequenza) >= 2:
-                    return sequenza
-            # fine del for sugli archi uscenti da ni
-        # fine del for sui nodi dello sc quando non ho trovato una sequenza
-        return []
-
-    def trovaParalleloArchi(self) -> List[Arco]:
-        """
-        Ricerca di un parallelo di archi fra due nodi nello Spazio Comportamentale
-        :return: una lista di archi paralleli
-        """
-        parallelo = []
-        n: Nodo
-        for n in self.nodi:
-            # Inizializzo la lista di nodi adiacenti ad n osservati
-            nodiOsservati = []
-            a: Arco
-            for a in n.archiUscenti:
-                if a.nodo1 in nodiOsservati:
-                    # Abbiamo trovato un nodo che si ripete fra quelli adiacenti a n
-                    # quindi compiliamo il parallelo e ritorniamolo
-                    b: Arco
-                    for b in n.archiUscenti:
-                        if b.nodo1 is a.nodo1:
-                            parallelo.append(b)
-                    # Ho trovato degli archi paralleli, quindi li ritorno
-                    return parallelo
-                # Ho osservato un nodo nuovo fra quelli adiacenti a n
-                nodiOsservati.append(a.nodo1)
-        # Non ho trovato dei paralleli, ritorno la lista vuota
-        return parallelo
-
     def setAllIsPotato(self, isPotato) -> None:
         """
         Imposta il flag isPotato di tutti gli archi e i nodi dello Spazio Comportamentale
@@ -1152,85 +2582,44 @@ class SpazioComportamentale:
         for nodo in self.nodi:
             nodo.isPotato = isPotato
 
-    def debugPrintDotGraph(self, debug_on, debug_path):
-        """
-        Stampa lo spazio comportamentale nella cartella degli output di debug, se il debug è attivo
-        :param debug_on: True se il debug è attivo
-        """
-        if debug_on:
-            Main.printDotGraph(self.makeDotGraph(),
-                               f"{debug_path}/{str(SpazioComportamentale.debug_counter).zfill(4)}_expreg")
-            SpazioComportamentale.debug_counter += 1
-
     def espressioneRegolare(self, debug_on=False, debug_path="") -> str:
         """
         Genera la diagnosi (espressione regolare) relativa a uno SpazioComportamentale semplificando archi in serie,
         in parallelo e cappi.
+        La semplificazione avviene su un GrafoRiduzione costruito a partire da questo spazio, che resta inalterato.
         :param debug_on: True per generare informazioni di debug (stampa i grafi ad ogni iterazione)
         :return: L'espressione regolare è la stringa di rilevanza dell'unico arco rimasto dopo la semplificazione
         """
-        # Cloniamo questo Spazio Comportamentale nell'automa scN
-        # Questa clonazione è una copia deep poiché le operazioni seguenti romperebbero i legami fra archi e nodi
-        # dello spazio comportamentale corrente.
-        scN = copy.deepcopy(self)
+        # Costruiamo il grafo di lavoro g, con soli identificativi interi ed etichette di rilevanza
+        g = GrafoRiduzione.daSpazio(self)
 
-        # Definisco un nuovo nodo iniziale n0, un nuovo nodo finale nq per scN
-        n0 = scN.nodoIniziale  # inizialmente è pari al nodo iniziale di scN
+        # Definisco un nuovo nodo iniziale n0, un nuovo nodo finale nq per g
+        n0 = g.nodoIniziale  # inizialmente è pari al nodo iniziale di g
         nq = None
 
-        # Verifichiamo se nel nodo iniziale sono presenti archi entranti
-        esisteTransizioneEntranteANodoIniziale = False
-        for arco in scN.archi:
-            if arco.nodo1 is scN.nodoIniziale:
-                esisteTransizioneEntranteANodoIniziale = True
-                break
-
-        # Se abbiamo trovato un arco entrante nel nodo iniziale
+        # Se sono presenti archi entranti nel nodo iniziale
         # creiamo un nuovo nodo iniziale n0 ed un arco con
-        # etichette nulle da n0 al nodo iniziale di scN
-        if esisteTransizioneEntranteANodoIniziale:
-            # Creiamo il nodo n0, nodo iniziale di scN
-            n0 = Nodo()
-            n0.nome = "n0"
-            n0.isPotato = False
-            n0.isFinale = False
-
-            # Creiamo l'arco da n0 al vecchio nodoIniziale
-            a0 = Arco(n0, scN.nodoIniziale, transizione=None, rilevanza="", osservabilita="")
-            a0.isPotato = False
-
-            # Aggiungiamo a scN il nodo n0 e l'arco a0
-            scN.addNodo(n0)
-            scN.addArco(a0)
+        # etichette nulle da n0 al nodo iniziale di g
+        if g.entranti[g.nodoIniziale]:
+            n0 = g.addNodo(nome="n0")
+            g.addArco(n0, g.nodoIniziale, Espressione.EPSILON)
 
         # Verifichiamo se ci sono più stati di accettazione
         # Creiamo una lista di stati di accettazione
-        statiAccettazione = [n for n in scN.nodi if n.isFinale]
+        statiAccettazione = [n for n in g.nodi if g.isFinale[n]]
 
-        # Esiste una transizione uscente dall'unico stato di accettazione?
         # Se esistono più stati di accettazione o esiste
         # una transizione uscente dall'unico stato di accettazione...
-        if len(statiAccettazione) > 1 or (len(statiAccettazione) == 1 and len(statiAccettazione[0].archiUscenti) >= 1):
+        if len(statiAccettazione) > 1 or (len(statiAccettazione) == 1 and g.uscenti[statiAccettazione[0]]):
             # Vogliamo che l'unico stato di accettazione/nodo finale sia nq
-            for nodo in statiAccettazione:
-                nodo.isFinale = False
-
-            # Inizializziamo nq, nodo finale di scN
-            nq = Nodo()
-            nq.nome = "nq"
-            nq.isPotato = False
-            nq.isFinale = True
-
-            # Aggiungiamo a scN il nodo nq
-            scN.addNodo(nq)
+            for n in statiAccettazione:
+                g.isFinale[n] = False
+            nq = g.addNodo(isFinale=True, nome="nq")
 
             # Creiamo un arco (eps-transizione) da ciascuno stato di
-            # accettazione di scN al nuovo nodo finale nq
+            # accettazione di g al nuovo nodo finale nq
             for n in statiAccettazione:
-                aq = Arco(n, nq, None, "", "")
-                aq.isPotato = False
-                # Aggiungiamo a scN l'arco costruito
-                scN.addArco(aq)
+                g.addArco(n, nq, Espressione.EPSILON)
         else:
             # Altrimenti lo stato finale nq è l'unico stato di accettazione
             nq = statiAccettazione[0]
@@ -1238,148 +2627,216 @@ class SpazioComportamentale:
 
         # DEBUG
         # Stampo il grafo a seguito della generazione dei nodi n0 e nq
-        scN.debugPrintDotGraph(debug_on, debug_path)
+        g.debugPrintDotGraph(debug_on, debug_path)
         # /DEBUG
 
         # Definizione dell'espressione regolare
-        while len(scN.archi) > 1:
+        while len(g.archi) > 1:
             # Esiste una serie di archi fra due nodi?
-            serie = scN.trovaSerieArchi()
+            serie = g.trovaSerieArchi()
             # se la serie non è vuota
             if serie:
                 # Sostituire la serie con l'arco <n,strRilevanza,n'>
                 # Definisco la stringa di rilevanza
-                strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie(serie)
+                strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie([g.rilevanza[a] for a in serie])
 
                 # Tengo traccia dei nodi iniziale e finale della serie
-                nodoInizioSerie = serie[0].nodo0
-                nodoFineSerie = serie[-1].nodo1
-
-                # Resettiamo isPotato per tutti gli archi e tutti i nodi di scN
-                scN.setAllIsPotato(False)
+                nodoInizioSerie = g.nodo0[serie[0]]
+                nodoFineSerie = g.nodo1[serie[-1]]
 
-                # Indichiamo come da potare da scN tutti gli archi presenti nella serie
-                # e tutti i nodi nella serie eccetto il primo e l'ultimo
-                for arco in serie:
-                    arco.isPotato = True
-                    if arco.nodo1 is not nodoFineSerie:
-                        arco.nodo1.isPotato = True
+                # I nodi da rimuovere sono tutti i nodi nella serie eccetto il primo e l'ultimo
+                nodiSerie = [g.nodo1[a] for a in serie if g.nodo1[a] != nodoFineSerie]
 
                 # DEBUG
-                # Stampo il grafo prima della potatura
-                scN.debugPrintDotGraph(debug_on, debug_path)
+                # Stampo il grafo prima della rimozione
+                g.debugPrintDotGraph(debug_on, debug_path, nodiSerie, serie)
                 # /DEBUG
 
-                # Elimino nodi e archi indicati come isPotato == True
-                scN.potatura()
+                # Rimuovo gli archi della serie e i nodi al suo interno
+                for a in serie:
+                    g.rimuoviArco(a)
+                for n in nodiSerie:
+                    g.rimuoviNodo(n)
 
-                # Creo il nuovo arco che sostituisce la serie potata, e lo aggiungo
-                scN.addArco(Arco(nodoInizioSerie, nodoFineSerie, None, strRilevanza, osservabilita=""))
+                # Creo il nuovo arco che sostituisce la serie rimossa
+                g.addArco(nodoInizioSerie, nodoFineSerie, strRilevanza)
             # Fine analisi serie
 
             else:
                 # Non c'è la serie. Esistono archi paralleli fra due nodi?
-                parallelo = scN.trovaParalleloArchi()
+                parallelo = g.trovaParalleloArchi()
                 if parallelo:
                     # Sostituzione del parallelo di archi con un solo arco
-                    # Resettiamo isPotato per tutti gli archi e tutti i nodi di scN
-                    scN.setAllIsPotato(False)
-
-                    # Definisco la stringa di rilevanza e marchio isPotato sugli archi del parallelo
-                    strRilevanza = SpazioComportamentale.componiStrRilevanzaParallelo(parallelo)
-                    t: Arco
-                    for t in parallelo:
-                        t.isPotato = True
+                    # Definisco la stringa di rilevanza
+                    strRilevanza = SpazioComportamentale.componiStrRilevanzaParallelo(
+                        [g.rilevanza[a] for a in parallelo])
 
                     # DEBUG
-                    # Stampo il grafo prima della potatura
-                    scN.debugPrintDotGraph(debug_on, debug_path)
+                    # Stampo il grafo prima della rimozione
+                    g.debugPrintDotGraph(debug_on, debug_path, archiEvidenziati=parallelo)
                     # /DEBUG
 
-                    # Creiamo l'arco che sostituisce il parallelo e lo introduciamo in scN
-                    a = Arco(parallelo[0].nodo0, parallelo[0].nodo1, None, strRilevanza, osservabilita="")
-                    a.isPotato = False
-                    scN.addArco(a)
-
-                    # Potiamo solo gli archi segnati come isPotato (i nodi restano inalterati)
-                    # NOTA: questa è una scelta di efficienza, perché non ci sono nodi da potare
-                    scN.potaturaArchi()
+                    # Creiamo l'arco che sostituisce il parallelo e rimuoviamo gli archi del parallelo
+                    # (i nodi restano inalterati)
+                    g.addArco(g.nodo0[parallelo[0]], g.nodo1[parallelo[0]], strRilevanza)
+                    for a in parallelo:
+                        g.rimuoviArco(a)
                 # Fine analisi parallelo
 
                 else:
                     # Non c'è neanche il parallelo.
                     # Esiste un nodo intermedio con tanti archi in/out e dei cappi?
 
-                    # Resettiamo isPotato per tutti gli archi e tutti i nodi di scN
-                    scN.setAllIsPotato(False)
-
-                    # Definisco la stringa di rilevanza
-                    strRilevanza = ""
-
                     # Peschiamo un nodo intermedio, né iniziale né finale
                     nodoIntermedio = None
-                    for nodo in scN.nodi:
-                        if nodo is not n0 and nodo is not nq:
-                            nodoIntermedio = nodo
+                    for n in g.nodi:
+                        if n != n0 and n != nq:
+                            nodoIntermedio = n
                             break
 
                     # Se tale nodo  intermedio esiste, studiamo i suoi cappi
                     if nodoIntermedio is not None:
-                        # Esiste un cappio su nodoIntermedio? Lo rintraccio
-                        cappio = None
-                        k: Arco
-                        for k in nodoIntermedio.archiUscenti:
-                            if k.nodo1 is nodoIntermedio:
-                                cappio = k
+                        # Esiste un cappio su nodoIntermedio? Ne recupero la rilevanza
+                        strCappio = None
+                        for k in g.uscenti[nodoIntermedio]:
+                            if g.nodo1[k] == nodoIntermedio:
+                                strCappio = g.rilevanza[k]
                                 break
 
-                        # Marchiamo il nodoIntermedio come da potare
-                        nodoIntermedio.isPotato = True
-
                         # DEBUG
-                        # Stampo il grafo prima della potatura
-                        scN.debugPrintDotGraph(debug_on, debug_path)
+                        # Stampo il grafo prima della rimozione
+                        g.debugPrintDotGraph(debug_on, debug_path, [nodoIntermedio])
                         # /DEBUG
 
-                        # Ora posso rimuovere nodoIntermedio e tutti i suoi vecchi archi entranti e uscenti
                         # Ciclo sugli archi entranti a nodoIntermedio, eccetto i cappi
-                        arcoEntrante: Arco
-                        for arcoEntrante in scN.archi:
-                            if arcoEntrante.nodo1 is nodoIntermedio and arcoEntrante.nodo0 is not nodoIntermedio:
+                        for arcoEntrante in g.entranti[nodoIntermedio]:
+                            if g.nodo0[arcoEntrante] != nodoIntermedio:
                                 # Ciclo sugli archi uscenti da nodoIntermedio, eccetto i cappi
-                                arcoUscente: Arco
-                                for arcoUscente in nodoIntermedio.archiUscenti:
-                                    if arcoUscente.nodo1 is not nodoIntermedio:
+                                for arcoUscente in g.uscenti[nodoIntermedio]:
+                                    if g.nodo1[arcoUscente] != nodoIntermedio:
                                         # Costruisco la stringa di rilevanza tenendo conto dell'eventuale cappio
                                         strRilevanzaFinale = SpazioComportamentale.componiStrRilevanzaNodoIntermedio(
-                                            arcoEntrante, cappio, arcoUscente)
+                                            g.rilevanza[arcoEntrante], strCappio, g.rilevanza[arcoUscente])
                                         # Per ciascuna coppia di archi entrante/uscente su nodoIntermedio
                                         # inseriamo un nuovo arco che tenga conto della presenza o meno di
                                         # un cappio su nodoIntermedio
-                                        a = Arco(nodo0=arcoEntrante.nodo0, nodo1=arcoUscente.nodo1, transizione=None,
-                                                 rilevanza=strRilevanzaFinale, osservabilita="")
-                                        a.isPotato = False
-                                        # Introduco il nuovo arco
-                                        scN.addArco(a)
+                                        g.addArco(g.nodo0[arcoEntrante], g.nodo1[arcoUscente], strRilevanzaFinale)
                                     # Fine If coppia di archi su nodoIntermedio (non cappio)
                         # Ora posso rimuovere nodoIntermedio e tutti i suoi vecchi archi entranti e uscenti
-                        scN.potatura()
+                        g.rimuoviNodo(nodoIntermedio)
                     # Fine if nodoIntermedio is not none
                 # Fine analisi nodo intermedio/cappi
             # Fine analisi parallelo e nodo intermedio/cappi
         # Fine while costruzione espressione regolare
         # DEBUG
         # Stampo il grafo
-        scN.debugPrintDotGraph(debug_on, debug_path)
+        g.debugPrintDotGraph(debug_on, debug_path)
         # Resetto il debug counter
         SpazioComportamentale.debug_counter = 1
         # /DEBUG
 
         # L'espressione regolare è la stringa di rilevanza
-        # dell'unico arco rimasto in scN
-        return scN.archi[0].rilevanza
+        # dell'unico arco rimasto in g
+        for a in g.archi:
+            return str(g.rilevanza[a])
+        return ""
+
+    def espressioneRegolareIncrementale(self) -> str:
+        """
+        Genera la diagnosi (espressione regolare) relativa a uno SpazioComportamentale per eliminazione incrementale
+        dei nodi, in alternativa a espressioneRegolare.
+        Il lavoro avviene su un GrafoRiduzione in cui c'è al più un arco per ogni coppia di nodi (i paralleli sono
+        fusi appena si formano). Una lista di lavoro (heap) ordina i nodi intermedi secondo il prodotto
+        archi entranti × archi uscenti: le serie (1 × 1) sono eliminate per prime, e ogni eliminazione aggiorna solo
+        i nodi adiacenti a quello eliminato.
+        L'espressione ottenuta è equivalente a quella di espressioneRegolare, ma può essere scritta in forma diversa.
+        :return: l'espressione regolare di rilevanza dello Spazio Comportamentale
+        """
+        g = GrafoRiduzione.daSpazio(self)
+
+        # Definisco un nuovo nodo iniziale n0 se nel nodo iniziale sono presenti archi entranti
+        n0 = g.nodoIniziale
+        if g.entranti[n0]:
+            n0 = g.addNodo()
+            g.addArco(n0, g.nodoIniziale, Espressione.EPSILON)
+
+        # Definisco un unico nodo finale nq
+        statiAccettazione = [n for n in g.nodi if g.isFinale[n]]
+        if len(statiAccettazione) > 1 or (len(statiAccettazione) == 1 and g.uscenti[statiAccettazione[0]]):
+            nq = g.addNodo(isFinale=True)
+            for n in statiAccettazione:
+                g.isFinale[n] = False
+                g.addArco(n, nq, Espressione.EPSILON)
+        else:
+            nq = statiAccettazione[0]
 
-    def generaChiusuraSilenziosaDecorata(self, nodoIngresso: Nodo) -> None:
+        # Fusione dei paralleli: da qui in poi c'è al più un arco per ogni coppia di nodi
+        arcoTra: Dict[tuple, int]
+        arcoTra = {}
+        for a in list(g.archi):
+            coppia = (g.nodo0[a], g.nodo1[a])
+            b = arcoTra.get(coppia)
+            if b is None:
+                arcoTra[coppia] = a
+            else:
+                g.rilevanza[b] = SpazioComportamentale.alternativaRilevanza(g.rilevanza[b], g.rilevanza[a])
+                g.rimuoviArco(a)
+
+        def grado(n: int) -> int:
+            # Prodotto fra archi entranti e uscenti del nodo, escluso l'eventuale cappio
+            cappio = 1 if (n, n) in arcoTra else 0
+            return (len(g.entranti[n]) - cappio) * (len(g.uscenti[n]) - cappio)
+
+        # Lista di lavoro dei nodi intermedi da eliminare
+        daEliminare = [(grado(n), n) for n in g.nodi if n != n0 and n != nq]
+        heapq.heapify(daEliminare)
+
+        while daEliminare:
+            gradoNodo, n = heapq.heappop(daEliminare)
+            # Scartiamo le voci obsolete: nodo già eliminato o grado cambiato
+            if n not in g.nodi or gradoNodo != grado(n):
+                continue
+
+            # Etichetta dell'eventuale cappio sul nodo
+            cappio = arcoTra.get((n, n))
+            rilevanzaCappio = Espressione.EPSILON
+            if cappio is not None:
+                rilevanzaCappio = Espressione.stella(g.rilevanza[cappio])
+
+            # Per ogni coppia di archi entrante/uscente (esclusi i cappi) introduciamo un arco che salta il nodo,
+            # fondendolo con l'eventuale arco già presente fra gli stessi estremi
+            entranti = [a for a in g.entranti[n] if g.nodo0[a] != n]
+            uscenti = [a for a in g.uscenti[n] if g.nodo1[a] != n]
+            vicini = set()
+            for a in entranti:
+                p = g.nodo0[a]
+                vicini.add(p)
+                base = SpazioComportamentale.concatenaRilevanza(g.rilevanza[a], rilevanzaCappio)
+                for b in uscenti:
+                    q = g.nodo1[b]
+                    vicini.add(q)
+                    strRilevanza = SpazioComportamentale.concatenaRilevanza(base, g.rilevanza[b])
+                    c = arcoTra.get((p, q))
+                    if c is None:
+                        arcoTra[(p, q)] = g.addArco(p, q, strRilevanza)
+                    else:
+                        g.rilevanza[c] = SpazioComportamentale.alternativaRilevanza(g.rilevanza[c], strRilevanza)
+
+            # Eliminiamo il nodo con tutti i suoi archi
+            for a in list(g.entranti[n]) + list(g.uscenti[n]):
+                arcoTra.pop((g.nodo0[a], g.nodo1[a]), None)
+            g.rimuoviNodo(n)
+
+            # Aggiorniamo la lista di lavoro solo per i nodi adiacenti
+            for v in vicini:
+                if v != n0 and v != nq:
+                    heapq.heappush(daEliminare, (grado(v), v))
+
+        # L'espressione regolare è la rilevanza dell'unico arco rimasto, da n0 a nq
+        a = arcoTra.get((n0, nq))
+        return str(g.rilevanza[a]) if a is not None else ""
+
+    def generaChiusuraSilenziosaDecorata(self, nodoIngresso: Nodo, motore=None) -> None:
         """
         Genera una chiusura silenziosa decorata a partire dallo spazio comportamentale ed uno stato d'ingresso
         per la chiusura.
@@ -1387,6 +2844,22 @@ class SpazioComportamentale:
         raggiungibili a partire da nodoIngresso attraverso cammini di archi non osservabili.
         Dopo l'esecuzione, la chiusura sarà associata all'attributo chiusura di nodoIngresso
 
+        :param nodoIngresso: il nodo dello spazio comportamentale da cui partire per ricavare la chiusura silenziosa
+        :param motore: l'eventuale MotoreChiusure condiviso con cui decorare la chiusura (altrimenti la chiusura
+                       è decorata con espressioniRegolari)
+        """
+        self.generaChiusuraSilenziosa(nodoIngresso)
+
+        # Chiamata ad EspressioniRegolari su chiusura (o al motore condiviso) per decorare gli stati d'uscita
+        if motore is not None:
+            motore.decora(nodoIngresso.chiusura)
+        else:
+            nodoIngresso.chiusura.espressioniRegolari()
+
+    def generaChiusuraSilenziosa(self, nodoIngresso: Nodo) -> None:
+        """
+        Genera la chiusura silenziosa (non ancora decorata) di nodoIngresso, con i suoi nodi di uscita e di
+        accettazione, e la associa all'attributo chiusura di nodoIngresso
         :param nodoIngresso: il nodo dello spazio comportamentale da cui partire per ricavare la chiusura silenziosa
         """
         # Inizializzo la chiusura
@@ -1394,8 +2867,9 @@ class SpazioComportamentale:
         nodoIngresso.chiusura.addNodo(nodoIngresso)
         nodoIngresso.chiusura.nodoIniziale = nodoIngresso
 
-        # Inizializzo la pila di nodi da esplorare
+        # Inizializzo la pila di nodi da esplorare e l'insieme degli id dei nodi già nella chiusura
         nodiDaEsplorare = [nodoIngresso]
+        idNodiChiusura = {id(nodoIngresso)}
 
         # Scorriamo i nodi da esplorare
         while nodiDaEsplorare:
@@ -1412,7 +2886,8 @@ class SpazioComportamentale:
                     # NOTA: usiamo append(a) per non andare a rovinare le liste di adiacenza
                     nodoIngresso.chiusura.archi.append(a)
                     # Se il nodo di destinazione non è già nella chiusura lo aggiungiamo
-                    if a.nodo1 not in nodoIngresso.chiusura.nodi:
+                    if id(a.nodo1) not in idNodiChiusura:
+                        idNodiChiusura.add(id(a.nodo1))
                         nodoIngresso.chiusura.addNodo(a.nodo1)
                         nodiDaEsplorare.append(a.nodo1)
                 else:
@@ -1427,84 +2902,19 @@ class SpazioComportamentale:
                 nodoIngresso.chiusura.nodiAccettazione.append(nodoCorr)
         # Fine while sui nodi da esplorare
 
-        # Chiamata ad EspressioniRegolari su chiusura per decorare gli stati d'uscita
-        nodoIngresso.chiusura.espressioniRegolari()
-
     @staticmethod
-    def concatenaRilevanza(base: str, aggiunta: str):
-        """
-        Data una stringa base e una stringa di aggiunta, le concatena secondo la regola di concatenazione delle expreg.
-        :param base: la stringa base
-        :param aggiunta: la stringa da aggiungere
-        :return: la concatenazione delle due stringhe
-        """
-        # Estraggo le alternative descritte nelle due stringhe
-        alt_base = SpazioComportamentale.estraiAlternative(base)
-        alt_aggiunta = SpazioComportamentale.estraiAlternative(aggiunta)
-
-        # Creo una lista combinata di alternative che applichi la proprietà distributiva
-        # tenendo conto delle stringhe vuote (ε)
-        alternative = []
-        for ab in alt_base:
-            if ab == "ε":
-                ab = ""
-            for aa in alt_aggiunta:
-                if aa == "ε":
-                    aa = ""
-                res = ab + aa
-                if res == "":
-                    res = "ε"
-                alternative.append(res)
-        alternative = set(alternative)
-
-        # Ritorno la combinazione corretta di alternative
-        if len(alternative) == 1:
-            unica = alternative.pop()
-            if unica == "ε":
-                return ""
-            else:
-                return unica
-        return "|".join(alternative)
-
-    @staticmethod
-    def estraiAlternative(expreg: str) -> List[str]:
-        """
-        Data un'espressione regolare, estrae la lista di espressioni in alternativa (ed eventualmente toglie le parentesi)
-        :param expreg: un'espressione regolare
-        :return: la lista di espressioni in alternativa
-        """
-        alternative = []
-
-        # Controlla se l'alternativa è una stringa vuota
-        if expreg == "" or expreg == "ε":
-            return ["ε"]
-
-        # Contatore parentesi
-        par = 0
-        # buffer da analizzare (una alternativa)
-        buffer = ""
-        for c in expreg:
-            if c == "|" and par == 0:
-                # aggiungiamo il buffer alla lista di alternative
-                alternative.append(buffer)
-                # resettiamo il buffer
-                buffer = ""
-            elif c == "(":
-                par += 1
-                buffer += c
-            elif c == ")":
-                par -= 1
-                buffer += c
-            else:
-                buffer += c
-
-        # Aggiungo alle alternative il residuo del buffer
-        # (ipotizzo che in un'alternativa non compaia mai "" ad indicare l'alternativa vuota, piuttosto che epsilon)
-        if buffer != "":
-            alternative.append(buffer)
-
-        # Compongo la lista di alternative e la ritorno
-        return list(set(alternative))
+    @lru_cache(maxsize=65536)
+    def concatenaRilevanza(base: Espressione, aggiunta: Espressione) -> Espressione:
+        """
+        Data un'espressione base e un'espressione di aggiunta, le concatena secondo la regola di concatenazione delle
+        expreg. Le alternative non sono distribuite: restano raggruppate fra parentesi.
+        I risultati sono memorizzati per coppia di operandi (le espressioni sono interne, quindi la coppia
+        identifica l'operazione).
+        :param base: l'espressione base
+        :param aggiunta: l'espressione da aggiungere
+        :return: la concatenazione delle due espressioni
+        """
+        return Espressione.concatenazione(base, aggiunta)
 
     @staticmethod
     def rimuoviParentesi(expreg: str) -> str:
@@ -1536,126 +2946,57 @@ class SpazioComportamentale:
         return expreg
 
     @staticmethod
-    def alternativaRilevanza(base: str, aggiunta: str) -> str:
+    @lru_cache(maxsize=65536)
+    def alternativaRilevanza(base: Espressione, aggiunta: Espressione) -> Espressione:
         """
-        Data una stringa base e una stringa di aggiunta, compone l'alternativa delle due stringhe
-        :param base: la stringa base
-        :param aggiunta: la stringa di aggiunta
-        :return: la coppia (base, hasEps) aggiornate, con base come alternativa di base e aggiunta
+        Data un'espressione base e un'espressione di aggiunta, compone l'alternativa delle due espressioni
+        in forma canonica (vedi Espressione.alternativa). I risultati sono memorizzati per coppia di operandi
+        :param base: l'espressione base
+        :param aggiunta: l'espressione di aggiunta
+        :return: l'alternativa di base e aggiunta
         """
-
-        # IDEA:
-        # 1 trasformare base e aggiunta in liste di alternative
-        # 2 inserire in una lista tutte le alternative, ma senza duplicati (tipo set union)
-        # 3 compilare la lista in una stringa di alternativa classica
-
-        alt_base = SpazioComportamentale.estraiAlternative(base)
-        alt_aggiunta = SpazioComportamentale.estraiAlternative(aggiunta)
-        alternative = set(alt_base).union(set(alt_aggiunta))
-
-        # Ritorno la combinazione corretta di alternative
-        if len(alternative) == 1:
-            unica = alternative.pop()
-            if unica == "ε":
-                return ""
-            else:
-                return unica
-
-        return "|".join(alternative)
+        return Espressione.alternativa(base, aggiunta)
 
     @staticmethod
-    def componiStrRilevanzaSerie(serie: List[Arco]) -> str:
+    def componiStrRilevanzaSerie(serie: List[Espressione]) -> Espressione:
         """
-        A partire dalla serie in ingresso (una lista di Arco) considerata
-        genera la stringa di rilevanza corrispondente
-        :param serie: la lista di archi in serie da cui ricavare la stringa di rilevanza
-        :return: la stringa di rilevanza della serie
+        A partire dalle etichette di rilevanza della serie in ingresso
+        genera l'espressione di rilevanza corrispondente
+        :param serie: la lista delle etichette di rilevanza degli archi in serie
+        :return: l'espressione di rilevanza della serie
         """
-        strRilevanza = ""
-        for t in serie:
-            strRilevanza = SpazioComportamentale.concatenaRilevanza(strRilevanza, t.rilevanza)
-        return strRilevanza
+        rilevanzaSerie = Espressione.EPSILON
+        for rilevanza in serie:
+            rilevanzaSerie = SpazioComportamentale.concatenaRilevanza(rilevanzaSerie, rilevanza)
+        return rilevanzaSerie
 
     @staticmethod
-    def componiStrRilevanzaParallelo(parallelo: List[Arco]) -> str:
+    def componiStrRilevanzaParallelo(parallelo: List[Espressione]) -> Espressione:
         """
-        A partire dal parallelo in ingresso (una lista di Arco) considerato
-        genera la stringa di rilevanza corrispondente
-        :param parallelo: la lista di archi in parallelo da cui ricavare la stringa di rilevanza
-        :return: la stringa di rilevanza del parallelo
+        A partire dalle etichette di rilevanza del parallelo in ingresso
+        genera l'espressione di rilevanza corrispondente
+        :param parallelo: la lista delle etichette di rilevanza degli archi in parallelo
+        :return: l'espressione di rilevanza del parallelo
         """
-        if len(parallelo) == 1:
-            return parallelo[0].rilevanza
-        else:
-            # Genero l'insieme di alternative presenti in tutti i rami del parallelo
-            alternative = []
-            for p in parallelo:
-                alternative += SpazioComportamentale.estraiAlternative(p.rilevanza)
-            alternative = set(alternative)
-
-            # Ritorno la combinazione corretta di alternative
-            if len(alternative) == 1:
-                unica = alternative.pop()
-                if unica == "ε":
-                    return ""
-                else:
-                    return unica
-            return "|".join(alternative)
+        return Espressione.alternativa(*parallelo)
 
     @staticmethod
-    def componiStrRilevanzaNodoIntermedio(entrante: Arco, cappio: Arco, uscente: Arco) -> str:
-        """
-        A partire da tre archi su un nodo (uno entrante, un cappio, uno uscente)
-        genera la stringa di rilevanza corrispondente
-        :param entrante: l'arco entrante al nodo intermedio
-        :param cappio: l'eventuale cappio sul nodo intermedio
-        :param uscente: l'arco uscente dal nodo intermedio
-        :return: la stringa di rilevanza sostitutiva del nodo intermedio
-        """
-        # Estraggo le alternative dell'arco entrante
-        if entrante is not None:
-            alt_entrante = SpazioComportamentale.estraiAlternative(entrante.rilevanza)
-        else:
-            alt_entrante = []
+    def componiStrRilevanzaNodoIntermedio(entrante: Espressione, cappio: Espressione,
+                                          uscente: Espressione) -> Espressione:
+        """
+        A partire dalle etichette di rilevanza di tre archi su un nodo (uno entrante, un cappio, uno uscente)
+        genera l'espressione di rilevanza corrispondente
+        :param entrante: la rilevanza dell'arco entrante al nodo intermedio
+        :param cappio: la rilevanza dell'eventuale cappio sul nodo intermedio (None se non c'è)
+        :param uscente: la rilevanza dell'arco uscente dal nodo intermedio
+        :return: l'espressione di rilevanza sostitutiva del nodo intermedio
+        """
+        # Se il cappio non è nullo, genero la sua stella (ε altrimenti)
+        ril_cappio = Espressione.stella(cappio) if cappio is not None else Espressione.EPSILON
 
-        # Se il cappio non è nullo, genero la sua etichetta
-        if cappio and cappio.rilevanza != "" and cappio.rilevanza != "ε":
-            ril_cappio = f"({cappio.rilevanza})*"
-        else:
-            ril_cappio = ""
+        return Espressione.concatenazione(entrante, ril_cappio, uscente)
 
-        # Estraggo le alternative dell'arco uscente
-        if uscente is not None:
-            alt_uscente = SpazioComportamentale.estraiAlternative(uscente.rilevanza)
-        else:
-            alt_uscente = []
-
-        # Distribuisco le alternative dell'arco entrante (concatenate col cappio)
-        # lungo quelle dell'arco uscente tenendo conto delle stringhe vuote (ε)
-        alternative = []
-        for ae in alt_entrante:
-            if ae == "ε":
-                ae = ""
-            for au in alt_uscente:
-                if au == "ε":
-                    au = ""
-                res = ae + ril_cappio + au
-                if res == "":
-                    res = "ε"
-                alternative.append(res)
-        # Creo un set a partire dalle alternative per rimuovere i duplicati
-        alternative = set(alternative)
-
-        # Ritorno la combinazione corretta di alternative
-        if len(alternative) == 1:
-            unica = alternative.pop()
-            if unica == "ε":
-                return ""
-            else:
-                return unica
-        return "|".join(alternative)
-
-    def generaDiagnosticatore(self):
+    def generaDiagnosticatore(self, chiusureCondivise=False, processi=1):
         """
         A partire da uno spazio comportamentale genera un Diagnosticatore
         Precondizione: lo Spazio Comportamentale sul quale il metodo viene chiamato è popolato
@@ -1665,6 +3006,11 @@ class SpazioComportamentale:
               osservabilità e come rilevanza la concatenazione della sua rilevanza e la decorazione del nodo di uscita
               della chiusura.
 
+        :param chiusureCondivise: True per decorare le chiusure con un MotoreChiusure condiviso fra tutti i nodi
+                                  di ingresso (vedi MotoreChiusure), anziché riducendo ciascuna chiusura
+        :param processi: il numero di processi con cui ridurre le chiusure in parallelo (vedi
+                         Chiusura.espressioniRegolariParallele); 1 per ridurle in sequenza, None per usare tutti i
+                         core disponibili. È ignorato se chiusureCondivise è True
         :return: il Diagnosticatore corrispondente a questo spazio comportamentale
         """
         # Costruiamo il diagnosticatore d
@@ -1675,10 +3021,11 @@ class SpazioComportamentale:
         # - o il nodo iniziale di sc
         # - o un nodo di sc avente almeno una transizione osservabile entrante
 
-        # Inizializzo la lista di nodi di ingresso
+        # Inizializzo la lista di nodi di ingresso, con l'insieme dei loro id per la verifica di appartenenza
         nodiIngresso: List[Nodo]
         nodiIngresso = [self.nodoIniziale]
-        # Cerco tutti i nodi di sc con almeno un arco osservabile entrante O(V*V*E) = O(V**4)
+        idNodiIngresso = {id(self.nodoIniziale)}
+        # Cerco tutti i nodi di sc con almeno un arco osservabile entrante, in un'unica passata O(V+E)
         # Scorro tutti i nodi
         for n in self.nodi:
             # Guardo i suoi archi adiacenti
@@ -1688,16 +3035,32 @@ class SpazioComportamentale:
                     continue
                 # Altrimenti, se il nodo di destinazione dell'arco osservabile non è in nodiIngresso
                 # Aggiungo il nodo di destinazione a nodiIngresso
-                if a.nodo1 not in nodiIngresso:
+                if id(a.nodo1) not in idNodiIngresso:
+                    idNodiIngresso.add(id(a.nodo1))
                     nodiIngresso.append(a.nodo1)
             # fine ciclo sugli archi uscenti di n
         # fine ciclo sui nodi di sc
 
-        # Per ogni nodo di ingresso genera la chiusura e il nodo corrispondente
+        # Dizionario che associa all'id di ciascun nodo di ingresso di sc il nodo corrispondente di d
+        nodoDiagnosticatore: Dict[int, Nodo]
+        nodoDiagnosticatore = {}
+
+        # Motore condiviso per la decorazione delle chiusure, se richiesto
+        motore = MotoreChiusure.daSpazio(self) if chiusureCondivise else None
+
+        # Se richiesto, generiamo prima tutte le chiusure e le decoriamo in parallelo
+        parallelo = motore is None and processi != 1
+        if parallelo:
+            for ni in nodiIngresso:
+                self.generaChiusuraSilenziosa(ni)
+            Chiusura.espressioniRegolariParallele([ni.chiusura for ni in nodiIngresso], processi)
+
+        # Per ogni nodo di ingresso genera la chiusura (se non già fatto) e il nodo corrispondente
         # dello d (spazio chiusure)
         ni: Nodo
         for ni in nodiIngresso:
-            self.generaChiusuraSilenziosaDecorata(ni)
+            if not parallelo:
+                self.generaChiusuraSilenziosaDecorata(ni, motore)
             # Genero un nuovo nodo xn in d corrispondente alla chiusura
             xn = Nodo()
             xn.nome = 'x' + ni.nome
@@ -1717,6 +3080,7 @@ class SpazioComportamentale:
 
             # Aggiungiamo il nuovo nodo xn a d
             d.addNodo(xn)
+            nodoDiagnosticatore[id(ni)] = xn
 
         # Genera gli archi tra i nodi di d
         # Per ogni nodo x dello spazio delle chiusure
@@ -1729,18 +3093,17 @@ class SpazioComportamentale:
                 a1: Arco
                 for a1 in nu.archiUscenti:
                     if a1.osservabilita != "":
-                        # cerchiamo nello spazio delle chiusure,
-                        # il nodo y la cui chiusura ha nodo iniziale nodo1 di a1
-                        y: Nodo
-                        for y in d.nodi:
-                            if a1.nodo1 is y.chiusura.nodoIniziale:
-                                # creiamo l'arco a2 dal nodo x corrente
-                                # al nodo y dello spazio delle chiusure
-                                a2 = Arco(nodo0=x, nodo1=y, transizione=a1.transizione,
-                                          rilevanza=a1.rilevanza + x.chiusura.decorazioni.get(id(nu), ""),
-                                          osservabilita=a1.osservabilita)
-                                a2.isPotato = False
-                                d.addArco(a2)
+                        # il nodo y dello spazio delle chiusure la cui chiusura ha nodo iniziale nodo1 di a1
+                        y = nodoDiagnosticatore[id(a1.nodo1)]
+                        # creiamo l'arco a2 dal nodo x corrente
+                        # al nodo y dello spazio delle chiusure
+                        a2 = Arco(nodo0=x, nodo1=y, transizione=a1.transizione,
+                                  rilevanza=SpazioComportamentale.concatenaRilevanza(
+                                      Espressione.simbolo(a1.rilevanza),
+                                      x.chiusura.decorazioni.get(id(nu), Espressione.EPSILON)),
+                                  osservabilita=a1.osservabilita)
+                        a2.isPotato = False
+                        d.addArco(a2)
 
         # Ritorna lo spazio delle chiusure generato, che ormai è un diagnosticatore
         return d
@@ -1765,7 +3128,8 @@ class SpazioComportamentale:
             for a in n.archiUscenti:
                 transizione = "<br/>" + a.transizione.nome if a.transizione else ''
                 osservabilita = f"<br/><font color=\"green4\">{a.osservabilita}</font>" if a.osservabilita != "" else ""
-                rilevanza = f"<br/><font color=\"red\">{a.rilevanza}</font>" if a.rilevanza != "" else ""
+                rilevanza = str(a.rilevanza)
+                rilevanza = f"<br/><font color=\"red\">{rilevanza}</font>" if rilevanza != "" else ""
                 potato = " color=red" if a.isPotato else ""
                 # Compilo gli archi
                 archi += f"\n\tn{n.nome}\t->\tn{a.nodo1.nome} [label=<{transizione}{osservabilita}{rilevanza}>{potato}]"
@@ -1781,14 +3145,675 @@ class SpazioComportamentale:
 """
         return out
 
-    def logStats(self):
+    def logStats(self):
+        """
+        Genera delle statistiche su questo Spazio Comportamentale e le salva nel Log
+        """
+        Log.new("Statistiche sullo Spazio Comportamentale", "")
+        Log.new("\tNumero stati", f"{len(self.nodi)}")
+        Log.new("\tNumero stati finali", f"{len([n for n in self.nodi if n.isFinale])}")
+        Log.new("\tNumero transizioni", f"{len(self.archi)}")
+
+
+class BDD:
+    """
+    Classe che gestisce diagrammi di decisione binaria ridotti e ordinati (ROBDD) sulle variabili
+    0, ..., numVariabili-1, ordinate secondo il loro indice.
+    Un diagramma è rappresentato da un intero: FALSO (0), VERO (1) oppure l'indice di un nodo interno
+    (variabile, basso, alto). I nodi sono condivisi tramite la tabella dei nodi unici, per cui due funzioni booleane
+    equivalenti sono rappresentate dallo stesso intero e il confronto fra insiemi è un confronto fra interi.
+    """
+
+    FALSO = 0
+    VERO = 1
+
+    def __init__(self, numVariabili: int):
+        self.numVariabili = numVariabili
+
+        # nodi[u] = (variabile, basso, alto); i terminali hanno come variabile numVariabili
+        self.nodi: List[tuple]
+        self.nodi = [(numVariabili, 0, 0), (numVariabili, 1, 1)]
+        self.unici: Dict[tuple, int]
+        self.unici = {}
+
+        # Cache delle operazioni
+        self.cacheE = {}
+        self.cacheO = {}
+        self.cacheNon = {}
+
+    def nodo(self, v: int, basso: int, alto: int) -> int:
+        """
+        :param v: la variabile del nodo
+        :param basso: il diagramma per v falsa
+        :param alto: il diagramma per v vera
+        :return: il diagramma ridotto (v ? alto : basso), condiviso se già presente
+        """
+        if basso == alto:
+            return basso
+        chiave = (v, basso, alto)
+        u = self.unici.get(chiave)
+        if u is None:
+            u = len(self.nodi)
+            self.nodi.append(chiave)
+            self.unici[chiave] = u
+        return u
+
+    def cubo(self, assegnamento: Dict[int, bool]) -> int:
+        """
+        :param assegnamento: i valori di alcune variabili
+        :return: il diagramma vero solo per gli assegnamenti che estendono quello dato
+        """
+        u = BDD.VERO
+        for v in sorted(assegnamento, reverse=True):
+            u = self.nodo(v, BDD.FALSO, u) if assegnamento[v] else self.nodo(v, u, BDD.FALSO)
+        return u
+
+    def non(self, u: int) -> int:
+        """
+        :param u: un diagramma
+        :return: la negazione del diagramma
+        """
+        if u < 2:
+            return 1 - u
+        r = self.cacheNon.get(u)
+        if r is None:
+            v, basso, alto = self.nodi[u]
+            r = self.nodo(v, self.non(basso), self.non(alto))
+            self.cacheNon[u] = r
+        return r
+
+    def e(self, u: int, w: int) -> int:
+        """
+        :return: la congiunzione dei diagrammi u e w
+        """
+        if u == BDD.FALSO or w == BDD.FALSO:
+            return BDD.FALSO
+        if u == BDD.VERO or u == w:
+            return w
+        if w == BDD.VERO:
+            return u
+        if u > w:
+            u, w = w, u
+        r = self.cacheE.get((u, w))
+        if r is None:
+            vu, bu, au = self.nodi[u]
+            vw, bw, aw = self.nodi[w]
+            if vu == vw:
+                r = self.nodo(vu, self.e(bu, bw), self.e(au, aw))
+            elif vu < vw:
+                r = self.nodo(vu, self.e(bu, w), self.e(au, w))
+            else:
+                r = self.nodo(vw, self.e(u, bw), self.e(u, aw))
+            self.cacheE[(u, w)] = r
+        return r
+
+    def o(self, u: int, w: int) -> int:
+        """
+        :return: la disgiunzione dei diagrammi u e w
+        """
+        if u == BDD.VERO or w == BDD.VERO:
+            return BDD.VERO
+        if u == BDD.FALSO or u == w:
+            return w
+        if w == BDD.FALSO:
+            return u
+        if u > w:
+            u, w = w, u
+        r = self.cacheO.get((u, w))
+        if r is None:
+            vu, bu, au = self.nodi[u]
+            vw, bw, aw = self.nodi[w]
+            if vu == vw:
+                r = self.nodo(vu, self.o(bu, bw), self.o(au, aw))
+            elif vu < vw:
+                r = self.nodo(vu, self.o(bu, w), self.o(au, w))
+            else:
+                r = self.nodo(vw, self.o(u, bw), self.o(u, aw))
+            self.cacheO[(u, w)] = r
+        return r
+
+    def differenza(self, u: int, w: int) -> int:
+        """
+        :return: il diagramma di u e non w
+        """
+        return self.e(u, self.non(w))
+
+    def esiste(self, u: int, variabili: frozenset) -> int:
+        """
+        :param u: un diagramma
+        :param variabili: le variabili da quantificare
+        :return: la quantificazione esistenziale di u rispetto alle variabili date
+        """
+        cache = {}
+
+        def quantifica(u):
+            if u < 2:
+                return u
+            r = cache.get(u)
+            if r is None:
+                v, basso, alto = self.nodi[u]
+                if v in variabili:
+                    r = self.o(quantifica(basso), quantifica(alto))
+                else:
+                    r = self.nodo(v, quantifica(basso), quantifica(alto))
+                cache[u] = r
+            return r
+
+        return quantifica(u)
+
+    def restrizione(self, u: int, assegnamento: Dict[int, bool]) -> int:
+        """
+        :param u: un diagramma
+        :param assegnamento: i valori da sostituire ad alcune variabili
+        :return: il cofattore di u rispetto all'assegnamento dato
+        """
+        cache = {}
+
+        def restringi(u):
+            if u < 2:
+                return u
+            r = cache.get(u)
+            if r is None:
+                v, basso, alto = self.nodi[u]
+                if v in assegnamento:
+                    r = restringi(alto if assegnamento[v] else basso)
+                else:
+                    r = self.nodo(v, restringi(basso), restringi(alto))
+                cache[u] = r
+            return r
+
+        return restringi(u)
+
+    def conta(self, u: int) -> int:
+        """
+        :param u: un diagramma
+        :return: il numero di assegnamenti di tutte le variabili che soddisfano il diagramma
+        """
+        cache = {}
+
+        def contaDa(u):
+            # Numero di assegnamenti delle variabili da quella di u in poi
+            if u < 2:
+                return u
+            r = cache.get(u)
+            if r is None:
+                v, basso, alto = self.nodi[u]
+                r = contaDa(basso) * 2 ** (self.nodi[basso][0] - v - 1) \
+                    + contaDa(alto) * 2 ** (self.nodi[alto][0] - v - 1)
+                cache[u] = r
+            return r
+
+        return contaDa(u) * 2 ** self.nodi[u][0]
+
+    def assegnamenti(self, u: int):
+        """
+        Enumera gli assegnamenti di tutte le variabili che soddisfano il diagramma, in ordine lessicografico
+        :param u: un diagramma
+        :return: un generatore di tuple di booleani, una per assegnamento
+        """
+        valori = [False] * self.numVariabili
+
+        def enumera(u, livello):
+            if u == BDD.FALSO:
+                return
+            if livello == self.numVariabili:
+                yield tuple(valori)
+                return
+            v, basso, alto = self.nodi[u]
+            if livello < v:
+                # La variabile non compare nel diagramma: entrambi i valori vanno bene
+                basso = alto = u
+            valori[livello] = False
+            yield from enumera(basso, livello + 1)
+            valori[livello] = True
+            yield from enumera(alto, livello + 1)
+
+        yield from enumera(u, 0)
+
+
+class SpazioSimbolico:
+    """
+    Classe che descrive lo Spazio Comportamentale di una ReteFA in forma simbolica.
+    Ciascuna posizione del codice compatto degli stati (vedi CodificaCompatta) è codificata in binario su un gruppo
+    di variabili booleane, per cui un insieme di nodi è un BDD. La relazione di transizione è partizionata per
+    transizione compilata: una transizione abilitata dalle condizioni c riscrive le posizioni W con i valori w, per
+    cui l'immagine di un insieme S è (esiste W. S e c) e (W = w), e la sua preimmagine è c e S[W := w].
+    I nodi raggiungibili sono calcolati con un punto fisso in avanti a partire dal nodo iniziale, la potatura con un
+    punto fisso all'indietro a partire dai nodi finali (link vuoti). Lo spazio può poi essere esportato nella forma
+    esplicita di SpazioComportamentale.
+    """
+
+    def __init__(self, rete: ReteFA):
+        self.rete = rete
+        self.codifica = rete.compila()
+        n = self.codifica.numComportamenti
+
+        # Variabili booleane di ciascuna posizione del codice, dal bit più significativo
+        domini = [len(comp.stati) for comp in rete.comportamenti] + [len(self.codifica.eventi)] * len(rete.links)
+        self.variabili: List[List[int]]
+        self.variabili = []
+        numVariabili = 0
+        for dominio in domini:
+            bit = max(1, (dominio - 1).bit_length())
+            self.variabili.append(list(range(numVariabili, numVariabili + bit)))
+            numVariabili += bit
+        self.bdd = BDD(numVariabili)
+
+        # Relazione di transizione partizionata:
+        # (condizioni, variabili riscritte, cubo delle riscritture, assegnamento delle riscritture)
+        self.transizioni: List[tuple]
+        self.transizioni = []
+        for i in range(n):
+            for s0, records in enumerate(self.codifica.transizioniUscenti[i]):
+                for record in records:
+                    if record[7] is None:
+                        continue
+                    condizioni = self.cuboValori(((i, s0),) + record[7])
+                    scritture = dict(record[8])  # a parità di posizione vale l'ultima riscrittura
+                    assegnamento = self.assegnamento(scritture.items())
+                    self.transizioni.append((condizioni, frozenset(assegnamento), self.bdd.cubo(assegnamento),
+                                             assegnamento))
+
+        self.iniziale = self.cuboValori(enumerate(self.codifica.codiceIniziale()))
+        self.finali = self.cuboValori((p, 0) for p in range(n, len(domini)))
+        self.raggiungibili = None
+        self.potati = None
+
+    def assegnamento(self, coppie) -> Dict[int, bool]:
+        """
+        :param coppie: le coppie (posizione, valore) di alcune posizioni del codice
+        :return: l'assegnamento delle variabili booleane corrispondente
+        """
+        assegnamento = {}
+        for p, valore in coppie:
+            variabili = self.variabili[p]
+            for j, v in enumerate(variabili):
+                assegnamento[v] = bool(valore >> (len(variabili) - 1 - j) & 1)
+        return assegnamento
+
+    def cuboValori(self, coppie) -> int:
+        """
+        :param coppie: le coppie (posizione, valore) di alcune posizioni del codice
+        :return: il BDD dei codici che hanno quei valori in quelle posizioni
+        """
+        return self.bdd.cubo(self.assegnamento(coppie))
+
+    def immagine(self, insieme: int) -> int:
+        """
+        :param insieme: il BDD di un insieme di nodi
+        :return: il BDD dei successori dei nodi dell'insieme
+        """
+        bdd = self.bdd
+        risultato = BDD.FALSO
+        for condizioni, riscritte, scritture, _ in self.transizioni:
+            abilitati = bdd.e(insieme, condizioni)
+            if abilitati != BDD.FALSO:
+                risultato = bdd.o(risultato, bdd.e(bdd.esiste(abilitati, riscritte), scritture))
+        return risultato
+
+    def preimmagine(self, insieme: int) -> int:
+        """
+        :param insieme: il BDD di un insieme di nodi
+        :return: il BDD dei predecessori dei nodi dell'insieme
+        """
+        bdd = self.bdd
+        risultato = BDD.FALSO
+        for condizioni, _, _, assegnamento in self.transizioni:
+            cofattore = bdd.restrizione(insieme, assegnamento)
+            risultato = bdd.o(risultato, bdd.e(cofattore, condizioni))
+        return risultato
+
+    def calcolaRaggiungibili(self) -> int:
+        """
+        Calcola l'insieme dei nodi raggiungibili dal nodo iniziale, come punto fisso dell'immagine
+        :return: il BDD dei nodi raggiungibili
+        """
+        raggiungibili = frontiera = self.iniziale
+        while frontiera != BDD.FALSO:
+            frontiera = self.bdd.differenza(self.immagine(frontiera), raggiungibili)
+            raggiungibili = self.bdd.o(raggiungibili, frontiera)
+        self.raggiungibili = raggiungibili
+        return raggiungibili
+
+    def pota(self) -> int:
+        """
+        Calcola l'insieme dei nodi raggiungibili dai quali è raggiungibile un nodo finale, come punto fisso della
+        preimmagine all'interno dei nodi raggiungibili
+        :return: il BDD dei nodi che sopravvivono alla potatura
+        """
+        if self.raggiungibili is None:
+            self.calcolaRaggiungibili()
+        bdd = self.bdd
+        potati = frontiera = bdd.e(self.raggiungibili, self.finali)
+        while frontiera != BDD.FALSO:
+            frontiera = bdd.differenza(bdd.e(self.preimmagine(frontiera), self.raggiungibili), potati)
+            potati = bdd.o(potati, frontiera)
+        self.potati = potati
+        return potati
+
+    def numeroNodi(self, insieme: int) -> int:
+        """
+        :param insieme: il BDD di un insieme di nodi
+        :return: il numero di nodi dell'insieme
+        """
+        return self.bdd.conta(insieme)
+
+    def codici(self, insieme: int):
+        """
+        :param insieme: il BDD di un insieme di nodi
+        :return: un generatore dei codici dei nodi dell'insieme, in ordine lessicografico
+        """
+        for valori in self.bdd.assegnamenti(insieme):
+            codice = []
+            for variabili in self.variabili:
+                valore = 0
+                for v in variabili:
+                    valore = valore << 1 | valori[v]
+                codice.append(valore)
+            yield tuple(codice)
+
+    def esporta(self, potato=True) -> SpazioComportamentale:
+        """
+        Esporta lo spazio nella forma esplicita di SpazioComportamentale. I nodi e gli archi sono gli stessi di
+        creaSpazioComportamentale (dopo la potatura se potato è True), in un ordine diverso.
+        :param potato: True per esportare solo i nodi che sopravvivono alla potatura
+        :return: lo Spazio Comportamentale esplicito
+        """
+        if potato:
+            insieme = self.potati if self.potati is not None else self.pota()
+        else:
+            insieme = self.raggiungibili if self.raggiungibili is not None else self.calcolaRaggiungibili()
+        codifica = self.codifica
+
+        sc = SpazioComportamentale()
+        nodi = {}
+        for codice in self.codici(insieme):
+            nodo = codifica.decodifica(codice)
+            nodi[codice] = nodo
+            sc.addNodo(nodo)
+        sc.nodoIniziale = nodi.get(codifica.codiceIniziale())
+
+        for codice, nodo in nodi.items():
+            for i in range(codifica.numComportamenti):
+                for record in codifica.transizioniUscenti[i][codice[i]]:
+                    succ = codifica.successore(codice, record)
+                    if succ in nodi:
+                        trans = record[6]
+                        sc.addArco(Arco(nodo, nodi[succ], trans, trans.rilevanza, trans.osservabilita))
+        return sc
+
+    def logStats(self):
+        """
+        Genera delle statistiche su questo Spazio Simbolico e le salva nel Log
+        """
+        Log.new("Statistiche sullo Spazio Simbolico", "")
+        Log.new("\tNumero variabili booleane", f"{self.bdd.numVariabili}")
+        Log.new("\tNumero nodi BDD", f"{len(self.bdd.nodi)}")
+        if self.raggiungibili is not None:
+            Log.new("\tNumero stati raggiungibili", f"{self.numeroNodi(self.raggiungibili)}")
+        if self.potati is not None:
+            Log.new("\tNumero stati dopo la potatura", f"{self.numeroNodi(self.potati)}")
+
+
+class SpazioLocale:
+    """
+    Classe che descrive lo spazio locale di un gruppo di comportamenti di una ReteFA, usato dalla costruzione
+    composizionale dello Spazio Comportamentale (vedi SpazioComportamentale.creaSpazioComportamentaleComposizionale).
+    Uno stato dello spazio locale è dato dagli stati dei comportamenti del gruppo e dal contenuto dei link interni,
+    ovvero dei link usati solo da comportamenti del gruppo. Le mosse sono etichettate con la quaterna
+        (lettura, scritture, osservabilita, rilevanza)
+    dove lettura (la coppia (k, e) oppure None) e scritture (la tupla delle coppie (k, e)) sono le operazioni della
+    transizione sui link di interfaccia, che il gruppo condivide con gli altri comportamenti e di cui non conosce
+    il contenuto.
+    Dopo la minimizzazione (vedi minimizza) uno stato rappresenta una classe di stati bisimili: le sue componenti
+    sono allora quelle del primo stato della classe.
+    """
+
+    # Spazi locali minimizzati dei singoli comportamenti, in forma indipendente dalla rete, per firma del comportamento
+    cache = {}
+
+    def __init__(self, comportamenti: tuple, linkInterni: tuple):
         """
-        Genera delle statistiche su questo Spazio Comportamentale e le salva nel Log
+        :param comportamenti: gli indici dei comportamenti del gruppo
+        :param linkInterni: gli indici dei link interni del gruppo
         """
-        Log.new("Statistiche sullo Spazio Comportamentale", "")
-        Log.new("\tNumero stati", f"{len(self.nodi)}")
-        Log.new("\tNumero stati finali", f"{len([n for n in self.nodi if n.isFinale])}")
-        Log.new("\tNumero transizioni", f"{len(self.archi)}")
+        self.comportamenti = comportamenti
+        self.linkInterni = linkInterni
+
+        # Per ciascuno stato: la coppia (stati dei comportamenti, contenuto dei link interni), se è finale
+        # (link interni vuoti) e la lista delle mosse uscenti (etichetta, stato di arrivo, transizione)
+        self.rappresentanti: List[tuple]
+        self.rappresentanti = []
+        self.finali: List[bool]
+        self.finali = []
+        self.uscenti: List[List[tuple]]
+        self.uscenti = []
+        self.iniziale = 0
+
+    def addStato(self, rappresentante: tuple, finale: bool) -> int:
+        """
+        :param rappresentante: la coppia (stati dei comportamenti, contenuto dei link interni) dello stato
+        :param finale: True se lo stato è finale
+        :return: l'indice del nuovo stato
+        """
+        self.rappresentanti.append(rappresentante)
+        self.finali.append(finale)
+        self.uscenti.append([])
+        return len(self.rappresentanti) - 1
+
+    @staticmethod
+    def primitivo(codifica: CodificaCompatta, i: int) -> 'SpazioLocale':
+        """
+        :param codifica: la codifica compatta della rete
+        :param i: l'indice di un comportamento
+        :return: lo spazio locale del solo comportamento, senza link interni (tutte le operazioni sui link restano
+                 nelle etichette)
+        """
+        spazio = SpazioLocale((i,), ())
+        stati = codifica.transizioniUscenti[i]
+        indice = {}
+        for s in range(len(stati)):
+            indice[s] = spazio.addStato(((s,), ()), True)
+        spazio.iniziale = codifica.codiceIniziale()[i]
+        for s, records in enumerate(stati):
+            for record in records:
+                if record[7] is None:
+                    continue
+                transizione = record[6]
+                lettura = (record[3], record[4]) if record[3] >= 0 else None
+                etichetta = (lettura, record[5], transizione.osservabilita, transizione.rilevanza)
+                spazio.uscenti[indice[s]].append((etichetta, indice[record[2]], transizione))
+        return spazio
+
+    @staticmethod
+    def prodotto(parti: list, nuoviInterni: tuple) -> 'SpazioLocale':
+        """
+        Calcola lo spazio locale del gruppo dei comportamenti delle parti date, esplorandone il prodotto a partire
+        dallo stato iniziale. Ciascuna mossa del prodotto è una mossa di una delle parti: le sue operazioni sui
+        nuovi link interni sono eseguite sul contenuto di questi (con la stessa semantica di
+        Nodo.verificaFattibilitaTransizione), le altre restano nell'etichetta.
+        :param parti: gli spazi locali da comporre
+        :param nuoviInterni: gli indici dei link di interfaccia delle parti che diventano interni al prodotto
+        :return: lo spazio locale del prodotto
+        """
+        spazio = SpazioLocale(sum((p.comportamenti for p in parti), ()),
+                              sum((p.linkInterni for p in parti), ()) + nuoviInterni)
+        posizione = {k: j for j, k in enumerate(nuoviInterni)}
+
+        def aggiungi(stato):
+            rappresentante = (sum((p.rappresentanti[x][0] for p, x in zip(parti, stato[0])), ()),
+                              sum((p.rappresentanti[x][1] for p, x in zip(parti, stato[0])), ()) + stato[1])
+            finale = not any(stato[1]) and all(p.finali[x] for p, x in zip(parti, stato[0]))
+            indice[stato] = spazio.addStato(rappresentante, finale)
+            daEsplorare.append(stato)
+            return indice[stato]
+
+        indice = {}
+        daEsplorare = []
+        spazio.iniziale = aggiungi((tuple(p.iniziale for p in parti), (0,) * len(nuoviInterni)))
+        while daEsplorare:
+            stato = daEsplorare.pop()
+            x, contenuto = stato
+            for j, parte in enumerate(parti):
+                for (lettura, scritture, osservabilita, rilevanza), y, transizione in parte.uscenti[x[j]]:
+                    nuovo = list(contenuto)
+                    if lettura is not None and lettura[0] in posizione:
+                        # L'evento necessario va consumato dal link interno
+                        if nuovo[posizione[lettura[0]]] != lettura[1]:
+                            continue
+                        nuovo[posizione[lettura[0]]] = 0
+                        lettura = None
+                    interfaccia = []
+                    for k, e in scritture:
+                        if k not in posizione:
+                            interfaccia.append((k, e))
+                        elif nuovo[posizione[k]] != 0:
+                            break
+                        else:
+                            nuovo[posizione[k]] = e
+                    else:
+                        succ = (x[:j] + (y,) + x[j + 1:], tuple(nuovo))
+                        h = indice.get(succ)
+                        if h is None:
+                            h = aggiungi(succ)
+                        etichetta = (lettura, tuple(interfaccia), osservabilita, rilevanza)
+                        spazio.uscenti[indice[stato]].append((etichetta, h, transizione))
+        return spazio
+
+    def minimizza(self) -> 'SpazioLocale':
+        """
+        Minimizza lo spazio locale rispetto alla bisimulazione forte sulle etichette delle mosse (operazioni sui
+        link di interfaccia, osservabilità e rilevanza), distinguendo gli stati finali da quelli non finali.
+        Poiché la composizione con gli altri comportamenti dipende solo dalle etichette, lo Spazio Comportamentale
+        ottenuto componendo gli spazi minimizzati è bisimile a quello completo, e porta quindi alle stesse diagnosi.
+        :return: lo spazio locale quoziente, in cui ogni classe è rappresentata dal suo primo stato
+        """
+        # Raffinamento delle partizioni, a partire dalla distinzione fra stati finali e non finali
+        blocchi = [int(f) for f in self.finali]
+        numeroBlocchi = len(set(blocchi))
+        while True:
+            firme = {}
+            nuovi = []
+            for x, mosse in enumerate(self.uscenti):
+                firma = (blocchi[x], frozenset((etichetta, blocchi[y]) for etichetta, y, _ in mosse))
+                nuovi.append(firme.setdefault(firma, len(firme)))
+            blocchi = nuovi
+            if len(firme) == numeroBlocchi:
+                break
+            numeroBlocchi = len(firme)
+
+        # Lo stato iniziale è il primo, quindi appartiene al blocco 0 (i blocchi sono numerati per primo stato)
+        quoziente = SpazioLocale(self.comportamenti, self.linkInterni)
+        rappresentanti = {}
+        for x, b in enumerate(blocchi):
+            if b not in rappresentanti:
+                rappresentanti[b] = x
+                quoziente.addStato(self.rappresentanti[x], self.finali[x])
+        quoziente.iniziale = blocchi[self.iniziale]
+        for b, x in rappresentanti.items():
+            quoziente.uscenti[b] = [(etichetta, blocchi[y], transizione)
+                                    for etichetta, y, transizione in self.uscenti[x]]
+        return quoziente
+
+    @staticmethod
+    def firma(codifica: CodificaCompatta, i: int, linkInterni: tuple) -> tuple:
+        """
+        :param codifica: la codifica compatta della rete
+        :param i: l'indice di un comportamento
+        :param linkInterni: gli indici dei link interni al comportamento
+        :return: la firma del comportamento, che lo identifica (a meno del nome) anche in reti diverse
+        """
+        rete = codifica.rete
+        comp = rete.comportamenti[i]
+        transizioni = []
+        for t in comp.transizioni:
+            lettura = (t.eventoNecessario.link.nome, t.eventoNecessario.evento) if t.eventoNecessario else None
+            transizioni.append((t.nome, t.stato0.nome, t.stato1.nome, lettura,
+                                tuple((eo.link.nome, eo.evento) for eo in t.eventiOutput),
+                                t.osservabilita, t.rilevanza))
+        return (comp.statoIniziale.nome, tuple(s.nome for s in comp.stati), tuple(transizioni),
+                tuple(rete.links[k].nome for k in linkInterni))
+
+    def formaPortabile(self, codifica: CodificaCompatta) -> tuple:
+        """
+        :param codifica: la codifica compatta della rete
+        :return: lo spazio locale di un singolo comportamento in una forma indipendente dalla rete, con i nomi di
+                 link ed eventi al posto dei loro indici e la posizione della transizione fra quelle del
+                 comportamento al posto della Transizione
+        """
+        links = codifica.rete.links
+        eventi = codifica.eventi
+        comp = codifica.rete.comportamenti[self.comportamenti[0]]
+        posizione = {t: j for j, t in enumerate(comp.transizioni)}
+        uscenti = []
+        for mosse in self.uscenti:
+            uscenti.append(tuple(((None if lettura is None else (links[lettura[0]].nome, eventi[lettura[1]]),
+                                   tuple((links[k].nome, eventi[e]) for k, e in scritture), osservabilita, rilevanza),
+                                  y, posizione[transizione])
+                                 for (lettura, scritture, osservabilita, rilevanza), y, transizione in mosse))
+        rappresentanti = tuple((stati, tuple(eventi[e] for e in contenuto)) for stati, contenuto in self.rappresentanti)
+        return self.iniziale, rappresentanti, tuple(self.finali), tuple(uscenti)
+
+    @staticmethod
+    def daFormaPortabile(forma: tuple, codifica: CodificaCompatta, i: int, linkInterni: tuple) -> 'SpazioLocale':
+        """
+        Ricostruisce lo spazio locale di un comportamento dalla sua forma portabile (vedi formaPortabile)
+        :param forma: la forma portabile dello spazio locale
+        :param codifica: la codifica compatta della rete
+        :param i: l'indice del comportamento
+        :param linkInterni: gli indici dei link interni al comportamento
+        :return: lo spazio locale del comportamento nella rete data
+        """
+        iniziale, rappresentanti, finali, uscenti = forma
+        indiceLink = {link.nome: k for k, link in enumerate(codifica.rete.links)}
+        transizioni = codifica.rete.comportamenti[i].transizioni
+        spazio = SpazioLocale((i,), linkInterni)
+        for (stati, contenuto), finale in zip(rappresentanti, finali):
+            spazio.addStato((stati, tuple(codifica.internaEvento(e) for e in contenuto)), finale)
+        spazio.iniziale = iniziale
+        for x, mosse in enumerate(uscenti):
+            for (lettura, scritture, osservabilita, rilevanza), y, t in mosse:
+                if lettura is not None:
+                    lettura = (indiceLink[lettura[0]], codifica.internaEvento(lettura[1]))
+                scritture = tuple((indiceLink[k], codifica.internaEvento(e)) for k, e in scritture)
+                spazio.uscenti[x].append(((lettura, scritture, osservabilita, rilevanza), y, transizioni[t]))
+        return spazio
+
+    @staticmethod
+    def daComportamento(codifica: CodificaCompatta, i: int, linkInterni: tuple,
+                        cartellaCache: str = None) -> 'SpazioLocale':
+        """
+        Calcola lo spazio locale minimizzato di un comportamento. Il risultato è conservato nella cache (in
+        memoria e, se data, nella cartella cartellaCache) per firma del comportamento, in modo da essere riusato
+        anche in reti diverse che condividono lo stesso comportamento.
+        :param codifica: la codifica compatta della rete
+        :param i: l'indice del comportamento
+        :param linkInterni: gli indici dei link usati solo dal comportamento
+        :param cartellaCache: l'eventuale cartella su disco in cui conservare gli spazi locali minimizzati
+        :return: lo spazio locale minimizzato del comportamento
+        """
+        firma = SpazioLocale.firma(codifica, i, linkInterni)
+        forma = SpazioLocale.cache.get(firma)
+        percorso = None
+        if forma is None and cartellaCache is not None:
+            percorso = os.path.join(cartellaCache, f"{hashlib.sha1(repr(firma).encode()).hexdigest()}.pickle")
+            if os.path.exists(percorso):
+                with open(percorso, "rb") as file:
+                    salvato, forma = load(file)
+                if salvato != firma:
+                    forma = None
+        if forma is not None:
+            SpazioLocale.cache[firma] = forma
+            return SpazioLocale.daFormaPortabile(forma, codifica, i, linkInterni)
+
+        spazio = SpazioLocale.prodotto([SpazioLocale.primitivo(codifica, i)], linkInterni).minimizza()
+        forma = spazio.formaPortabile(codifica)
+        SpazioLocale.cache[firma] = forma
+        if percorso is not None:
+            os.makedirs(cartellaCache, exist_ok=True)
+            with open(percorso, "wb") as file:
+                dump((firma, forma), file)
+        return spazio
 
 
 class Chiusura(SpazioComportamentale):
@@ -1817,95 +3842,6 @@ class Chiusura(SpazioComportamentale):
         self.diagnosi = None
         super().__init__()
 
-    def esistonoPiuArchiStessoPedice(self, pedici: Dict[int, Nodo]) -> bool:
-        """
-        Data la chiusura in ingresso ed il dizionario dei pedici,
-        ritorna True se esistono più archi marchiati dallo stesso pedice.
-        Precondizioni:
-            - I pedici corrispondono ai nodi di accettazione
-            - Un arco non nel dizionario dei pedici ha sicuramente pedice None
-            - Un arco con pedice None non è nel dizionario
-            - Il tipo di pedici è Dict[id(Arco), Nodo], con Arco e Nodo appartenenti a chiusura,
-              mentre Nodo è un nodo di accettazione per la chiusura
-        :param pedici: il dizionario dei pedici (tipo: Dict[int,Nodo], il primo int è un id di un Arco)
-        :return: True se esistono più archi marchiati dallo stesso pedice, False altrimenti
-        """
-
-        # Gli archi hanno lo stesso pedice anche se il loro pedice è None:
-        if not pedici:
-            # Caso limite: il dizionario dei pedici è vuoto
-            if len(self.archi) > 1:
-                # Tutti gli archi hanno pedice None
-                return True
-            else:
-                # C'è un solo arco, con pedice None
-                return False
-
-        else:
-            # Ammettiamo di avere archi con pedice non None
-            # Se il dizionario dei pedici non è vuoto
-            # verifico se ci sono più archi con pedice None
-            if len(self.archi) - len(pedici) > 1:
-                return True
-            else:
-                # Se non ci sono più archi con pedice None:
-                # uso un dizionario per tenere traccia del numero
-                # di occorrenze di ciascun nodo di accettazione
-                count = {}
-                for n in self.nodiAccettazione:
-                    count[id(n)] = 0
-                pass
-
-            # Facciamo scorrere i nodi di accettazione per contare le occorrenze
-            for entry in pedici:
-                # Incremento il value del contatore relativo al pedice
-                count[id(pedici[entry])] += 1
-                if count[id(pedici[entry])] > 1:
-                    return True
-
-            # Se a fine ciclo non abbiamo mai tornato True,
-            # ci sono più archi ma ogni arco ha pedice diverso
-            return False
-
-    def trovaParalleloArchiStessoPedice(self, pedici: Dict[int, Nodo]) -> List[Arco]:
-        """
-        Controllo esistenza di un insieme [<n,r1,n'>,<n,r2,n'>,...,<n,rk,n'>] di archi
-        paralleli uscenti dallo stato n e diretti allo stato n',
-        tutti aventi lo stesso pedice o nessun pedice.
-
-        :param pedici: il dizionario dei pedici della chiusura, che associa agli indici degli archi
-                       il nodo di accettazione pedice
-        :return: l'insieme di archi paralleli con lo stesso pedice
-        """
-        parallelo = []
-        for n in self.nodi:
-            # Voglio trovare due archi con lo stesso nodo finale e lo stesso pedice
-            # Inizializzo il dizionario di nodi adiacenti ad n osservati
-            # associati al pedice dell'arco su cui li abbiamo reperiti
-            nodiOsservati = []
-            for a in n.archiUscenti:
-                # Inizializzo il pedice di a (per evitare errori di chiave)
-                pedice_a = pedici.get(id(a), None)
-
-                # Ho già osservato il nodo1 di a con questo pedice?
-                if (a.nodo1, pedice_a) in nodiOsservati:
-                    # Abbiamo trovato un nodo che si ripete fra quelli adiacenti a n con lo stesso pedice
-                    # quindi compiliamo il parallelo e ritorniamolo
-                    for b in n.archiUscenti:
-                        # Inizializzo il pedice di b (per evitare errori di chiave)
-                        pedice_b = pedici.get(id(b), None)
-
-                        # Se la destinazione e il pedice di a e b sono gli stessi, compilo il parallelo
-                        if b.nodo1 is a.nodo1 and pedice_b is pedice_a:
-                            parallelo.append(b)
-                    # Ho trovato degli archi paralleli, quindi li ritorno
-                    return parallelo
-                else:
-                    # Ho osservato un nodo nuovo fra quelli adiacenti a n
-                    nodiOsservati.append((a.nodo1, pedice_a))
-            # End for. Non ho trovato dei paralleli, ritorno la lista vuota
-            return parallelo
-
     def espressioniRegolari(self) -> None:
         """
         Calcola le decorazioni per tutti i nodi di accettazione della chiusura,
@@ -1915,94 +3851,66 @@ class Chiusura(SpazioComportamentale):
         diagnosi sarà None.
         """
 
+        # Costruiamo il grafo di lavoro g a partire dai soli archi della chiusura
+        # (gli archi osservabili uscenti dai nodiUscita non ne fanno parte).
+        # L'identificativo di ciascun nodo di g è la sua posizione in self.nodi: questo ci servirà a fine esecuzione
+        # per tradurre le decorazioni di g nelle decorazioni della chiusura originale
+        g = GrafoRiduzione.daSpazio(self)
+        posizioni = {id(nodo): i for i, nodo in enumerate(self.nodi)}
+        nodiAccettazione = [posizioni[id(nodo)] for nodo in self.nodiAccettazione]
+
+        self.applicaDecorazioni(Chiusura.riduzione(g, nodiAccettazione))
+
+    @staticmethod
+    def riduzione(g: GrafoRiduzione, nodiAccettazione: List[int]) -> Dict[int, Espressione]:
+        """
+        Riduce il grafo di lavoro di una chiusura fino a ricavare le decorazioni dei suoi nodi di accettazione
+        (è il cuore di espressioniRegolari). Il grafo g viene consumato dalla riduzione.
+        :param g: il grafo di lavoro della chiusura
+        :param nodiAccettazione: gli identificativi in g dei nodi di accettazione della chiusura
+        :return: il dizionario che associa all'identificativo in g di ciascun nodo di accettazione decorato la sua
+                 decorazione
+        """
+        insiemeAccettazione = set(nodiAccettazione)
+
         # Definiamo una struttura dizionario che gestisca i pedici della chiusura
-        # Il dizionario associa all'id di ciascun arco della chiusura (tipo int) un pedice (tipo Nodo), ovvero
-        # il riferimento al nodo d'accettazione per cui è valida l'etichetta
+        # Il dizionario associa all'identificativo di ciascun arco di g un pedice, ovvero
+        # l'identificativo del nodo d'accettazione per cui è valida l'etichetta
         # di rilevanza.
         # - I pedici corrispondono ai nodi di accettazione
         # - Un arco non nel dizionario dei pedici ha sicuramente pedice None
         # - Un arco con pedice None non è nel dizionario
-        # - Il tipo di pedici è Dict[id(Arco), Nodo]
-        #   con Arco e Nodo appartenenti a chiusura
-        pedici: Dict[int, Nodo]
+        pedici: Dict[int, int]
         pedici = {}
 
-        # Cloniamo questa Chiusura nell'automa scN
-        # Questa clonazione è una copia deep poiché le operazioni seguenti romperebbero i legami fra archi e nodi
-        # della chiusura corrente.
-        scN = copy.deepcopy(self)
-
-        # Ripulisco il clone della chiusura dagli archi osservabili uscenti,
-        # che ancora sono nelle liste di adiacenza dei nodiUscita
-        for nu in scN.nodiUscita:
-            # cerchiamo archi osservabili nelle liste di archiUscenti e li rimuoviamo
-            nu.archiUscenti = [a for a in nu.archiUscenti if a.osservabilita == ""]
-
-        # Creo un dizionario che associ i riferimenti
-        # ai nodi della chiusura in input ai nodi della chiusura clonata
-        nodiClone2Origin: Dict[int, Nodo]
-        nodiClone2Origin = {}
-        for i in range(0, len(self.nodi)):
-            # l'uso di i sui nodi paralleli mantiene correttamente la corrispondenza dei nodi fra la chiusura
-            # e il suo clone perché le liste sono ordinate
-            nodiClone2Origin[id(scN.nodi[i])] = self.nodi[i]
-        # Questo ci servirà a fine esecuzione per tradurre le decorazioni
-        # di scN nelle decorazioni della chiusura originale
-
         # Definiamo un nuovo nodo iniziale n0, un nuovo nodo finale nq
         n0 = None
         nq = None
-        # Verifichiamo se nel nodo iniziale sono presenti archi entranti
-        esisteTransizioneEntranteANodoIniziale = False
-        for arco in scN.archi:
-            if arco.nodo1 is scN.nodoIniziale:
-                esisteTransizioneEntranteANodoIniziale = True
-                break
 
         # 1:
-        # Se abbiamo trovato un arco entrante nel nodo iniziale (interno alla chiusura)
+        # Se sono presenti archi entranti nel nodo iniziale (interni alla chiusura)
         # creiamo un nuovo nodo iniziale n0 ed un arco con
-        # etichette nulle da n0 al nodo iniziale di scN
-        if esisteTransizioneEntranteANodoIniziale:
-            # Creiamo il nodo n0, nodo iniziale di scN
-            n0 = Nodo()
-            n0.nome = "n0"
-            n0.isPotato = False
-            n0.isFinale = False
-
-            # Creiamo l'arco da n0 al vecchio nodoIniziale
-            a0 = Arco(n0, scN.nodoIniziale, transizione=None, rilevanza="", osservabilita="")
-            a0.isPotato = False
-
-            # Aggiungiamo a scN il nodo n0 e l'arco a0
-            scN.addNodo(n0)
-            scN.addArco(a0)
+        # etichette nulle da n0 al nodo iniziale di g
+        if g.entranti[g.nodoIniziale]:
+            n0 = g.addNodo(nome="n0")
+            g.addArco(n0, g.nodoIniziale, Espressione.EPSILON)
         else:
             # 4:
-            n0 = scN.nodoIniziale
+            n0 = g.nodoIniziale
 
-        # 6: Inizializziamo nq, nodo finale di scN
-        nq = Nodo()
-        nq.nome = "nq"
-        nq.isPotato = False
-        nq.isFinale = True
-        # Aggiungiamo a scN il nodo nq
-        scN.addNodo(nq)
+        # 6: Inizializziamo nq, nodo finale di g
+        nq = g.addNodo(isFinale=True, nome="nq")
 
         # 7-9:
         # Creiamo un arco (eps-transizione) da ciascuno stato di
-        # accettazione di scN al nuovo nodo finale nq
-        for n in scN.nodiAccettazione:
-            aq = Arco(nodo0=n, nodo1=nq, transizione=None, rilevanza="", osservabilita="")
-            aq.isPotato = False
-
-            # Aggiungiamo a scN l'arco costruito
-            scN.addArco(aq)
+        # accettazione di g al nuovo nodo finale nq
+        for n in nodiAccettazione:
+            g.addArco(n, nq, Espressione.EPSILON)
 
         # 11: ciclo principale
-        while len(scN.nodi) > 2 or scN.esistonoPiuArchiStessoPedice(pedici):
+        while len(g.nodi) > 2 or g.esistonoPiuArchiStessoPedice(pedici, nodiAccettazione):
             # 12: Esiste una serie di archi tra due nodi?
-            serie = scN.trovaSerieArchi()
+            serie = g.trovaSerieArchi()
 
             # Verifico se la serie non ha pedici
             serie_no_pedici = True
@@ -2010,13 +3918,13 @@ class Chiusura(SpazioComportamentale):
             serie_solo_ultimo_ha_pedice = True
             if serie:
                 for a in serie[:-1]:
-                    if id(a) in pedici:
+                    if a in pedici:
                         serie_no_pedici = False
                         serie_solo_ultimo_ha_pedice = False
                         break
                 if serie_no_pedici:
                     # Controllo l'ultimo elemento
-                    if id(serie[-1]) in pedici:
+                    if serie[-1] in pedici:
                         serie_no_pedici = False
                         serie_solo_ultimo_ha_pedice = True
                     else:
@@ -2028,12 +3936,11 @@ class Chiusura(SpazioComportamentale):
                 # 13: Se l'ultimo nodo della serie non è nq
                 # e il penultimo non è di accettazione
                 # e l'ultimo arco della serie non ha pedice...
-                # fine while ciclo principale
 
                 # Tengo traccia dei nodi iniziale e finale della serie
-                nodoInizioSerie = serie[0].nodo0
-                nodoPenultimoSerie = serie[-1].nodo0
-                nodoFineSerie = serie[-1].nodo1
+                nodoInizioSerie = g.nodo0[serie[0]]
+                nodoPenultimoSerie = g.nodo0[serie[-1]]
+                nodoFineSerie = g.nodo1[serie[-1]]
 
                 # Tengo traccia del pedice con cui etichettare la stringa
                 pedice = None
@@ -2045,16 +3952,16 @@ class Chiusura(SpazioComportamentale):
                     # Sostituire la serie con l'arco
                     # <nodoInizioSerie,strRilevanza(con pedice dell'ultimo arco della serie),nodoFineSerie>
                     # Compilo la stringa di rilevanza r1...r_k
-                    strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie(serie)
+                    strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie([g.rilevanza[a] for a in serie])
 
                     # Fisso il pedice della nuova etichetta
                     # a quello dell'ultimo arco della serie
-                    pedice = pedici[id(serie[-1])]
-                elif nodoFineSerie is not nq and nodoPenultimoSerie not in scN.nodiAccettazione:
+                    pedice = pedici[serie[-1]]
+                elif nodoFineSerie != nq and nodoPenultimoSerie not in insiemeAccettazione:
                     # L'ultimo arco non ha pedice, righe 12-17
                     # Sostituire la serie con l'arco <nodoInizioSerie,strRilevanza,nodoFineSerie>
                     # Compilo la stringa di rilevanza r1...r_k
-                    strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie(serie)
+                    strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie([g.rilevanza[a] for a in serie])
                 else:
                     # la fine serie è il nodo finale,
                     # o il penultimo della serie è nodo d'accettazione
@@ -2064,7 +3971,8 @@ class Chiusura(SpazioComportamentale):
                     # con k-1 indice del penultimo arco nella serie
 
                     # 16: Consideriamo la serie meno il penultimo elemento
-                    strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie(serie[0:-1])
+                    strRilevanza = SpazioComportamentale.componiStrRilevanzaSerie(
+                        [g.rilevanza[a] for a in serie[0:-1]])
 
                     # Fisso il pedice al penultimo nodo della serie
                     # che in questo caso è sempre uno stato d'accettazione
@@ -2072,191 +3980,196 @@ class Chiusura(SpazioComportamentale):
                 # Fine definizione strRilevanza e pedice
 
                 # Sostituzione dell'arco, righe 14:, 16:, 19:
-                # Resettiamo isPotato per tutti gli archi e tutti i nodi di scN
-                scN.setAllIsPotato(False)
-
-                # Indichiamo come da potare da scN tutti gli archi presenti nella serie
+                # Rimuoviamo tutti gli archi presenti nella serie (ripulendo anche il dizionario dei pedici)
                 # e tutti i nodi nella serie eccetto il primo e l'ultimo
-                # In questo ciclo ripuliamo anche il dizionario se l'arco da potare è presente
-                # nel dizionario
-                for arco in serie:
-                    arco.isPotato = True
-                    if arco.nodo1 is not nodoFineSerie:
-                        arco.nodo1.isPotato = True
-
-                    # Eliminiamo dal dizionario dei pedici la voce corrispondente all'arco da potare
-                    if id(arco) in pedici:
-                        pedici.pop(id(arco))
-                # fine del for
-                # Elimino nodi e archi indicati come isPotato == True
-                scN.potatura()
-
-                # Creo il nuovo arco che sostituisce la serie potata
-                a = Arco(
-                    nodo0=nodoInizioSerie, nodo1=nodoFineSerie, transizione=None,
-                    rilevanza=strRilevanza, osservabilita="")
-                a.isPotato = False
-
-                # Introduco il nuovo arco (anche nelle liste di adiacenza)
-                scN.addArco(a)
+                nodiSerie = [g.nodo1[a] for a in serie if g.nodo1[a] != nodoFineSerie]
+                for a in serie:
+                    pedici.pop(a, None)
+                    g.rimuoviArco(a)
+                for n in nodiSerie:
+                    g.rimuoviNodo(n)
+
+                # Introduco il nuovo arco che sostituisce la serie rimossa
+                a = g.addArco(nodoInizioSerie, nodoFineSerie, strRilevanza)
 
                 # Fissiamo l'eventuale pedice del nuovo arco
                 if pedice is not None:
-                    pedici[id(a)] = pedice
+                    pedici[a] = pedice
             else:
                 # La serie non c'è.
                 # Analisi del parallelo. Righe 20-23:
                 # Esiste un parallelo contenente più archi con lo stesso (o nessun) pedice?
-                parallelo = scN.trovaParalleloArchiStessoPedice(pedici)
+                parallelo = g.trovaParalleloArchiStessoPedice(pedici)
 
                 if parallelo:
                     # Sostituzione del parallelo di archi con un solo arco
-                    # Resettiamo isPotato per tutti gli archi e tutti i nodi di scN
-                    scN.setAllIsPotato(False)
-
                     # Definisco la stringa di rilevanza
-                    strRilevanza = SpazioComportamentale.componiStrRilevanzaParallelo(parallelo)
-
-                    # Creiamo l'arco che sostituisce il parallelo
-                    a = Arco(nodo0=parallelo[0].nodo0, nodo1=parallelo[0].nodo1, transizione=None,
-                             rilevanza=strRilevanza, osservabilita="")
-                    a.isPotato = False
+                    strRilevanza = SpazioComportamentale.componiStrRilevanzaParallelo(
+                        [g.rilevanza[t] for t in parallelo])
 
-                    # Introduco il nuovo arco
-                    scN.addArco(a)
+                    # Introduco l'arco che sostituisce il parallelo
+                    a = g.addArco(g.nodo0[parallelo[0]], g.nodo1[parallelo[0]], strRilevanza)
                     # Fissiamo l'eventuale pedice del nuovo arco
-                    if id(parallelo[0]) in pedici:
-                        pedici[id(a)] = pedici[id(parallelo[0])]
+                    if parallelo[0] in pedici:
+                        pedici[a] = pedici[parallelo[0]]
 
-                    # Marchio isPotato sugli archi del parallelo
+                    # Rimuovo gli archi del parallelo (i nodi restano inalterati)
+                    # e le voci corrispondenti nel dizionario dei pedici
                     for t in parallelo:
-                        # Definisco quali archi paralleli potare
-                        t.isPotato = True
-                        # Eliminiamo dal dizionario dei pedici la voce
-                        # corrispondente all'arco parallelo da potare
-                        if id(t) in pedici:
-                            pedici.pop(id(t))
-
-                    # Potiamo solo gli archi segnati come isPotato (i nodi restano inalterati),
-                    # perché non ci sono nodi da potare
-                    # NOTA: questa è una scelta di efficienza, perché non ci sono nodi da potare
-                    scN.potaturaArchi()
+                        pedici.pop(t, None)
+                        g.rimuoviArco(t)
                     # Fine analisi parallelo
                 else:
                     # Il parallelo non c'è
                     # Analisi del nodo intermedio. Righe 24-48
                     # Esiste un nodo intermedio con tanti archi in/out e dei cappi?
-                    # Resettiamo isPotato per tutti gli archi e tutti i nodi di scN
-                    scN.setAllIsPotato(False)
-
-                    # Definisco la stringa di rilevanza
-                    strRilevanza = ""
 
                     # Peschiamo un nodo intermedio, né iniziale né finale
                     nodoIntermedio = None
-                    for nodo in scN.nodi:
-                        if nodo is not n0 and nodo is not nq:
-                            nodoIntermedio = nodo
+                    for n in g.nodi:
+                        if n != n0 and n != nq:
+                            nodoIntermedio = n
                             break
 
                     # Se tale nodo  intermedio esiste, studiamo i suoi cappi
                     if nodoIntermedio is not None:
-                        # Marchiamo il nodoIntermedio come da potare
-                        nodoIntermedio.isPotato = True
-                        # Tengo traccia di quali id di archi entranti e uscenti dal nodo intermedio
-                        # devo togliere dal dizionario
-                        idArchiDaRimuovereDaPedici = []
-
-                        # Esiste un cappio su nodoIntermedio? Creo la sua stringa di rilevanza
-                        # NOTA: Costruire la stringa qui ci consente di risparmiare cicli
-                        strRilevanzaCappio = ""
-                        nodoIntermedio: Nodo
-                        for cappio in nodoIntermedio.archiUscenti:
-                            if cappio.nodo1 is nodoIntermedio:
-                                # segno come da rimuovere dai pedici il cappio su nodoIntermedio
-                                idArchiDaRimuovereDaPedici.append(id(cappio))
-                                if len(cappio.rilevanza) == 1:
-                                    strRilevanzaCappio = cappio.rilevanza + "*"
-                                elif len(cappio.rilevanza) > 1:
-                                    strRilevanzaCappio = f"({cappio.rilevanza})*"
+                        # Esiste un cappio su nodoIntermedio? Ne recupero la rilevanza
+                        rilevanzaCappio = None
+                        for cappio in g.uscenti[nodoIntermedio]:
+                            if g.nodo1[cappio] == nodoIntermedio:
+                                rilevanzaCappio = g.rilevanza[cappio]
                                 break
 
                         # todo: verifica che accade se ci sono più cappi sullo stesso nodo con pedice diverso (tipo benchmark)
 
                         # Ciclo sugli archi entranti a nodoIntermedio, eccetto i cappi
-                        for arcoEntrante in scN.archi:
-                            if arcoEntrante.nodo1 is nodoIntermedio and arcoEntrante.nodo0 is not nodoIntermedio:
-                                # segno come da rimuovere dai pedici l'arco entrante in nodoIntermedio non cappio
-                                idArchiDaRimuovereDaPedici.append(id(arcoEntrante))
-                                for arcoUscente in nodoIntermedio.archiUscenti:
-                                    if arcoUscente.nodo1 is not nodoIntermedio:
-                                        # segno come da rimuovere dai pedici l'arco uscente da nodoIntermedio non cappio
-                                        idArchiDaRimuovereDaPedici.append(id(arcoUscente))
-                                        # Costruisco la stringa di rilevanza tenendo conto dell'eventuale cappio
-                                        strRilevanzaFinale = arcoEntrante.rilevanza \
-                                                             + strRilevanzaCappio \
-                                                             + arcoUscente.rilevanza
-
-                                        # Per ciascuna coppia di archi entrante/uscente su nodoIntermedio
-                                        # inseriamo un nuovo arco che tenga conto della presenza o meno di
-                                        # un cappio su nodoIntermedio
-
-                                        # Creiamo l'arco che sostituisce il nodoIntermedio
-                                        a = Arco(nodo0=arcoEntrante.nodo0, nodo1=arcoUscente.nodo1, transizione=None,
-                                                 rilevanza=strRilevanzaFinale, osservabilita="")
-                                        a.isPotato = False
+                        for arcoEntrante in g.entranti[nodoIntermedio]:
+                            if g.nodo0[arcoEntrante] != nodoIntermedio:
+                                for arcoUscente in g.uscenti[nodoIntermedio]:
+                                    if g.nodo1[arcoUscente] != nodoIntermedio:
+                                        # Costruisco la rilevanza tenendo conto dell'eventuale cappio
+                                        strRilevanzaFinale = SpazioComportamentale.componiStrRilevanzaNodoIntermedio(
+                                            g.rilevanza[arcoEntrante], rilevanzaCappio, g.rilevanza[arcoUscente])
 
                                         # Produciamo il pedice del nuovo arco
                                         pedice = None
                                         # Riga 27: Calcolo del pedice
-                                        if id(arcoUscente) in pedici:
+                                        if arcoUscente in pedici:
                                             # Righe 40-46: il pedice dell'arco uscente non è NIL
-                                            pedice = pedici[id(arcoUscente)]
-                                        elif arcoUscente.nodo1 is nq and arcoUscente.nodo0 in scN.nodiAccettazione:
+                                            pedice = pedici[arcoUscente]
+                                        elif g.nodo1[arcoUscente] == nq and nodoIntermedio in insiemeAccettazione:
                                             # Righe 28-39:
-                                            pedice = arcoUscente.nodo0
+                                            pedice = nodoIntermedio
 
-                                        # Introduco il nuovo arco
-                                        scN.addArco(a)
+                                        # Per ciascuna coppia di archi entrante/uscente su nodoIntermedio
+                                        # inseriamo un nuovo arco che tenga conto della presenza o meno di
+                                        # un cappio su nodoIntermedio
+                                        a = g.addArco(g.nodo0[arcoEntrante], g.nodo1[arcoUscente],
+                                                      strRilevanzaFinale)
                                         # Fissiamo l'eventuale pedice del nuovo arco
                                         if pedice is not None:
-                                            pedici[id(a)] = pedice
+                                            pedici[a] = pedice
                                     # Fine if coppia di archi su nodoIntermedio (non cappio)
                                 # Fine for ricerca secondo arco (non cappio)
                         # Fine for ricerca primo arco (non cappio)
-                        # Ora posso rimuovere nodoIntermedio e tutti i suoi archi entranti e uscenti
-                        scN.potatura()
-                        # Rimuovo anche tutti gli archi potati dal dizionario dei pedici
-                        for i in idArchiDaRimuovereDaPedici:
-                            if i in pedici: # si potrebbe risparmiare qualche ciclo qui eliminando i duplicati da idArchiDaRimuovereDaPedici
-                                pedici.pop(i)
-
+                        # Ora posso rimuovere nodoIntermedio e tutti i suoi archi entranti e uscenti,
+                        # anche dal dizionario dei pedici
+                        for a in list(g.entranti[nodoIntermedio]) + list(g.uscenti[nodoIntermedio]):
+                            pedici.pop(a, None)
+                        g.rimuoviNodo(nodoIntermedio)
                     # Fine if nodoIntermedio is not None
                 # Fine controllo su parallelo/nodo intermedio
             # fine controllo serie
         # fine while principale
 
         # Ora ci accingiamo a preparare l'uscita (righe 51-55:)
-        # Decoriamo la chiusura originale
-        for arco in scN.archi:
-            # Verifichiamo se l'arco è decorato, quindi se il suo id è contenuto in pedici
-            pedice_arco = pedici.get(id(arco), None)
-            if pedice_arco:
-                # Traduco il riferimento al nodo che è il pedice dell'arco, in modo da avere il nodo (pedice)
-                # corrispondente nella chiusura di partenza.
+        # Raccogliamo le decorazioni per la chiusura originale
+        decorazioni = {}
+        for a in g.archi:
+            # Verifichiamo se l'arco è decorato, quindi se è contenuto in pedici
+            pedice_arco = pedici.get(a)
+            if pedice_arco is not None:
+                # Il pedice dell'arco è l'identificativo del nodo corrispondente nella chiusura di partenza.
                 # Alla decorazione di tale nodo, per questa chiusura, associo la rilevanza dell'arco decorato
-                nodo_orig = nodiClone2Origin[id(pedice_arco)]
-                self.decorazioni[id(nodo_orig)] = arco.rilevanza
+                decorazioni[pedice_arco] = g.rilevanza[a]
+        return decorazioni
+
+    def applicaDecorazioni(self, decorazioni: Dict[int, Espressione]) -> None:
+        """
+        Trascrive nella chiusura le decorazioni ricavate dalla riduzione del suo grafo di lavoro, poi ne calcola la
+        diagnosi
+        :param decorazioni: il dizionario posizione in self.nodi -> decorazione, come ritornato da riduzione
+        """
+        for posizione, decorazione in decorazioni.items():
+            self.decorazioni[id(self.nodi[posizione])] = decorazione
+
+        # Calcoliamo anche la diagnosi della chiusura
+        self.calcolaDiagnosi()
+
+    def formaCompatta(self) -> tuple:
+        """
+        Ritorna una descrizione compatta e serializzabile (con pickle) della chiusura, sufficiente a calcolarne le
+        decorazioni in un altro processo (vedi decorazioniFormaCompatta). I nodi sono identificati dalla loro
+        posizione in self.nodi.
+        :return: la tupla (flag isFinale dei nodi, nodo iniziale, archi come terne (nodo0, nodo1, rilevanza),
+                 nodi di accettazione)
+        """
+        posizioni = {id(nodo): i for i, nodo in enumerate(self.nodi)}
+        return (tuple(nodo.isFinale for nodo in self.nodi),
+                posizioni[id(self.nodoIniziale)],
+                tuple((posizioni[id(a.nodo0)], posizioni[id(a.nodo1)], a.rilevanza) for a in self.archi),
+                tuple(posizioni[id(nodo)] for nodo in self.nodiAccettazione))
 
-        # Calcoliamo anche la diagnosi della chiusura come
-        # l'alternativa delle decorazioni relative agli stati finali della chiusura
+    @staticmethod
+    def decorazioniFormaCompatta(forma: tuple) -> Dict[int, Espressione]:
+        """
+        Calcola le decorazioni di una chiusura data in forma compatta (vedi formaCompatta).
+        È la funzione eseguita dai processi di espressioniRegolariParallele.
+        :param forma: la forma compatta della chiusura
+        :return: il dizionario posizione del nodo -> decorazione, da passare ad applicaDecorazioni
+        """
+        finali, iniziale, archi, nodiAccettazione = forma
+        g = GrafoRiduzione()
+        for isFinale in finali:
+            g.addNodo(isFinale)
+        for nodo0, nodo1, rilevanza in archi:
+            g.addArco(nodo0, nodo1, Espressione.simbolo(rilevanza))
+        g.nodoIniziale = iniziale
+        return Chiusura.riduzione(g, list(nodiAccettazione))
+
+    @staticmethod
+    def espressioniRegolariParallele(chiusure: List['Chiusura'], processi=None) -> None:
+        """
+        Equivalente a chiamare espressioniRegolari su ciascuna chiusura, ma distribuisce il calcolo delle decorazioni
+        su un pool di processi. Le chiusure viaggiano in forma compatta e le decorazioni ottenute sono trascritte
+        nelle chiusure nello stesso ordine della lista: il risultato è identico a quello sequenziale.
+        :param chiusure: le chiusure (già popolate) da decorare
+        :param processi: il numero di processi del pool (None per usare tutti i core disponibili)
+        """
+        if processi is None:
+            processi = os.cpu_count() or 1
+        forme = [c.formaCompatta() for c in chiusure]
+        # Lotti di qualche chiusura per volta, per ammortizzare il costo della comunicazione fra processi
+        lotto = max(1, len(forme) // (4 * processi))
+        with ProcessPoolExecutor(max_workers=processi) as esecutore:
+            for chiusura, decorazioni in zip(chiusure, esecutore.map(Chiusura.decorazioniFormaCompatta, forme,
+                                                                      chunksize=lotto)):
+                chiusura.applicaDecorazioni(decorazioni)
+
+    def calcolaDiagnosi(self) -> None:
+        """
+        Calcola la diagnosi della chiusura come l'alternativa delle decorazioni relative agli stati finali della
+        chiusura. Se la chiusura non ha nodi finali, la sua diagnosi sarà None.
+        Precondizione: le decorazioni della chiusura sono già state calcolate
+        """
         nodiFinali = [nodo for nodo in self.nodiAccettazione if nodo.isFinale]
 
         if nodiFinali:
             # La chiusura ha nodi finali
-            strDiagnosi = ""
+            strDiagnosi = Espressione.EPSILON
             for n in nodiFinali:
-                strDiagnosi = SpazioComportamentale.alternativaRilevanza(strDiagnosi, self.decorazioni.get(id(n), ""))
+                strDiagnosi = SpazioComportamentale.alternativaRilevanza(
+                    strDiagnosi, self.decorazioni.get(id(n), Espressione.EPSILON))
 
             # Trascrivo la diagnosi nella chiusura
             self.diagnosi = strDiagnosi
@@ -2265,6 +4178,322 @@ class Chiusura(SpazioComportamentale):
             self.diagnosi = None
 
 
+class MotoreChiusure:
+    """
+    Classe che calcola le decorazioni delle chiusure silenziose di uno SpazioComportamentale condividendo il lavoro
+    fra tutti i nodi d'ingresso, in alternativa a Chiusura.espressioniRegolari.
+    Il sottografo degli archi non osservabili dello spazio è scomposto nelle sue componenti fortemente connesse
+    (SCC). Per ciascuna componente si calcolano una sola volta, e solo quando servono, le espressioni di rilevanza
+    dei cammini interni fra ogni coppia dei suoi nodi. La decorazione di un nodo di una chiusura si ottiene poi
+    componendo questi riepiloghi lungo il grafo (aciclico) delle componenti, in ordine topologico.
+    Il motore lavora su un qualunque grafo di archi non osservabili dato per liste di adiacenza (vedi cammini):
+    daSpazio lo costruisce a partire da uno SpazioComportamentale.
+    """
+
+    def __init__(self, silenziosi: List[Dict[int, Espressione]]):
+        """
+        :param silenziosi: gli archi non osservabili uscenti da ciascun nodo (identificato dalla sua posizione),
+                           come dizionario nodo di destinazione -> rilevanza
+        """
+        # Posizione dei nodi dello spazio da cui è stato costruito il motore, per id (vedi daSpazio)
+        self.posizione: Dict[int, int]
+        self.posizione = {}
+
+        self.silenziosi: List[Dict[int, Espressione]]
+        self.silenziosi = silenziosi
+
+        # Componenti fortemente connesse: componente[i] è l'indice della componente del nodo i.
+        # Le componenti sono numerate in ordine topologico inverso (un arco va sempre da una componente
+        # di indice maggiore o uguale ad una di indice minore o uguale)
+        self.componente: List[int]
+        self.componenti: List[List[int]]
+        self.componente, self.componenti = self.calcolaComponenti()
+
+        # Riepiloghi delle componenti già calcolati, per indice di componente
+        self.riepiloghi: Dict[int, Dict[tuple, Espressione]]
+        self.riepiloghi = {}
+
+    @staticmethod
+    def daSpazio(spazio: SpazioComportamentale) -> 'MotoreChiusure':
+        """
+        Costruisce il motore per le chiusure dello spazio dato
+        :param spazio: lo SpazioComportamentale
+        :return: il motore
+        """
+        # Ciascun nodo dello spazio è identificato dalla sua posizione in spazio.nodi
+        posizione = {id(nodo): i for i, nodo in enumerate(spazio.nodi)}
+
+        # Archi non osservabili uscenti da ciascun nodo (gli archi paralleli sono fusi in un'alternativa)
+        silenziosi = []
+        for nodo in spazio.nodi:
+            uscenti = {}
+            for a in nodo.archiUscenti:
+                if a.osservabilita == "":
+                    j = posizione[id(a.nodo1)]
+                    rilevanza = Espressione.simbolo(a.rilevanza)
+                    uscenti[j] = Espressione.alternativa(uscenti[j], rilevanza) if j in uscenti else rilevanza
+            silenziosi.append(uscenti)
+
+        motore = MotoreChiusure(silenziosi)
+        motore.posizione = posizione
+        return motore
+
+    def calcolaComponenti(self) -> (List[int], List[List[int]]):
+        """
+        Calcola le componenti fortemente connesse del sottografo non osservabile con l'algoritmo di Tarjan
+        (in versione iterativa)
+        :return: la coppia (componente di ciascun nodo, lista dei nodi di ciascuna componente)
+        """
+        n = len(self.silenziosi)
+        indice = [-1] * n
+        minimo = [0] * n
+        inPila = [False] * n
+        pila = []
+        componente = [-1] * n
+        componenti = []
+        contatore = 0
+
+        for radice in range(n):
+            if indice[radice] != -1:
+                continue
+            # Pila di visita: (nodo, iteratore sui successori)
+            visita = [(radice, iter(self.silenziosi[radice]))]
+            indice[radice] = minimo[radice] = contatore
+            contatore += 1
+            pila.append(radice)
+            inPila[radice] = True
+            while visita:
+                v, successori = visita[-1]
+                avanzato = False
+                for w in successori:
+                    if indice[w] == -1:
+                        indice[w] = minimo[w] = contatore
+                        contatore += 1
+                        pila.append(w)
+                        inPila[w] = True
+                        visita.append((w, iter(self.silenziosi[w])))
+                        avanzato = True
+                        break
+                    elif inPila[w]:
+                        minimo[v] = min(minimo[v], indice[w])
+                if avanzato:
+                    continue
+                # Tutti i successori di v sono stati visitati
+                visita.pop()
+                if visita:
+                    u = visita[-1][0]
+                    minimo[u] = min(minimo[u], minimo[v])
+                if minimo[v] == indice[v]:
+                    # v è la radice di una componente
+                    nodiComponente = []
+                    while True:
+                        w = pila.pop()
+                        inPila[w] = False
+                        componente[w] = len(componenti)
+                        nodiComponente.append(w)
+                        if w == v:
+                            break
+                    componenti.append(nodiComponente)
+        return componente, componenti
+
+    def riepilogo(self, c: int) -> Dict[tuple, Espressione]:
+        """
+        Ritorna (calcolandolo alla prima richiesta) il riepilogo della componente c: per ogni coppia (u, v) di nodi
+        della componente, l'espressione di rilevanza di tutti i cammini da u a v interni alla componente
+        (cammino vuoto compreso se u = v). Le coppie senza cammini non compaiono.
+        Il calcolo segue l'algoritmo di Kleene (eliminazione dei nodi intermedi uno alla volta).
+        :param c: l'indice della componente
+        :return: il dizionario (u, v) -> espressione
+        """
+        if c in self.riepiloghi:
+            return self.riepiloghi[c]
+
+        nodi = self.componenti[c]
+        # Cammini di lunghezza al più 1
+        cammini = {}
+        for u in nodi:
+            cammini[(u, u)] = Espressione.EPSILON
+        for u in nodi:
+            for v, rilevanza in self.silenziosi[u].items():
+                if self.componente[v] == c:
+                    precedente = cammini.get((u, v))
+                    cammini[(u, v)] = rilevanza if precedente is None \
+                        else SpazioComportamentale.alternativaRilevanza(precedente, rilevanza)
+
+        # Ammettiamo via via ciascun nodo k come intermedio: ai cammini da u a v si aggiungono quelli che passano
+        # per k, ciclando su k a piacere (i valori letti sono quelli del passo precedente)
+        for k in nodi:
+            cappio = Espressione.stella(cammini[(k, k)])
+            versoK = [(u, cammini[(u, k)]) for u in nodi if (u, k) in cammini]
+            daK = [(v, cammini[(k, v)]) for v in nodi if (k, v) in cammini]
+            for u, uk in versoK:
+                prefisso = SpazioComportamentale.concatenaRilevanza(uk, cappio)
+                for v, kv in daK:
+                    attraversoK = SpazioComportamentale.concatenaRilevanza(prefisso, kv)
+                    precedente = cammini.get((u, v))
+                    cammini[(u, v)] = attraversoK if precedente is None \
+                        else SpazioComportamentale.alternativaRilevanza(precedente, attraversoK)
+
+        self.riepiloghi[c] = cammini
+        return cammini
+
+    def decora(self, chiusura: Chiusura) -> None:
+        """
+        Calcola le decorazioni e la diagnosi della chiusura data (già popolata di nodi, archi, nodi d'uscita e
+        d'accettazione), con lo stesso significato di Chiusura.espressioniRegolari: la decorazione di un nodo
+        d'accettazione è l'espressione di rilevanza dei cammini non osservabili dal nodo d'ingresso al nodo stesso.
+        :param chiusura: la chiusura da decorare
+        """
+        ingresso = self.posizione[id(chiusura.nodoIniziale)]
+
+        # Componenti raggiungibili
+        componentiRaggiunte = {self.componente[self.posizione[id(nodo)]] for nodo in chiusura.nodi}
+        cammini = self.cammini({ingresso: Espressione.EPSILON}, componentiRaggiunte)
+
+        for nodo in chiusura.nodiAccettazione:
+            chiusura.decorazioni[id(nodo)] = cammini[self.posizione[id(nodo)]]
+        chiusura.calcolaDiagnosi()
+
+    def cammini(self, entranti: Dict[int, Espressione], componentiRaggiunte=None) -> Dict[int, Espressione]:
+        """
+        Calcola, per ciascun nodo raggiungibile dai nodi d'ingresso dati, l'espressione di rilevanza di tutti i
+        cammini non osservabili che vi arrivano, ciascuno preceduto dall'espressione del suo nodo d'ingresso
+        :param entranti: il dizionario nodo d'ingresso -> espressione con cui vi si entra
+        :param componentiRaggiunte: le componenti raggiungibili dai nodi d'ingresso (None per considerarle tutte)
+        :return: il dizionario nodo -> espressione dei cammini
+        """
+        # Cammini verso ciascun nodo raggiunto, e contributi degli archi che entrano
+        # in una componente provenendo da un'altra
+        cammini: Dict[int, Espressione]
+        cammini = {}
+        entranti = dict(entranti)
+
+        # Le componenti sono visitate in ordine topologico (indice decrescente)
+        if componentiRaggiunte is None:
+            componentiRaggiunte = range(len(self.componenti))
+        for c in sorted(componentiRaggiunte, reverse=True):
+            riepilogo = self.riepilogo(c)
+            nodi = self.componenti[c]
+            # Cammini verso i nodi della componente: si entra in w e si prosegue all'interno fino a v
+            for w in nodi:
+                if w not in entranti:
+                    continue
+                for v in nodi:
+                    interno = riepilogo.get((w, v))
+                    if interno is None:
+                        continue
+                    cammino = SpazioComportamentale.concatenaRilevanza(entranti[w], interno)
+                    cammini[v] = cammino if v not in cammini \
+                        else SpazioComportamentale.alternativaRilevanza(cammini[v], cammino)
+            # Archi uscenti dalla componente
+            for u in nodi:
+                if u not in cammini:
+                    continue
+                for v, rilevanza in self.silenziosi[u].items():
+                    if self.componente[v] != c:
+                        contributo = SpazioComportamentale.concatenaRilevanza(cammini[u], rilevanza)
+                        entranti[v] = contributo if v not in entranti \
+                            else SpazioComportamentale.alternativaRilevanza(entranti[v], contributo)
+        return cammini
+
+
+class DiagnosiAlVolo:
+    """
+    Motore che calcola la diagnosi relativa ad un'osservazione lineare direttamente sulla ReteFA, senza costruire lo
+    spazio comportamentale relativo all'osservazione lineare (compiti 2 e 3).
+    Gli stati della rete sono esplorati sulla codifica compatta (vedi CodificaCompatta) uno strato alla volta: lo
+    strato i contiene gli stati raggiunti dopo aver consumato le prime i osservazioni. Per ciascuno strato si
+    conservano solo gli stati d'ingresso con l'espressione di rilevanza dei cammini che vi arrivano; i cammini non
+    osservabili interni allo strato sono riassunti con un MotoreChiusure, e gli archi osservabili che corrispondono
+    alla prossima osservazione producono gli stati d'ingresso dello strato successivo. Terminato uno strato, i suoi
+    stati vengono dimenticati: la memoria occupata è quella di un solo strato.
+    La diagnosi ha lo stesso significato di quella di espressioneRegolare (l'espressione di tutti i cammini dal
+    nodo iniziale ai nodi finali), anche se la sua forma testuale può essere diversa.
+    """
+
+    def __init__(self, rete: ReteFA):
+        self.rete = rete
+        self.codifica = rete.compila()
+
+        # Numero massimo di stati in uno strato, per le statistiche
+        self.piccoStrato = 0
+
+    def strato(self, entranti: Dict[tuple, Espressione], osservazione: str) -> (Dict[tuple, Espressione],
+                                                                                 Dict[tuple, Espressione]):
+        """
+        Esplora uno strato a partire dai suoi stati d'ingresso
+        :param entranti: il dizionario codice dello stato d'ingresso -> espressione dei cammini che vi arrivano
+        :param osservazione: la prossima osservazione, None se lo strato è l'ultimo
+        :return: la coppia (espressione dei cammini verso ciascuno stato dello strato, stati d'ingresso dello
+                 strato successivo con le loro espressioni)
+        """
+        codifica = self.codifica
+        codici = list(entranti)
+        posizione = {codice: j for j, codice in enumerate(codici)}
+        silenziosi = []
+        osservabili = []
+
+        j = 0
+        while j < len(codici):
+            codice = codici[j]
+            uscenti = {}
+            for i in range(codifica.numComportamenti):
+                for record in codifica.transizioniUscenti[i][codice[i]]:
+                    trans = record[6]
+                    # (filtro) solo le transizioni non osservabili e quelle che corrispondono alla prossima
+                    # osservazione
+                    if trans.osservabilita != "" and trans.osservabilita != osservazione:
+                        continue
+                    succ = codifica.successore(codice, record)
+                    if succ is None:
+                        continue
+                    rilevanza = Espressione.simbolo(trans.rilevanza)
+                    if trans.osservabilita != "":
+                        osservabili.append((j, succ, rilevanza))
+                        continue
+                    h = posizione.get(succ)
+                    if h is None:
+                        h = len(codici)
+                        codici.append(succ)
+                        posizione[succ] = h
+                    uscenti[h] = SpazioComportamentale.alternativaRilevanza(uscenti[h], rilevanza) \
+                        if h in uscenti else rilevanza
+            silenziosi.append(uscenti)
+            j += 1
+        self.piccoStrato = max(self.piccoStrato, len(codici))
+
+        cammini = MotoreChiusure(silenziosi).cammini({posizione[codice]: e for codice, e in entranti.items()})
+
+        prossimi = {}
+        for j, succ, rilevanza in osservabili:
+            contributo = SpazioComportamentale.concatenaRilevanza(cammini[j], rilevanza)
+            prossimi[succ] = SpazioComportamentale.alternativaRilevanza(prossimi[succ], contributo) \
+                if succ in prossimi else contributo
+        return {codice: cammini[j] for j, codice in enumerate(codici)}, prossimi
+
+    def diagnosi(self, osservazioneLineare: List[str]) -> str:
+        """
+        Calcola la diagnosi relativa all'osservazione lineare data
+        :param osservazioneLineare: l'osservazione lineare
+        :return: la diagnosi lineare
+        :raises ValueError: se l'osservazione lineare presenta errori o non è compatibile con la rete
+        """
+        self.rete.verificaOsservazioneLineare(osservazioneLineare)
+
+        entranti = {self.codifica.codiceIniziale(): Espressione.EPSILON}
+        for o in osservazioneLineare:
+            cammini, entranti = self.strato(entranti, o)
+            if not entranti:
+                raise ValueError("Nessuno stato della rete è compatibile con l'osservazione lineare")
+
+        # Ultimo strato: la diagnosi è l'alternativa dei cammini verso gli stati finali
+        cammini, _ = self.strato(entranti, None)
+        finali = [e for codice, e in cammini.items() if self.codifica.isFinale(codice)]
+        if not finali:
+            raise ValueError("Nessuno stato finale della rete è compatibile con l'osservazione lineare")
+        return str(Espressione.alternativa(*finali))
+
+
 class Diagnosticatore(SpazioComportamentale):
     """
     Un diagnosticatore è uno SpazioComportamentale delle chiusure ai cui nodi è associata la
@@ -2285,7 +4514,7 @@ class Diagnosticatore(SpazioComportamentale):
         # coppie è un dizionario che associa all'id di un nodo del diagnosticatore
         # un'espressione regolare corrispondente.
         # Viene già popolato con la coppia iniziale
-        coppie = {id(self.nodoIniziale): (self.nodoIniziale, "")}
+        coppie = {id(self.nodoIniziale): (self.nodoIniziale, Espressione.EPSILON)}
 
         # Ciclo sulla osservazione lineare
         for o in ol:
@@ -2316,7 +4545,7 @@ class Diagnosticatore(SpazioComportamentale):
         coppie = {k:(nodo, rilevanza) for k,(nodo, rilevanza) in coppie.items() if nodo.isFinale}
 
         # 17: se resta una sola coppia...
-        ret = ""
+        ret = Espressione.EPSILON
         if len(coppie) == 1:
             # accediamo all'ultima (unica) coppia con un abuso di notazione
             # concateniamo la sua rilevanza alla diagnosi del suo nodo
@@ -2333,7 +4562,7 @@ class Diagnosticatore(SpazioComportamentale):
                     ret, Diagnosticatore.concatenaRilevanza(r, x.chiusura.diagnosi))
 
         # Ritorna la diagnosi lineare
-        return ret
+        return str(ret)
 
     def logStats(self):
         """
@@ -2346,6 +4575,515 @@ class Diagnosticatore(SpazioComportamentale):
         Log.new("\tNumero transizioni non osservabili (nelle chiusure)", f"{sum([len(n.chiusura.archi) for n in self.nodi])}")
         Log.new("\tNumero transizioni osservabili (fra gli stati del diagnosticatore)", f"{len(self.archi)}")
 
+    def compila(self) -> 'DiagnosticatoreCompilato':
+        """
+        Compila questo diagnosticatore in una tabella di transizione densa (vedi DiagnosticatoreCompilato)
+        :return: il DiagnosticatoreCompilato corrispondente
+        """
+        return DiagnosticatoreCompilato(self)
+
+
+class DiagnosticatoreCompilato:
+    """
+    Forma compilata di un Diagnosticatore, pensata per calcolare molte diagnosi lineari.
+    I nodi del diagnosticatore sono identificati dalla loro posizione in nodi, le osservazioni da un intero
+    assegnato alla compilazione. La tabella delle transizioni è una lista piatta indicizzata da
+    nodo * numeroOsservazioni + osservazione: ogni cella contiene la tupla delle coppie (nodo di destinazione,
+    rilevanza) degli archi uscenti dal nodo con quell'osservabilità, nell'ordine degli archi uscenti.
+    Le rilevanze sono le Espressioni interne del diagnosticatore, quindi nessun confronto fra stringhe è
+    necessario durante la diagnosi.
+    """
+
+    def __init__(self, diagnosticatore: Diagnosticatore):
+        posizioni = {id(nodo): i for i, nodo in enumerate(diagnosticatore.nodi)}
+
+        # Osservazioni, identificate nell'ordine in cui compaiono sugli archi
+        self.osservazioni: Dict[str, int]
+        self.osservazioni = {}
+        for a in diagnosticatore.archi:
+            if a.osservabilita not in self.osservazioni:
+                self.osservazioni[a.osservabilita] = len(self.osservazioni)
+        self.numeroOsservazioni = len(self.osservazioni)
+
+        self.nodoIniziale = posizioni[id(diagnosticatore.nodoIniziale)]
+
+        # Diagnosi della chiusura di ciascun nodo, None per i nodi non finali
+        self.diagnosi: List[Espressione]
+        self.diagnosi = [nodo.chiusura.diagnosi if nodo.isFinale else None for nodo in diagnosticatore.nodi]
+
+        # Tabella delle transizioni
+        celle = [[] for _ in range(len(diagnosticatore.nodi) * self.numeroOsservazioni)]
+        for i, nodo in enumerate(diagnosticatore.nodi):
+            for a in nodo.archiUscenti:
+                celle[i * self.numeroOsservazioni + self.osservazioni[a.osservabilita]].append(
+                    (posizioni[id(a.nodo1)], a.rilevanza))
+        self.transizioni: List[tuple]
+        self.transizioni = [tuple(cella) for cella in celle]
+
+    def codifica(self, ol: List[str]) -> List[int]:
+        """
+        Traduce un'osservazione lineare nella lista dei codici delle sue osservazioni.
+        Un'osservazione che non compare nel diagnosticatore è codificata con None.
+        :param ol: l'osservazione lineare
+        :return: la lista dei codici
+        """
+        return [self.osservazioni.get(o) for o in ol]
+
+    def diagnosiLineare(self, ol: List[str]) -> str:
+        """
+        Calcola la diagnosi relativa ad un'osservazione lineare, con lo stesso risultato di
+        Diagnosticatore.diagnosiLineare
+        :param ol: la lista di stringhe di osservazione lineare
+        :return: la diagnosi lineare relativa ad ol
+        """
+        return str(self.diagnosiCodificata(self.codifica(ol)))
+
+    def diagnosiCodificata(self, codici: List[int]) -> Espressione:
+        """
+        Calcola la diagnosi relativa ad un'osservazione lineare già codificata (vedi codifica)
+        :param codici: i codici delle osservazioni
+        :return: l'espressione di rilevanza della diagnosi
+        """
+        # coppie associa a ciascun nodo raggiunto la rilevanza corrispondente
+        coppie = {self.nodoIniziale: Espressione.EPSILON}
+        for o in codici:
+            coppie = self.passo(coppie, o)
+            if not coppie:
+                break
+        return self.diagnosiCoppie(coppie)
+
+    def diagnosiMultiple(self, osservazioni: List[List[str]]) -> List[str]:
+        """
+        Calcola le diagnosi di molte osservazioni lineari in un colpo solo.
+        Le osservazioni sono inserite in un albero dei prefissi (trie), visitato in profondità: ogni arco del trie
+        costa un solo passo sul diagnosticatore, quindi i prefissi comuni a più osservazioni sono calcolati una
+        volta sola.
+        :param osservazioni: la lista delle osservazioni lineari
+        :return: la lista delle diagnosi lineari, nello stesso ordine delle osservazioni
+        """
+        # Ciascun nodo del trie è una coppia (figli per codice di osservazione, indici delle osservazioni che
+        # terminano nel nodo)
+        radice = ({}, [])
+        for i, ol in enumerate(osservazioni):
+            nodoTrie = radice
+            for o in self.codifica(ol):
+                if o not in nodoTrie[0]:
+                    nodoTrie[0][o] = ({}, [])
+                nodoTrie = nodoTrie[0][o]
+            nodoTrie[1].append(i)
+
+        diagnosi = [None] * len(osservazioni)
+        # Pila della visita: (nodo del trie, coppie nodo -> rilevanza raggiunte col suo prefisso)
+        pila = [(radice, {self.nodoIniziale: Espressione.EPSILON})]
+        while pila:
+            (figli, indici), coppie = pila.pop()
+            if indici:
+                d = str(self.diagnosiCoppie(coppie))
+                for i in indici:
+                    diagnosi[i] = d
+            for o, figlio in figli.items():
+                pila.append((figlio, self.passo(coppie, o) if coppie else coppie))
+        return diagnosi
+
+    def passo(self, coppie: Dict[int, Espressione], o: int) -> Dict[int, Espressione]:
+        """
+        Avanza di un'osservazione l'insieme delle coppie (nodo, rilevanza)
+        :param coppie: il dizionario nodo -> rilevanza corrente
+        :param o: il codice dell'osservazione (None se sconosciuta)
+        :return: il nuovo dizionario nodo -> rilevanza
+        """
+        if o is None:
+            # Osservazione sconosciuta: nessun arco la produce
+            return {}
+        concatena = SpazioComportamentale.concatenaRilevanza
+        alternativa = SpazioComportamentale.alternativaRilevanza
+        coppie_n = {}
+        for x1, r1 in coppie.items():
+            for x2, rilevanza in self.transizioniNodo(x1, o):
+                r2 = concatena(r1, rilevanza)
+                coppie_n[x2] = alternativa(coppie_n[x2], r2) if x2 in coppie_n else r2
+        return coppie_n
+
+    def diagnosiCoppie(self, coppie: Dict[int, Espressione]) -> Espressione:
+        """
+        Calcola la diagnosi corrispondente ad un insieme di coppie (nodo, rilevanza): restano le sole coppie sui
+        nodi finali, e la diagnosi è l'alternativa delle concatenazioni fra le loro rilevanze e le diagnosi dei nodi
+        :param coppie: il dizionario nodo -> rilevanza
+        :return: l'espressione di rilevanza della diagnosi
+        """
+        concatena = SpazioComportamentale.concatenaRilevanza
+        finali = [(x, d) for x, d in ((x, self.diagnosiNodo(x)) for x in coppie) if d is not None]
+        if len(finali) == 1:
+            x, d = finali[0]
+            return concatena(coppie[x], d)
+        ret = Espressione.EPSILON
+        for x, d in finali:
+            ret = SpazioComportamentale.alternativaRilevanza(ret, concatena(coppie[x], d))
+        return ret
+
+    def transizioniNodo(self, x: int, o: int) -> tuple:
+        """
+        :param x: il nodo
+        :param o: il codice dell'osservazione
+        :return: le coppie (nodo di destinazione, rilevanza) degli archi uscenti da x con osservabilità o
+        """
+        return self.transizioni[x * self.numeroOsservazioni + o]
+
+    def diagnosiNodo(self, x: int) -> Espressione:
+        """
+        :param x: il nodo
+        :return: la diagnosi della chiusura del nodo x, None se il nodo non è finale
+        """
+        return self.diagnosi[x]
+
+    def salvaBinario(self, path: str) -> None:
+        """
+        Salva il diagnosticatore compilato nel formato binario compatto letto da DiagnosticatoreBinario.
+        Il file, little-endian, è composto da
+            - l'intestazione: la firma DiagnosticatoreBinario.FIRMA seguita da 9 interi a 32 bit (versione, numero
+              di nodi, di osservazioni, nodo iniziale, numero di stringhe, di espressioni, di figli, di archi e
+              lunghezza in byte del pool delle stringhe);
+            - le tabelle, come vettori di interi a 32 bit: offset delle stringhe nel pool, tipo, etichetta e primo
+              figlio di ciascuna espressione, figli delle espressioni, stringa di ciascuna osservazione, diagnosi di
+              ciascun nodo, primo arco di ciascuna cella (nodo, osservazione) in formato CSR, destinazione e
+              rilevanza di ciascun arco;
+            - il pool delle stringhe (osservazioni ed etichette di rilevanza) in UTF-8.
+        Le espressioni sono salvate come albero sintattico, con i figli prima dei padri; i riferimenti assenti
+        valgono DiagnosticatoreBinario.NESSUNO.
+        :param path: il percorso del file da scrivere
+        """
+        # Pool delle stringhe, condivise
+        stringhe: Dict[str, int]
+        stringhe = {}
+
+        def indiceStringa(stringa: str) -> int:
+            if stringa not in stringhe:
+                stringhe[stringa] = len(stringhe)
+            return stringhe[stringa]
+
+        # Tabella delle espressioni, numerate in ordine posticipato (figli prima dei padri)
+        espressioni: Dict[Espressione, int]
+        espressioni = {}
+        tipi, etichette, primoFiglio, figli = array('I'), array('I'), array('I', [0]), array('I')
+
+        def indiceEspressione(radice: Espressione) -> int:
+            pila = [radice]
+            while pila:
+                e = pila[-1]
+                if e in espressioni:
+                    pila.pop()
+                    continue
+                mancanti = [f for f in e.figli if f not in espressioni]
+                if mancanti:
+                    pila.extend(mancanti)
+                    continue
+                pila.pop()
+                espressioni[e] = len(espressioni)
+                tipi.append(DiagnosticatoreBinario.TIPI.index(e.tipo))
+                etichette.append(DiagnosticatoreBinario.NESSUNO if e.etichetta is None
+                                 else indiceStringa(e.etichetta))
+                figli.extend(espressioni[f] for f in e.figli)
+                primoFiglio.append(len(figli))
+            return espressioni[radice]
+
+        osservazioni = array('I', (indiceStringa(o) for o in self.osservazioni))
+        diagnosi = array('I', (DiagnosticatoreBinario.NESSUNO if d is None else indiceEspressione(d)
+                               for d in self.diagnosi))
+        primoArco, destinazioni, rilevanze = array('I', [0]), array('I'), array('I')
+        for cella in self.transizioni:
+            for x2, rilevanza in cella:
+                destinazioni.append(x2)
+                rilevanze.append(indiceEspressione(rilevanza))
+            primoArco.append(len(destinazioni))
+
+        codificate = [stringa.encode("utf-8") for stringa in stringhe]
+        offsetStringhe = array('I', [0])
+        for c in codificate:
+            offsetStringhe.append(offsetStringhe[-1] + len(c))
+        pool = b"".join(codificate)
+
+        intestazione = array('I', [DiagnosticatoreBinario.VERSIONE, len(self.diagnosi), self.numeroOsservazioni,
+                                   self.nodoIniziale, len(stringhe), len(espressioni), len(figli),
+                                   len(destinazioni), len(pool)])
+        tabelle = [intestazione, offsetStringhe, tipi, etichette, primoFiglio, figli, osservazioni, diagnosi,
+                   primoArco, destinazioni, rilevanze]
+        with open(path, "wb") as file:
+            file.write(DiagnosticatoreBinario.FIRMA)
+            for tabella in tabelle:
+                if sys.byteorder != "little":
+                    tabella.byteswap()
+                file.write(tabella.tobytes())
+            file.write(pool)
+
+
+class DiagnosticatoreBinario(DiagnosticatoreCompilato):
+    """
+    Diagnosticatore compilato letto da un file nel formato binario scritto da DiagnosticatoreCompilato.salvaBinario.
+    Il file è mappato in memoria (mmap) e le sue tabelle sono lette direttamente dalla mappatura, senza copiarle:
+    il caricamento non ricostruisce il grafo degli oggetti e costa solo la lettura dell'intestazione e delle
+    osservazioni. Le espressioni di rilevanza sono ricostruite (e memorizzate) solo quando la diagnosi le incontra.
+    Al termine dell'uso va chiamato chiudi().
+    """
+    FIRMA = b"RFAD"
+    VERSIONE = 1
+    # Valore dei riferimenti assenti (etichetta di un'espressione che non è un simbolo, diagnosi di un nodo
+    # non finale)
+    NESSUNO = 0xFFFFFFFF
+    # Codifica dei tipi delle espressioni
+    TIPI = (Espressione.TIPO_EPSILON, Espressione.TIPO_SIMBOLO, Espressione.TIPO_CONCATENAZIONE,
+            Espressione.TIPO_ALTERNATIVA, Espressione.TIPO_STELLA)
+
+    def __init__(self, path: str):
+        """
+        :param path: il percorso del file da caricare
+        """
+        with open(path, "rb") as file:
+            self.mappa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mappa[:len(DiagnosticatoreBinario.FIRMA)] != DiagnosticatoreBinario.FIRMA:
+            self.mappa.close()
+            raise ValueError(f"{path} non è un diagnosticatore in formato binario")
+
+        # Le tabelle sono viste sulla mappatura, lette in sequenza
+        self.viste = []
+        self.posizione = len(DiagnosticatoreBinario.FIRMA)
+        (versione, numeroNodi, self.numeroOsservazioni, self.nodoIniziale, numeroStringhe, numeroEspressioni,
+         numeroFigli, numeroArchi, lunghezzaPool) = self.tabella(9)
+        if versione != DiagnosticatoreBinario.VERSIONE:
+            self.chiudi()
+            raise ValueError(f"Versione {versione} del formato binario non supportata")
+
+        self.offsetStringhe = self.tabella(numeroStringhe + 1)
+        self.tipi = self.tabella(numeroEspressioni)
+        self.etichette = self.tabella(numeroEspressioni)
+        self.primoFiglio = self.tabella(numeroEspressioni + 1)
+        self.figli = self.tabella(numeroFigli)
+        codiciOsservazioni = self.tabella(self.numeroOsservazioni)
+        self.diagnosiNodi = self.tabella(numeroNodi)
+        self.primoArco = self.tabella(numeroNodi * self.numeroOsservazioni + 1)
+        self.destinazioni = self.tabella(numeroArchi)
+        self.rilevanze = self.tabella(numeroArchi)
+        self.pool = memoryview(self.mappa)[self.posizione:self.posizione + lunghezzaPool]
+        self.viste.append(self.pool)
+
+        # Espressioni già ricostruite, per indice
+        self.espressioni: Dict[int, Espressione]
+        self.espressioni = {}
+
+        self.osservazioni = {self.stringa(s): o for o, s in enumerate(codiciOsservazioni)}
+
+    def tabella(self, lunghezza: int):
+        """
+        Legge la prossima tabella di interi a 32 bit del file
+        :param lunghezza: il numero di elementi della tabella
+        :return: la tabella, come vista sulla mappatura (o come copia, sulle macchine big-endian)
+        """
+        inizio = self.posizione
+        self.posizione += 4 * lunghezza
+        if sys.byteorder != "little":
+            tabella = array('I', self.mappa[inizio:self.posizione])
+            tabella.byteswap()
+            return tabella
+        vista = memoryview(self.mappa)[inizio:self.posizione].cast('I')
+        self.viste.append(vista)
+        return vista
+
+    def stringa(self, i: int) -> str:
+        """
+        :param i: l'indice della stringa nel pool
+        :return: la stringa
+        """
+        return str(self.pool[self.offsetStringhe[i]:self.offsetStringhe[i + 1]], "utf-8")
+
+    def espressione(self, i: int) -> Espressione:
+        """
+        Ritorna l'espressione di indice i, ricostruendola (con le sue sottoespressioni) se necessario
+        :param i: l'indice dell'espressione
+        :return: l'espressione interna corrispondente
+        """
+        if i in self.espressioni:
+            return self.espressioni[i]
+        pila = [i]
+        while pila:
+            e = pila[-1]
+            figli = range(self.primoFiglio[e], self.primoFiglio[e + 1])
+            mancanti = [self.figli[f] for f in figli if self.figli[f] not in self.espressioni]
+            if mancanti:
+                pila.extend(mancanti)
+                continue
+            pila.pop()
+            tipo = DiagnosticatoreBinario.TIPI[self.tipi[e]]
+            if tipo == Espressione.TIPO_EPSILON:
+                self.espressioni[e] = Espressione.EPSILON
+            else:
+                etichetta = None if self.etichette[e] == DiagnosticatoreBinario.NESSUNO \
+                    else self.stringa(self.etichette[e])
+                self.espressioni[e] = Espressione._interna(tipo, etichetta,
+                                                           tuple(self.espressioni[self.figli[f]] for f in figli))
+        return self.espressioni[i]
+
+    def transizioniNodo(self, x: int, o: int) -> tuple:
+        cella = x * self.numeroOsservazioni + o
+        return tuple((self.destinazioni[a], self.espressione(self.rilevanze[a]))
+                     for a in range(self.primoArco[cella], self.primoArco[cella + 1]))
+
+    def diagnosiNodo(self, x: int) -> Espressione:
+        d = self.diagnosiNodi[x]
+        return None if d == DiagnosticatoreBinario.NESSUNO else self.espressione(d)
+
+    def salvaBinario(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self.mappa)
+
+    def chiudi(self) -> None:
+        """
+        Rilascia le viste e chiude la mappatura del file
+        """
+        for vista in self.viste:
+            vista.release()
+        self.viste = []
+        self.mappa.close()
+
+
+class DiagnosticatorePigro(DiagnosticatoreCompilato):
+    """
+    Diagnosticatore costruito pigramente a partire da uno SpazioComportamentale, guidato dalle osservazioni.
+    Si comporta come la forma compilata del diagnosticatore generato da generaDiagnosticatore, ma la chiusura
+    silenziosa di un nodo d'ingresso (e con essa gli archi uscenti dal nodo corrispondente del diagnosticatore)
+    viene generata solo la prima volta che una diagnosi raggiunge quel nodo, e poi riutilizzata dalle diagnosi
+    successive. I nodi del diagnosticatore sono numerati nell'ordine in cui sono scoperti.
+    """
+
+    def __init__(self, spazio: SpazioComportamentale, chiusureCondivise=False):
+        """
+        :param spazio: lo SpazioComportamentale (già potato) da cui ricavare il diagnosticatore
+        :param chiusureCondivise: True per decorare le chiusure con un MotoreChiusure condiviso
+        """
+        self.spazio = spazio
+        self.motore = MotoreChiusure.daSpazio(spazio) if chiusureCondivise else None
+
+        # Le osservazioni sono raccolte subito dagli archi dello spazio
+        self.osservazioni = {}
+        for a in spazio.archi:
+            if a.osservabilita != "" and a.osservabilita not in self.osservazioni:
+                self.osservazioni[a.osservabilita] = len(self.osservazioni)
+        self.numeroOsservazioni = len(self.osservazioni)
+
+        # Nodi d'ingresso scoperti, con la loro posizione
+        self.nodiIngresso: List[Nodo]
+        self.nodiIngresso = []
+        self.indice: Dict[int, int]
+        self.indice = {}
+        self.nodoIniziale = self.indiceNodo(spazio.nodoIniziale)
+
+        # Archi uscenti dei nodi già espansi, per codice di osservazione
+        self.uscenti: Dict[int, Dict[int, tuple]]
+        self.uscenti = {}
+
+    def indiceNodo(self, nodoIngresso: Nodo) -> int:
+        """
+        :param nodoIngresso: un nodo d'ingresso dello spazio
+        :return: la posizione del nodo corrispondente del diagnosticatore, assegnata alla prima richiesta
+        """
+        if id(nodoIngresso) not in self.indice:
+            self.indice[id(nodoIngresso)] = len(self.nodiIngresso)
+            self.nodiIngresso.append(nodoIngresso)
+        return self.indice[id(nodoIngresso)]
+
+    def espandi(self, x: int) -> Dict[int, tuple]:
+        """
+        Genera (se non già fatto) la chiusura decorata del nodo x e gli archi uscenti dal nodo, come
+        generaDiagnosticatore
+        :param x: il nodo del diagnosticatore
+        :return: il dizionario codice di osservazione -> coppie (nodo di destinazione, rilevanza)
+        """
+        if x in self.uscenti:
+            return self.uscenti[x]
+        ni = self.nodiIngresso[x]
+        self.spazio.generaChiusuraSilenziosaDecorata(ni, self.motore)
+        uscenti = {}
+        for nu in ni.chiusura.nodiUscita:
+            for a1 in nu.archiUscenti:
+                if a1.osservabilita != "":
+                    rilevanza = SpazioComportamentale.concatenaRilevanza(
+                        Espressione.simbolo(a1.rilevanza), ni.chiusura.decorazioni.get(id(nu), Espressione.EPSILON))
+                    uscenti.setdefault(self.osservazioni[a1.osservabilita], []).append(
+                        (self.indiceNodo(a1.nodo1), rilevanza))
+        self.uscenti[x] = {o: tuple(coppie) for o, coppie in uscenti.items()}
+        return self.uscenti[x]
+
+    def transizioniNodo(self, x: int, o: int) -> tuple:
+        return self.espandi(x).get(o, ())
+
+    def diagnosiNodo(self, x: int) -> Espressione:
+        self.espandi(x)
+        return self.nodiIngresso[x].chiusura.diagnosi
+
+    def salvaBinario(self, path: str) -> None:
+        """
+        Espande tutti i nodi raggiungibili dal nodo iniziale, così che il diagnosticatore sia completo, e lo salva
+        nel formato binario compatto (vedi DiagnosticatoreCompilato.salvaBinario).
+        :param path: il percorso del file da scrivere
+        """
+        x = 0
+        while x < len(self.nodiIngresso):
+            self.espandi(x)
+            x += 1
+
+        # Tabelle della forma compilata, lette dal salvataggio
+        self.diagnosi = [self.diagnosiNodo(x) for x in range(len(self.nodiIngresso))]
+        self.transizioni = [self.transizioniNodo(x, o) for x in range(len(self.nodiIngresso))
+                            for o in range(self.numeroOsservazioni)]
+        super().salvaBinario(path)
+
+
+class MonitorDiagnosi:
+    """
+    Monitor per la diagnosi in linea di un flusso di osservazioni.
+    Il monitor riceve le osservazioni una alla volta (push) e mantiene l'insieme corrente delle coppie
+    (nodo del diagnosticatore, rilevanza), così che ogni osservazione costi un solo passo anziché il ricalcolo
+    dell'intero prefisso. La diagnosi corrente si ottiene in tempo proporzionale al numero di coppie.
+    """
+
+    def __init__(self, diagnosticatore):
+        """
+        :param diagnosticatore: il Diagnosticatore da monitorare (viene compilato) o un DiagnosticatoreCompilato
+        """
+        if isinstance(diagnosticatore, Diagnosticatore):
+            diagnosticatore = diagnosticatore.compila()
+        self.diagnosticatore: DiagnosticatoreCompilato
+        self.diagnosticatore = diagnosticatore
+
+        self.coppie: Dict[int, Espressione]
+        self.osservazioni = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Riporta il monitor allo stato iniziale, come se non avesse ricevuto osservazioni
+        """
+        self.coppie = {self.diagnosticatore.nodoIniziale: Espressione.EPSILON}
+        self.osservazioni = 0
+
+    def push(self, o: str) -> None:
+        """
+        Riceve una nuova osservazione e aggiorna le coppie correnti
+        :param o: l'osservazione
+        """
+        self.coppie = self.diagnosticatore.passo(self.coppie, self.diagnosticatore.osservazioni.get(o))
+        self.osservazioni += 1
+
+    def coerente(self) -> bool:
+        """
+        :return: True se le osservazioni ricevute finora sono compatibili con il diagnosticatore
+        """
+        return bool(self.coppie)
+
+    def diagnosi(self) -> str:
+        """
+        :return: la diagnosi relativa alle osservazioni ricevute finora (come Diagnosticatore.diagnosiLineare)
+        """
+        return str(self.diagnosticatore.diagnosiCoppie(self.coppie))
+
 
 ## MAIN ##
 class Log:
@@ -2501,7 +5239,8 @@ class Main:
         return Main.URID
 
     @staticmethod
-    def outputSerializer(nome_compito: str, rete: ReteFA, sc: SpazioComportamentale, output_path="", osservazioneLineare=None, dotprint = True):
+    def outputSerializer(nome_compito: str, rete: ReteFA, sc: SpazioComportamentale, output_path="", osservazioneLineare=None, dotprint = True,
+                         diagnosiLineari=None):
         """
         Genera i file di output (XML e DOT/GV) relativi alla reteFA e allo SpazioComportamentale in ingresso.
         Se possibile, renderizza lo spazio comportamentale in input mediante il tool dot di GraphViz.
@@ -2514,6 +5253,7 @@ class Main:
         :param output_path: percorso che punta alla cartella dove salvare l'output
         :param osservazioneLineare: l'eventuale osservazione lineare
         :param dotprint: True se si vuole stampare il grafo usando dot
+        :param diagnosiLineari: l'eventuale lista di coppie (osservazione lineare, diagnosi) da riportare nell'output
         """
 
         # Logica di costruzione dei filename
@@ -2547,6 +5287,12 @@ class Main:
             sc_elem = ET.SubElement(root, "osservazioneLineare")
             sc_elem.text = repr(osservazioneLineare)
 
+        # Riporta le eventuali diagnosi lineari calcolate
+        if diagnosiLineari is not None:
+            for ol, diagnosi in diagnosiLineari:
+                d_elem = ET.SubElement(root, "diagnosiLineare", osservazioneLineare=repr(ol))
+                d_elem.text = diagnosi
+
         # Varia il comportamento a seconda della necessità di stampare o meno lo spazio
         dotgraph = None
         stampa_spazio = False
@@ -2606,7 +5352,10 @@ class Main:
 
 
     @staticmethod
-    def compito1(reteFA_xml_path: str, output_path: str) -> (ReteFA, SpazioComportamentale):
+    def compito1(reteFA_xml_path: str, output_path: str, compatto=False, potaturaLineare=False,
+                 processiEsplorazione=1, coordinatore=None, chiave=None,
+                 simbolico=False, riduzione=False, composizionale=False,
+                 cartellaCache=None, cartellaPartizioni=None) -> (ReteFA, SpazioComportamentale):
         """
         Genera gli oggetti ReteFA e SpazioComportamentale a partire da una descrizione della rete FA come file XML
         ben formattato.
@@ -2615,7 +5364,24 @@ class Main:
 
         :param reteFA_xml_path: il percorso su disco al file XML che descrive la ReteFa
         :param output_path: il percorso su disco dove salvare il file XML che descrive l'output di Compito1
-        :return: la coppia ReteFA, SpazioComportamentale
+        :param compatto: True per esplorare la ReteFA sulla codifica compatta degli stati
+        :param potaturaLineare: True per potare lo spazio con la potatura in tempo lineare
+        :param processiEsplorazione: il numero di processi con cui esplorare la ReteFA (None per tutti i core)
+        :param coordinatore: la coppia (host, porta) su cui attendere processiEsplorazione lavoratori remoti, per
+        un'esplorazione distribuita
+        :param chiave: la chiave segreta condivisa con i lavoratori remoti (se None ne viene generata e stampata una
+        casuale, da passare ai lavoratori)
+        :param simbolico: True per calcolare e potare lo spazio in forma simbolica (vedi SpazioSimbolico), esportandolo
+        poi in forma esplicita
+        :param riduzione: True per esplorare la ReteFA (sulla codifica compatta) con la riduzione a ordine parziale
+        :param composizionale: True per comporre lo spazio dagli spazi locali minimizzati dei comportamenti (vedi
+        SpazioLocale)
+        :param cartellaCache: l'eventuale cartella in cui conservare gli spazi locali dei comportamenti, per riusarli
+        fra esecuzioni diverse
+        :param cartellaPartizioni: con un'esplorazione parallela o distribuita, l'eventuale cartella in cui scrivere
+        le partizioni dello spazio anziché materializzarlo: in tal caso lo spazio non viene né potato né salvato
+        :return: la coppia ReteFA, SpazioComportamentale (SpazioComportamentale è None se lo spazio è stato scritto
+        nella cartellaPartizioni)
         """
         tasks = Tasklist(["Generazione di ReteFA da XML",
                           "Generazione di SC da ReteFA",
@@ -2633,11 +5399,37 @@ class Main:
             Log.new("Generazione dello Spazio Comportamentale","")
             Log.cronometro()
             sc = SpazioComportamentale()
-            sc.creaSpazioComportamentale(rete)
+            if simbolico:
+                spazio = SpazioSimbolico(rete)
+                spazio.calcolaRaggiungibili()
+                spazio.pota()
+                spazio.logStats()
+                sc = spazio.esporta()
+            elif composizionale:
+                sc.creaSpazioComportamentaleComposizionale(rete, cartellaCache)
+            elif coordinatore is not None:
+                if chiave is None:
+                    chiave = secrets.token_hex(16).encode()
+                    print(f"Chiave dell'esplorazione distribuita (da passare ai lavoratori con --chiave): "
+                          f"{chiave.decode()}")
+                sc.creaSpazioComportamentaleDistribuito(rete, coordinatore, processiEsplorazione or os.cpu_count(),
+                                                        chiave, cartellaPartizioni)
+            elif processiEsplorazione != 1:
+                sc.creaSpazioComportamentaleParallelo(rete, processiEsplorazione, cartellaPartizioni)
+            elif compatto or riduzione:
+                sc.creaSpazioComportamentaleCompatto(rete, riduzione=riduzione)
+            else:
+                sc.creaSpazioComportamentale(rete)
             Log.new("\tTempo di generazione dello SpazioComportamentale da ReteFA", f"{Log.cronometro()}s")
             tasks.do_first()
 
-            sc.potaturaRidenominazione()
+            if cartellaPartizioni is not None and not (simbolico or composizionale) \
+                    and (coordinatore is not None or processiEsplorazione != 1):
+                # Lo spazio è rimasto partizionato su disco (vedi SpazioComportamentale.coordinaEsplorazione)
+                Log.new("\tPartizioni dello SpazioComportamentale scritte in", cartellaPartizioni)
+                return rete, None
+
+            sc.potaturaRidenominazione(lineare=potaturaLineare)
             Log.new("\tTempo di potatura dello SpazioComportamentale", f"{Log.cronometro()}s")
             sc.logStats()
             tasks.do_first()
@@ -2655,7 +5447,9 @@ class Main:
 
     @singledispatchmethod
     @staticmethod
-    def compito2(reteFA, osservazioneLineare: List[str], output_path: str) -> (ReteFA, SpazioComportamentale):
+    def compito2(reteFA, osservazioneLineare: List[str], output_path: str, compatto=False, potaturaLineare=False,
+                 stratificato=False, potaturaAnticipata=False, spazio=None,
+                 riduzione=False) -> (ReteFA, SpazioComportamentale):
         """
         Genera gli oggetti ReteFA e SpazioComportamentale relativo all'osservazione lineare data, a partire da una
         descrizione della rete FA come file XML ben formattato e un'osservazione lineare valida sulla rete FA.
@@ -2665,13 +5459,24 @@ class Main:
         :param reteFA: il percorso su disco al file XML che descrive la ReteFa
         :param osservazioneLineare: una lista ordinata di stringhe dove ogni stringa rappresenta un'osservazione su reteFA
         :param output_path: il percorso su disco dove salvare il file XML che descrive l'output di Compito 2
+        :param compatto: True per esplorare la ReteFA sulla codifica compatta degli stati
+        :param potaturaLineare: True per potare lo spazio con la potatura in tempo lineare
+        :param stratificato: True per esplorare la ReteFA uno strato di osservazione alla volta
+                             (vedi creaSpazioComportamentaleStratificato)
+        :param potaturaAnticipata: True per eliminare durante l'esplorazione stratificata i nodi senza uscita
+        :param spazio: l'eventuale SpazioComportamentale della rete già generato (e potato) da compito 1: se dato,
+                       lo SCOL ne è ricavato come prodotto sincrono con l'osservazione lineare, senza riesplorare la
+                       ReteFA (vedi creaSpazioComportamentaleProdotto)
+        :param riduzione: True per esplorare la ReteFA (sulla codifica compatta) con la riduzione a ordine parziale
         :return: la coppia ReteFA, SpazioComportamentale
         """
         raise NotImplementedError("Il tipo di reteFA in input alla funzione compito2 non è valido.")
 
     @compito2.register(str)
     @staticmethod
-    def _(reteFA: str, osservazioneLineare: List[str], output_path: str) -> (ReteFA, SpazioComportamentale):
+    def _(reteFA: str, osservazioneLineare: List[str], output_path: str, compatto=False, potaturaLineare=False,
+          stratificato=False, potaturaAnticipata=False, spazio=None,
+          riduzione=False) -> (ReteFA, SpazioComportamentale):
         tasks = Tasklist(["Generazione di ReteFA da XML",
                           "Generazione di SCOL da ReteFA e OL",
                           "Potatura e Ridenominazione",
@@ -2690,13 +5495,21 @@ class Main:
             Log.new("Generazione dello SCOL", f"")
             Log.cronometro()
             scol = SpazioComportamentale()
-            scol.creaSpazioComportamentaleOsservazioneLineare(rete, osservazioneLineare)
+            if spazio is not None:
+                scol.creaSpazioComportamentaleProdotto(spazio, osservazioneLineare, rete)
+            elif stratificato:
+                scol.creaSpazioComportamentaleStratificato(rete, osservazioneLineare,
+                                                           potaturaAnticipata=potaturaAnticipata)
+            elif compatto or riduzione:
+                scol.creaSpazioComportamentaleCompatto(rete, osservazioneLineare, riduzione)
+            else:
+                scol.creaSpazioComportamentaleOsservazioneLineare(rete, osservazioneLineare)
             scol.logStats()
             Log.new("\tTempo di generazione dello Spazio Comportamentale relativo all'Osservazione Lineare da ReteFA",
                     f"{Log.cronometro()}s")
             tasks.do_first()
 
-            scol.potaturaRidenominazione()
+            scol.potaturaRidenominazione(lineare=potaturaLineare)
             Log.new("\tTempo di potatura dello SpazioComportamentale relativo all'Osservazione Lineare",
                     f"{Log.cronometro()}s")
             tasks.do_first()
@@ -2713,7 +5526,9 @@ class Main:
 
     @compito2.register(ReteFA)
     @staticmethod
-    def _(reteFA: ReteFA, osservazioneLineare: List[str], output_path: str) -> (ReteFA, SpazioComportamentale):
+    def _(reteFA: ReteFA, osservazioneLineare: List[str], output_path: str, compatto=False, potaturaLineare=False,
+          stratificato=False, potaturaAnticipata=False, spazio=None,
+          riduzione=False) -> (ReteFA, SpazioComportamentale):
         tasks = Tasklist(["Generazione di SCOL da ReteFA e OL",
                           "Potatura e Ridenominazione",
                           "Generazione file output"])
@@ -2725,12 +5540,20 @@ class Main:
 
             Log.cronometro()
             scol = SpazioComportamentale()
-            scol.creaSpazioComportamentaleOsservazioneLineare(reteFA, osservazioneLineare)
+            if spazio is not None:
+                scol.creaSpazioComportamentaleProdotto(spazio, osservazioneLineare, reteFA)
+            elif stratificato:
+                scol.creaSpazioComportamentaleStratificato(reteFA, osservazioneLineare,
+                                                           potaturaAnticipata=potaturaAnticipata)
+            elif compatto or riduzione:
+                scol.creaSpazioComportamentaleCompatto(reteFA, osservazioneLineare, riduzione)
+            else:
+                scol.creaSpazioComportamentaleOsservazioneLineare(reteFA, osservazioneLineare)
             Log.new("\tTempo di generazione dello Spazio Comportamentale relativo all'Osservazione Lineare da ReteFA",
                     f"{Log.cronometro()}s")
             tasks.do_first()
 
-            scol.potaturaRidenominazione()
+            scol.potaturaRidenominazione(lineare=potaturaLineare)
             Log.new("\tTempo di potatura dello SpazioComportamentale relativo all'Osservazione Lineare",
                     f"{Log.cronometro()}s")
             tasks.do_first()
@@ -2746,7 +5569,8 @@ class Main:
             raise KeyboardInterrupt  # Rilancia al main
 
     @staticmethod
-    def compito3(scol: SpazioComportamentale, osservazioneLineare: List[str], output_path: str, debug_on=False) -> str:
+    def compito3(scol: SpazioComportamentale, osservazioneLineare: List[str], output_path: str, debug_on=False,
+                 incrementale=False) -> str:
         """
         Genera la diagnosi a partire dallo SpazioComportamentale relativo all'osservazione lineare (come generato da compito2).
         Inoltre salva su disco il file di output corrispondente nella posizione specificata in output_path (o in
@@ -2754,6 +5578,8 @@ class Main:
 
         :param scol: lo SpazioComportamentale relativo all'osservazione lineare generato da Compito 2
         :param output_path: il percorso su disco dove salvare il file XML che descrive l'output di Compito 3
+        :param incrementale: True per calcolare la diagnosi con l'eliminazione dei nodi guidata da worklist
+                             (vedi espressioneRegolareIncrementale)
         :return: la stringa di diagnosi relativa all'osservazione lineare data sulla ReteFA
         """
         tasks = Tasklist(["Calcolo diagnosi con espressioneRegolare",
@@ -2767,7 +5593,10 @@ class Main:
                     "all'osservazione lineare", "")
 
             Log.cronometro()
-            diagnosi = scol.espressioneRegolare(debug_on=debug_on, debug_path=debug_path)
+            if incrementale:
+                diagnosi = scol.espressioneRegolareIncrementale()
+            else:
+                diagnosi = scol.espressioneRegolare(debug_on=debug_on, debug_path=debug_path)
             Log.new("\tTempo di calcolo della diagnosi con espressioneRegolare",
                     f"{Log.cronometro()}s")
             Log.new("\tOsservazione Lineare", f"{osservazioneLineare}")
@@ -2785,7 +5614,49 @@ class Main:
             raise KeyboardInterrupt  # Rilancia al main
 
     @staticmethod
-    def compito4(spazio: SpazioComportamentale, output_path: str) -> Diagnosticatore:
+    def compito3AlVolo(reteFA_xml_path: str, osservazioneLineare: List[str], output_path: str) -> str:
+        """
+        Genera la diagnosi relativa ad un'osservazione lineare direttamente a partire dalla ReteFA, senza costruire
+        lo spazio comportamentale relativo all'osservazione lineare (vedi DiagnosiAlVolo).
+        Inoltre salva su disco il file di output corrispondente nella posizione specificata in output_path.
+
+        :param reteFA_xml_path: il percorso del file XML che descrive la ReteFA
+        :param osservazioneLineare: una lista ordinata di stringhe dove ogni stringa rappresenta un'osservazione
+        :param output_path: il percorso su disco dove salvare il file XML che descrive l'output di Compito 3
+        :return: la stringa di diagnosi relativa all'osservazione lineare data sulla ReteFA
+        """
+        tasks = Tasklist(["Calcolo diagnosi al volo sulla ReteFA",
+                          "Generazione file output"])
+        try:
+            Log.logtime()
+            Log.new("Compito 3 - Calcolo della diagnosi al volo, a partire dalla rete", f"{reteFA_xml_path}")
+
+            Log.cronometro()
+            rete = ReteFA.fromXML(reteFA_xml_path)
+            Log.new("\tTempo di generazione della ReteFA da XML", f"{Log.cronometro()}s")
+
+            motore = DiagnosiAlVolo(rete)
+            diagnosi = motore.diagnosi(osservazioneLineare)
+            Log.new("\tTempo di calcolo della diagnosi al volo", f"{Log.cronometro()}s")
+            Log.new("\tNumero massimo di stati in uno strato", f"{motore.piccoStrato}")
+            Log.new("\tOsservazione Lineare", f"{osservazioneLineare}")
+            Log.new("\tDiagnosi Lineare", f"{diagnosi}")
+            tasks.do_first()
+
+            # Genera file in output
+            Main.outputSerializer("compito3", rete=rete, sc=None, output_path=output_path,
+                                  osservazioneLineare=osservazioneLineare)
+            tasks.do_first()
+
+            return diagnosi
+        except KeyboardInterrupt:
+            print("Esecuzione di Compito 3 interrotta dall'utente.")
+            tasks.print_non_completati("Compito 3")
+            raise KeyboardInterrupt  # Rilancia al main
+
+    @staticmethod
+    def compito4(spazio: SpazioComportamentale, output_path: str, chiusureCondivise=False, processi=1,
+                 binario: str = None) -> Diagnosticatore:
         """
         Genera il diagnosticatore a partire dallo SpazioComportamentale (come generato da compito1).
         Inoltre salva su disco il file di output corrispondente nella posizione specificata in output_path (o in
@@ -2793,6 +5664,12 @@ class Main:
 
         :param spazio: lo SpazioComportamentale generato da Compito 1
         :param output_path: il percorso su disco dove salvare il file XML che descrive l'output di Compito 4
+        :param chiusureCondivise: True per decorare le chiusure con il motore condiviso sulle componenti fortemente
+                                  connesse (vedi MotoreChiusure)
+        :param processi: il numero di processi con cui decorare le chiusure in parallelo (1 in sequenza, None per
+                         usare tutti i core)
+        :param binario: l'eventuale percorso dove salvare anche il diagnosticatore compilato in formato binario
+                        (vedi DiagnosticatoreBinario)
         :return: il Diagnosticatore corrispondente
         """
         tasks = Tasklist(["Genera Diagnosticatore a partire da SC (con espressioniRegloari)",
@@ -2802,12 +5679,17 @@ class Main:
             Log.new("Compito 4 - Generazione del Diagnosticatore per lo spazio comportamentale in ingresso","")
 
             Log.cronometro()
-            diagnosticatore = spazio.generaDiagnosticatore()
+            diagnosticatore = spazio.generaDiagnosticatore(chiusureCondivise=chiusureCondivise, processi=processi)
             Log.new("\tTempo di generazione del Diagnosticatore",
                     f"{Log.cronometro()}s")
             diagnosticatore.logStats()
             tasks.do_first()
 
+            if binario is not None:
+                Log.cronometro()
+                diagnosticatore.compila().salvaBinario(binario)
+                Log.new("\tTempo di salvataggio del diagnosticatore in formato binario", f"{Log.cronometro()}s")
+
             # Genera file in output
             Main.outputSerializer("compito4", rete=None, sc=diagnosticatore, output_path=output_path)
             tasks.do_first()
@@ -2819,7 +5701,7 @@ class Main:
             raise KeyboardInterrupt  # Rilancia al main
 
     @staticmethod
-    def compito5(diag: Diagnosticatore, osservazioneLineare: List[str], output_path: str) -> str:
+    def compito5(diag: Diagnosticatore, osservazioneLineare: List[str], output_path: str, compilato=False) -> str:
         """
         Genera la diagnosi relativa all'osservazione lineare a partire dal Diagnosticatore (come generato da compito 4)
         e ad una osservazione lineare.
@@ -2829,6 +5711,8 @@ class Main:
         :param diag: il Diagnosticatore di una ReteFA
         :param osservazioneLineare: una lista ordinata di stringhe dove ogni stringa rappresenta un'osservazione su reteFA
         :param output_path: il percorso su disco dove salvare il file XML che descrive l'output di Compito 4
+        :param compilato: True per compilare prima il diagnosticatore in una tabella di transizione
+                          (vedi DiagnosticatoreCompilato), ignorato se è già in forma compilata
         :return: la stringa di diagnosi relativa all'osservazione lineare data sulla ReteFA
         """
         tasks = Tasklist(["Calcolo della diagnosi a partire da Diagnosticatore ed Osservazione Lineare",
@@ -2837,6 +5721,11 @@ class Main:
             Log.logtime()
             Log.new("Compito 5 - Calcolo della diagnosi, a partire dal diagnosticatore per la rete", "")
 
+            if compilato and isinstance(diag, Diagnosticatore):
+                Log.cronometro()
+                diag = diag.compila()
+                Log.new("\tTempo di compilazione del diagnosticatore", f"{Log.cronometro()}s")
+
             Log.cronometro()
             diagnosi = diag.diagnosiLineare(osservazioneLineare)
             Log.new("\tTempo di calcolo della diagnosi con espressioniRegolari",
@@ -2856,6 +5745,72 @@ class Main:
             tasks.print_non_completati("Compito 5")
             raise KeyboardInterrupt  # Rilancia al main
 
+    @staticmethod
+    def compito5Batch(diag: Diagnosticatore, osservazioni: List[List[str]], output_path: str) -> List[str]:
+        """
+        Genera le diagnosi relative a molte osservazioni lineari a partire dal Diagnosticatore (come generato da
+        compito 4), condividendo il calcolo dei prefissi comuni (vedi DiagnosticatoreCompilato.diagnosiMultiple).
+        Inoltre salva su disco un unico file di output con tutte le diagnosi nella posizione specificata in
+        output_path.
+
+        :param diag: il Diagnosticatore di una ReteFA (o la sua forma compilata)
+        :param osservazioni: la lista delle osservazioni lineari
+        :param output_path: il percorso su disco dove salvare il file XML che descrive l'output
+        :return: la lista delle diagnosi, nello stesso ordine delle osservazioni
+        """
+        tasks = Tasklist(["Calcolo delle diagnosi a partire da Diagnosticatore ed Osservazioni Lineari",
+                          "Generazione file output"])
+        try:
+            Log.logtime()
+            Log.new("Compito 5 - Calcolo delle diagnosi di più osservazioni lineari, a partire dal diagnosticatore "
+                    "per la rete", "")
+
+            Log.cronometro()
+            if isinstance(diag, Diagnosticatore):
+                diag = diag.compila()
+            diagnosi = diag.diagnosiMultiple(osservazioni)
+            Log.new("\tTempo di calcolo delle diagnosi", f"{Log.cronometro()}s")
+            Log.new("\tNumero di osservazioni lineari", f"{len(osservazioni)}")
+            tasks.do_first()
+
+            # Genera file in output
+            Main.outputSerializer("compito5", rete=None, sc=None, output_path=output_path,
+                                  diagnosiLineari=list(zip(osservazioni, diagnosi)))
+            tasks.do_first()
+
+            return diagnosi
+        except KeyboardInterrupt:
+            print("Esecuzione di Compito 5 interrotta dall'utente.")
+            tasks.print_non_completati("Compito 5")
+            raise KeyboardInterrupt  # Rilancia al main
+
+    @staticmethod
+    def leggiOsservazioni(path: str) -> List[List[str]]:
+        """
+        Legge un file di osservazioni lineari, una per riga, scritte come per l'opzione --ol
+        (es. [o1, o2] oppure o1,o2). Le righe vuote sono ignorate, una riga [] è l'osservazione vuota.
+        :param path: il percorso del file
+        :return: la lista delle osservazioni lineari
+        """
+        osservazioni = []
+        with open(path, encoding="utf-8") as file:
+            for riga in file:
+                riga = riga.strip()
+                if not riga:
+                    continue
+                osservazioni.append([o.strip().strip('"\'') for o in riga.strip('][').split(',') if o.strip()])
+        return osservazioni
+
+    @staticmethod
+    def leggiIndirizzo(indirizzo: str) -> tuple:
+        """
+        Legge un indirizzo TCP scritto come host:porta (es. localhost:6000).
+        :param indirizzo: l'indirizzo in forma testuale
+        :return: la coppia (host, porta)
+        """
+        host, _, porta = indirizzo.rpartition(':')
+        return host or "localhost", int(porta)
+
     def fromCompito2(xmlPath: str):
         """
         Estrazione delle informazioni necessarie al compito 3 a partire dall'output del compito 2:
@@ -2903,6 +5858,7 @@ class Main:
         """
         Estrazione delle informazioni necessarie al compito 5 a partire dall'output del compito 4:
         estrae il diagnosticatore dall' XML in uscita al compito 4.
+        Solleva ValueError se il diagnosticatore è stato salvato con rilevanze in forma di stringa.
         :param xmlPath: xml che descrive lo spazio comportamentale relativo ad un osservazione lineare
         :return: il diagnosticatore costruito a partire dall'XML
         """
@@ -2916,6 +5872,13 @@ class Main:
 
             (reteFA, diag) = loads(b64decode(root.find('base64').text))
 
+            # I diagnosticatori salvati prima delle Espressioni hanno rilevanze e diagnosi come stringhe, che non
+            # possono essere riconvertite: le etichette di rilevanza vi sono concatenate senza separatori
+            if any(isinstance(a.rilevanza, str) for a in diag.archi) \
+                    or any(isinstance(n.chiusura.diagnosi, str) for n in diag.nodi):
+                raise ValueError(f"Il diagnosticatore in '{xmlPath}' è stato salvato da una versione precedente: "
+                                 f"va rigenerato con il compito 4")
+
         return reteFA, diag
 
 
@@ -2996,6 +5959,55 @@ if __name__ == '__main__':
                         help="Genera ulteriori info di debug (fra cui i grafi delle iter di espressioneRegolare in Compito 3)")
     parser.add_argument("-p", "--precedente", action='store_true', default=False, help="Utilizza output di un compito precedente")
     parser.add_argument("-f", "--fileOutput", help="path di un file di input contenente l'output prodotto da un compito precedente")
+    parser.add_argument("--compatto", action='store_true', default=False,
+                        help="Esplora la ReteFA sulla codifica compatta degli stati (Compiti 1 e 2)")
+    parser.add_argument("--stratificato", action='store_true', default=False,
+                        help="Esplora la ReteFA uno strato di osservazione alla volta (Compito 2)")
+    parser.add_argument("--potaturaAnticipata", action='store_true', default=False,
+                        help="Con --stratificato, elimina i nodi senza uscita di ciascuno strato appena completato (Compito 2)")
+    parser.add_argument("--riduzioneOrdineParziale", action='store_true', default=False,
+                        help="Esplora un solo ordinamento delle transizioni invisibili indipendenti (Compiti 1 e 2)")
+    parser.add_argument("--potaturaLineare", action='store_true', default=False,
+                        help="Pota gli spazi comportamentali con la visita all'indietro in tempo lineare (Compiti 1 e 2)")
+    parser.add_argument("--eliminazioneIncrementale", action='store_true', default=False,
+                        help="Calcola la diagnosi eliminando i nodi in ordine di grado con una worklist (Compito 3)")
+    parser.add_argument("--alVolo", action='store_true', default=False,
+                        help="Calcola la diagnosi direttamente sulla ReteFA, uno strato di osservazione alla volta (Compito 3)")
+    parser.add_argument("--chiusureCondivise", action='store_true', default=False,
+                        help="Decora le chiusure silenziose con un calcolo condiviso sulle componenti fortemente connesse (Compito 4)")
+    parser.add_argument("--processi", type=int, default=1,
+                        help="Numero di processi con cui decorare le chiusure silenziose in parallelo, 0 per usare tutti i core (Compito 4)")
+    parser.add_argument("--processiEsplorazione", type=int, default=1,
+                        help="Numero di processi con cui esplorare la ReteFA in parallelo, 0 per usare tutti i core (Compito 1)")
+    parser.add_argument("--simbolico", action='store_true', default=False,
+                        help="Calcola e pota lo spazio comportamentale in forma simbolica con BDD (Compito 1)")
+    parser.add_argument("--composizionale", action='store_true', default=False,
+                        help="Compone lo spazio comportamentale dagli spazi locali minimizzati dei comportamenti (Compito 1)")
+    parser.add_argument("--cacheComponenti",
+                        help="Cartella in cui conservare gli spazi locali dei comportamenti con --composizionale (Compito 1)")
+    parser.add_argument("--cartellaPartizioni",
+                        help="Con --coordinatore o --processiEsplorazione, scrive le partizioni dello spazio in questa cartella senza materializzarlo (Compito 1)")
+    parser.add_argument("--coordinatore",
+                        help="Esplora la ReteFA con --processiEsplorazione lavoratori remoti, attesi su host:porta (Compito 1)")
+    parser.add_argument("--lavoratore",
+                        help="Avvia un lavoratore per l'esplorazione distribuita collegandosi al coordinatore host:porta")
+    parser.add_argument("--ascolto", default="localhost:0",
+                        help="Con --lavoratore, indirizzo host:porta su cui attendere gli altri lavoratori (porta 0 per una porta libera)")
+    parser.add_argument("--chiave",
+                        help="Chiave segreta condivisa fra coordinatore e lavoratori dell'esplorazione distribuita, "
+                             "obbligatoria con --lavoratore e generata a caso se omessa con --coordinatore. "
+                             "I messaggi sono deserializzati con pickle: chi conosce la chiave e raggiunge le porte "
+                             "può eseguire codice arbitrario, quindi va usata solo fra macchine fidate")
+    parser.add_argument("--compilato", action='store_true', default=False,
+                        help="Compila il diagnosticatore in una tabella di transizione prima della diagnosi (Compito 5)")
+    parser.add_argument("--pigro", action='store_true', default=False,
+                        help="Genera le chiusure del diagnosticatore solo quando la diagnosi le raggiunge (Compito 5)")
+    parser.add_argument("--salvaBinario",
+                        help="Salva anche il diagnosticatore compilato in formato binario nel percorso dato (Compiti 4 e 5)")
+    parser.add_argument("--caricaBinario",
+                        help="Carica il diagnosticatore in formato binario dal percorso dato, anziché generarlo (Compito 5)")
+    parser.add_argument("--fileOsservazioni",
+                        help="File di osservazioni lineari, una per riga, da diagnosticare tutte insieme (Compito 5)")
 
     # Controlla se vi sono argomenti
     if len(sys.argv) == 1:
@@ -3004,6 +6016,17 @@ if __name__ == '__main__':
 
     # Parsing delle opzioni in input
     args = parser.parse_args()
+    chiave = args.chiave.encode() if args.chiave is not None else None
+    coordinatore = Main.leggiIndirizzo(args.coordinatore) if args.coordinatore is not None else None
+
+    # Un lavoratore dell'esplorazione distribuita non esegue compiti: resta al servizio del coordinatore
+    if args.lavoratore is not None:
+        if chiave is None:
+            parser.error("--lavoratore richiede la chiave del coordinatore (--chiave)")
+        print(f"Lavoratore collegato al coordinatore '{args.lavoratore}'")
+        CodificaCompatta.lavoratoreRemoto(Main.leggiIndirizzo(args.lavoratore), chiave, Main.leggiIndirizzo(args.ascolto))
+        sys.exit(0)
+
     print(f"Esecuzione del compito {args.compito} sull'input '{args.reteFA}'.\nPath dell'output: '{args.outputPath}'")
 
     t = time.time()
@@ -3024,7 +6047,13 @@ if __name__ == '__main__':
             main_tasks = Tasklist(["compito1"])
             # controllo validità input
             if args.reteFA is not None:
-                s1, r1 = Main.compito1(args.reteFA, args.outputPath)
+                s1, r1 = Main.compito1(args.reteFA, args.outputPath, compatto=args.compatto,
+                                       potaturaLineare=args.potaturaLineare,
+                                       processiEsplorazione=args.processiEsplorazione or None,
+                                       coordinatore=coordinatore, chiave=chiave, simbolico=args.simbolico,
+                                       riduzione=args.riduzioneOrdineParziale,
+                                       composizionale=args.composizionale, cartellaCache=args.cacheComponenti,
+                                       cartellaPartizioni=args.cartellaPartizioni)
                 #Esegui un task
                 main_tasks.do_first()
             else:
@@ -3035,7 +6064,10 @@ if __name__ == '__main__':
             if args.reteFA is not None:
                 if args.ol is not None:
                     ol = args.ol.strip(']["').split(',')
-                    r2a, scol = Main.compito2(args.reteFA, ol, args.outputPath)
+                    r2a, scol = Main.compito2(args.reteFA, ol, args.outputPath, compatto=args.compatto,
+                                              potaturaLineare=args.potaturaLineare, stratificato=args.stratificato,
+                                              potaturaAnticipata=args.potaturaAnticipata,
+                                              riduzione=args.riduzioneOrdineParziale)
                     # Esegui un task
                     main_tasks.do_first() # segna come fatto il task
                 else:
@@ -3046,12 +6078,23 @@ if __name__ == '__main__':
             # controllo validità input
             if not args.precedente:
                 if args.reteFA is not None:
-                    if args.ol is not None:
+                    if args.ol is not None and args.alVolo:
+                        main_tasks = Tasklist(["compito3"])  # fisso i task
+                        ol = args.ol.strip(']["').split(',')
+                        d3 = Main.compito3AlVolo(args.reteFA, ol, args.outputPath)
+                        main_tasks.do_first()  # segna come fatto il task compito3
+                        print(f"Diagnosi ottenuta da compito 3: {d3}")
+                    elif args.ol is not None:
                         main_tasks = Tasklist(["compito2", "compito3"]) # fisso i task
                         ol = args.ol.strip(']["').split(',')
-                        r2a, scol = Main.compito2(args.reteFA, ol, args.outputPath)
+                        r2a, scol = Main.compito2(args.reteFA, ol, args.outputPath, compatto=args.compatto,
+                                                  potaturaLineare=args.potaturaLineare,
+                                                  stratificato=args.stratificato,
+                                                  potaturaAnticipata=args.potaturaAnticipata,
+                                                  riduzione=args.riduzioneOrdineParziale)
                         main_tasks.do_first()  # segna come fatto il task compito2
-                        d3 = Main.compito3(scol, ol, args.outputPath, debug_on=args.debugInfo)
+                        d3 = Main.compito3(scol, ol, args.outputPath, debug_on=args.debugInfo,
+                                           incrementale=args.eliminazioneIncrementale)
                         main_tasks.do_first()  # segna come fatto il task compito3
                         print(f"Diagnosi ottenuta da compito 3: {d3}")
                     else:
@@ -3063,7 +6106,8 @@ if __name__ == '__main__':
                     main_tasks = Tasklist(["Recupera ReteFA, SCOL, OL da compito 2", "compito3"]) # fisso i task
                     reteFA, scol, ol = Main.fromCompito2(args.fileOutput)
                     main_tasks.do_first()  # segna come fatto il task compito2
-                    d3 = Main.compito3(scol, ol, args.outputPath, debug_on=args.debugInfo)
+                    d3 = Main.compito3(scol, ol, args.outputPath, debug_on=args.debugInfo,
+                                       incrementale=args.eliminazioneIncrementale)
                     main_tasks.do_first()  # segna come fatto il task compito3
                     print(f"Diagnosi ottenuta da compito 3: {d3}")
                 else:
@@ -3075,9 +6119,15 @@ if __name__ == '__main__':
             if not args.precedente:
                 if args.reteFA is not None:
                     main_tasks = Tasklist(["compito1", "compito4"])  # fisso i task
-                    reteFA, sc = Main.compito1(args.reteFA, args.outputPath)
+                    reteFA, sc = Main.compito1(args.reteFA, args.outputPath, compatto=args.compatto,
+                                               potaturaLineare=args.potaturaLineare,
+                                               processiEsplorazione=args.processiEsplorazione or None,
+                                               coordinatore=coordinatore, chiave=chiave, simbolico=args.simbolico,
+                                               riduzione=args.riduzioneOrdineParziale,
+                                               composizionale=args.composizionale, cartellaCache=args.cacheComponenti)
                     main_tasks.do_first()  # segna come fatto il task compito1
-                    diagnosticatore4 = Main.compito4(sc, args.outputPath)
+                    diagnosticatore4 = Main.compito4(sc, args.outputPath, chiusureCondivise=args.chiusureCondivise,
+                                                     processi=args.processi or None, binario=args.salvaBinario)
                     main_tasks.do_first()  # segna come fatto il task compito4
                 else:
                     print('rete FA non inserita')
@@ -3086,7 +6136,8 @@ if __name__ == '__main__':
                     main_tasks = Tasklist(["Recupera ReteFA, SC da compito 1", "compito4"])  # fisso i task
                     reteFA, sc = Main.fromCompito1(args.fileOutput)
                     main_tasks.do_first()  # segna come fatto il task compito1
-                    diagnosticatore4 = Main.compito4(sc, args.outputPath)
+                    diagnosticatore4 = Main.compito4(sc, args.outputPath, chiusureCondivise=args.chiusureCondivise,
+                                                     processi=args.processi or None, binario=args.salvaBinario)
                     main_tasks.do_first()  # segna come fatto il task compito4
                 else:
                     print('percorso file non inserito')
@@ -3094,18 +6145,70 @@ if __name__ == '__main__':
                 print('parametri non validi')
         elif args.compito == 5:
             # controllo validità input
-            if not args.precedente:
+            if args.caricaBinario is not None:
+                main_tasks = Tasklist(["Carica il diagnosticatore in formato binario", "compito5"])  # fisso i task
+                diag = DiagnosticatoreBinario(args.caricaBinario)
+                main_tasks.do_first()
+                if args.ol is not None:
+                    ol = args.ol.strip(']["').split(',')
+                    d5 = Main.compito5(diag, ol, args.outputPath)
+                    main_tasks.do_first()  # segna come fatto il task compito5
+                    print(f"Diagnosi ottenuta da Diagnosticatore: {d5}")
+                elif args.fileOsservazioni is not None:
+                    d5 = Main.compito5Batch(diag, Main.leggiOsservazioni(args.fileOsservazioni), args.outputPath)
+                    main_tasks.do_first()  # segna come fatto il task compito5
+                    print(f"Diagnosi ottenute da Diagnosticatore per {len(d5)} osservazioni lineari")
+                else:
+                    print('Osservazione Lineare non inserita')
+                diag.chiudi()
+            elif not args.precedente:
                 if args.reteFA is not None:
                     if args.ol is not None:
                         main_tasks = Tasklist(["compito1", "compito4", "compito5"])  # fisso i task
                         ol = args.ol.strip(']["').split(',')
-                        r1, s1 = Main.compito1(args.reteFA, args.outputPath)
+                        r1, s1 = Main.compito1(args.reteFA, args.outputPath, compatto=args.compatto,
+                                               potaturaLineare=args.potaturaLineare,
+                                               processiEsplorazione=args.processiEsplorazione or None,
+                                               coordinatore=coordinatore, chiave=chiave, simbolico=args.simbolico,
+                                               riduzione=args.riduzioneOrdineParziale,
+                                               composizionale=args.composizionale, cartellaCache=args.cacheComponenti)
                         main_tasks.do_first()  # segna come fatto il task compito1
-                        diagnosticatore4 = Main.compito4(s1, args.outputPath)
+                        if args.pigro:
+                            # Il diagnosticatore viene costruito solo dove la diagnosi lo richiede
+                            diagnosticatore4 = DiagnosticatorePigro(s1, chiusureCondivise=args.chiusureCondivise)
+                            if args.salvaBinario is not None:
+                                diagnosticatore4.salvaBinario(args.salvaBinario)
+                        else:
+                            diagnosticatore4 = Main.compito4(s1, args.outputPath,
+                                                             chiusureCondivise=args.chiusureCondivise,
+                                                             processi=args.processi or None, binario=args.salvaBinario)
                         main_tasks.do_first()  # segna come fatto il task compito4
-                        d5 = Main.compito5(diagnosticatore4, ol, args.outputPath)
+                        d5 = Main.compito5(diagnosticatore4, ol, args.outputPath, compilato=args.compilato)
                         main_tasks.do_first()  # segna come fatto il task compito5
                         print(f"Diagnosi ottenuta da Diagnosticatore: {d5}")
+                    elif args.fileOsservazioni is not None:
+                        main_tasks = Tasklist(["compito1", "compito4", "compito5"])  # fisso i task
+                        osservazioni = Main.leggiOsservazioni(args.fileOsservazioni)
+                        r1, s1 = Main.compito1(args.reteFA, args.outputPath, compatto=args.compatto,
+                                               potaturaLineare=args.potaturaLineare,
+                                               processiEsplorazione=args.processiEsplorazione or None,
+                                               coordinatore=coordinatore, chiave=chiave, simbolico=args.simbolico,
+                                               riduzione=args.riduzioneOrdineParziale,
+                                               composizionale=args.composizionale, cartellaCache=args.cacheComponenti)
+                        main_tasks.do_first()  # segna come fatto il task compito1
+                        if args.pigro:
+                            # Il diagnosticatore viene costruito solo dove la diagnosi lo richiede
+                            diagnosticatore4 = DiagnosticatorePigro(s1, chiusureCondivise=args.chiusureCondivise)
+                            if args.salvaBinario is not None:
+                                diagnosticatore4.salvaBinario(args.salvaBinario)
+                        else:
+                            diagnosticatore4 = Main.compito4(s1, args.outputPath,
+                                                             chiusureCondivise=args.chiusureCondivise,
+                                                             processi=args.processi or None, binario=args.salvaBinario)
+                        main_tasks.do_first()  # segna come fatto il task compito4
+                        d5 = Main.compito5Batch(diagnosticatore4, osservazioni, args.outputPath)
+                        main_tasks.do_first()  # segna come fatto il task compito5
+                        print(f"Diagnosi ottenute da Diagnosticatore per {len(d5)} osservazioni lineari")
                 else:
                     print('Rete FA non inserita!')
             elif args.precedente:
@@ -3115,9 +6218,17 @@ if __name__ == '__main__':
                             ol = args.ol.strip(']["').split(',')
                             reteFA, diag = Main.fromCompito4(args.fileOutput)
                             main_tasks.do_first()  # segna come fatto il task compito4
-                            d5 = Main.compito5(diag, ol, args.outputPath)
+                            d5 = Main.compito5(diag, ol, args.outputPath, compilato=args.compilato)
                             main_tasks.do_first()  # segna come fatto il task compito1
                             print(f"Diagnosi ottenuta da Diagnosticatore: {d5}")
+                        elif args.fileOsservazioni is not None:
+                            main_tasks = Tasklist(["Recupera il diagnosticatore da compito4", "compito5"])  # fisso i task
+                            osservazioni = Main.leggiOsservazioni(args.fileOsservazioni)
+                            reteFA, diag = Main.fromCompito4(args.fileOutput)
+                            main_tasks.do_first()  # segna come fatto il task compito4
+                            d5 = Main.compito5Batch(diag, osservazioni, args.outputPath)
+                            main_tasks.do_first()  # segna come fatto il task compito5
+                            print(f"Diagnosi ottenute da Diagnosticatore per {len(d5)} osservazioni lineari")
                         else:
                             print('Osservazione Lineare non inserita')
                 else: